@@ -20,11 +20,41 @@ __version__ = '1.0.0'
 __author__ = 'Odoo Model Generator Team'
 __email__ = 'info@odoo-model-generator.com'
 
-from .core.generator import OdooModelGenerator
-from .config.field_types import FieldType, FieldConfig, ModelConfig, ModuleConfig
+import importlib
+
+# Chargement paresseux (PEP 562) : jinja2, yaml et les constructeurs ne sont
+# importés qu'au premier accès, pour garder `omg --help` rapide
+_LAZY_ATTRIBUTES = {
+    'OdooModelGenerator': '.core.generator',
+    'AsyncOdooModelGenerator': '.core.async_generator',
+    'FieldType': '.config.field_types',
+    'FieldConfig': '.config.field_types',
+    'ModelConfig': '.config.field_types',
+    'ModuleConfig': '.config.field_types',
+}
+
+_LAZY_SUBMODULES = {'cli', 'config', 'core', 'utils'}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES)
+
 
 __all__ = [
     'OdooModelGenerator',
+    'AsyncOdooModelGenerator',
     'FieldType',
     'FieldConfig', 
     'ModelConfig',
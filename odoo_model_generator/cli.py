@@ -4,15 +4,17 @@ Interface en ligne de commande pour Odoo Model Generator
 """
 
 import click
-import json
-import yaml
+import logging
+import os
 import sys
 from pathlib import Path
 from typing import Dict, List
 
-from .core.generator import OdooModelGenerator
 from .config.field_types import FieldType
 
+# Les imports lourds (jinja2, yaml, constructeurs) sont différés jusqu'à
+# l'exécution d'une commande qui en a besoin
+
 @click.group()
 @click.version_option(version='1.0.0', prog_name='Odoo Model Generator')
 def cli():
@@ -20,7 +22,37 @@ def cli():
     
     Génère automatiquement des modules Odoo complets à partir de configurations YAML/JSON.
     """
-    pass
+    logging.basicConfig(level=logging.INFO)
+
+# Générateur chaud fourni par `omg daemon` lorsqu'il exécute une commande
+_warm_generator = None
+# Formateur Python du démon : son pool de processus sert toutes les requêtes
+_warm_python_formatter = None
+
+def _get_generator():
+    """Retourne le générateur chaud du démon ou en instancie un (import différé)"""
+    if _warm_generator is not None:
+        return _warm_generator
+    from .core.generator import OdooModelGenerator
+    return OdooModelGenerator()
+
+def _forward_to_daemon(command: str, params: Dict):
+    """Transmet la commande au démon s'il tourne
+
+    Returns:
+        Code de sortie de la commande, ou None pour une exécution locale
+    """
+    if _warm_generator is not None or os.environ.get('OMG_NO_DAEMON'):
+        return None
+    
+    from .service.daemon import DaemonClient
+    response = DaemonClient().request(command, params)
+    if response is None:
+        return None
+    
+    click.echo(response.get('stdout', ''), nl=False)
+    click.echo(response.get('stderr', ''), nl=False, err=True)
+    return response.get('exit_code', 1)
 
 @cli.command()
 @click.option('--config', '-c', type=click.Path(exists=True), 
@@ -35,12 +67,105 @@ def cli():
               help='Valider seulement la configuration sans générer')
 @click.option('--verbose', '-v', is_flag=True,
               help='Affichage détaillé')
-def generate(config, output, module_name, interactive, validate_only, verbose):
+@click.option('--memprofile', is_flag=True,
+              help='Profilage mémoire (tracemalloc) de chaque étape')
+@click.option('--memprofile-dir', type=click.Path(file_okay=False),
+              help='Dossier où écrire les snapshots tracemalloc de chaque étape')
+@click.option('--memprofile-top', type=int, default=10, show_default=True,
+              help="Nombre de sites d'allocation affichés par étape")
+@click.option('--shard', metavar='I/N',
+              help="Ne rend que les modèles du shard I sur N (fusion avec 'omg merge-shards')")
+@click.option('--timings', is_flag=True,
+              help="Affiche le temps de chaque étape et les mesures du pipeline d'écriture")
+@click.option('--write-workers', type=click.IntRange(min=0), default=2, show_default=True,
+              help="Threads d'écriture recouvrant le rendu (0 = écritures synchrones)")
+@click.option('--write-queue-depth', type=click.IntRange(min=1), default=32, show_default=True,
+              help="Fichiers rendus en attente d'écriture au maximum (borne la mémoire)")
+@click.option('--cache', 'use_cache', is_flag=True,
+              help='Active le cache persistant des rendus (aussi: --cache-dir ou $OMG_CACHE_DIR)')
+@click.option('--no-cache', is_flag=True,
+              help='Désactive le cache persistant des rendus même avec $OMG_CACHE_DIR (aussi: OMG_NO_CACHE=1)')
+@click.option('--cache-dir', type=click.Path(file_okay=False),
+              help='Dossier du cache de rendu, active le cache (défaut: $OMG_CACHE_DIR ou ~/.cache/omg)')
+@click.option('--cache-max-size', type=click.IntRange(min=1), default=512, show_default=True,
+              help='Taille maximale du cache de rendu (Mo), éviction LRU au-delà')
+@click.option('--cache-compress/--no-cache-compress', default=True, show_default=True,
+              help='Compression zlib des entrées du cache')
+@click.option('--asset-store', type=click.Path(file_okay=False),
+              help="Magasin d'assets partagé : les fichiers static/ identiques y sont stockés une fois puis liés")
+@click.option('--asset-link', type=click.Choice(['hardlink', 'symlink', 'copy']), default='hardlink',
+              show_default=True, help="Mode de liaison des assets (copie en repli entre systèmes de fichiers)")
+@click.option('--atomic-publish', is_flag=True,
+              help="Génère dans un dossier de préparation puis remplace le module publié en un renommage atomique")
+@click.option('--keep-generations', type=click.IntRange(min=0), default=1, show_default=True,
+              help="Générations remplacées conservées pour 'omg rollback' (avec --atomic-publish)")
+@click.option('--format-xml', is_flag=True,
+              help='Réindente les fichiers XML générés (formateur en flux, attributs multi-lignes et CDATA préservés)')
+@click.option('--format-python', is_flag=True,
+              help="Formate les fichiers Python générés avec black (API, résultats en cache, pool de processus)")
+def generate(config, output, module_name, interactive, validate_only, verbose,
+             memprofile, memprofile_dir, memprofile_top, shard, timings,
+             write_workers, write_queue_depth, use_cache, no_cache, cache_dir, cache_max_size, cache_compress,
+             asset_store, asset_link, atomic_publish, keep_generations, format_xml, format_python):
     """Génère un module Odoo complet"""
     
+    if shard:
+        from .core.sharding import parse_shard_spec
+        try:
+            shard_index, shard_count = parse_shard_spec(shard)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--shard')
+    
+    # Profil mémoire : mesuré dans ce processus, pas dans celui du démon
+    if not interactive and not (memprofile or memprofile_dir):
+        exit_code = _forward_to_daemon('generate', {
+            'config': str(Path(config).resolve()) if config else None,
+            'output': str(Path(output).resolve()),
+            'module_name': module_name,
+            'interactive': False,
+            'validate_only': validate_only,
+            'verbose': verbose,
+            'shard': shard,
+            'timings': timings,
+            'write_workers': write_workers,
+            'write_queue_depth': write_queue_depth,
+            'use_cache': use_cache,
+            'no_cache': no_cache,
+            'cache_dir': str(Path(cache_dir).resolve()) if cache_dir else None,
+            'cache_max_size': cache_max_size,
+            'cache_compress': cache_compress,
+            'asset_store': str(Path(asset_store).resolve()) if asset_store else None,
+            'asset_link': asset_link,
+            'atomic_publish': atomic_publish,
+            'keep_generations': keep_generations,
+            'format_xml': format_xml,
+            'format_python': format_python,
+        })
+        if exit_code is not None:
+            sys.exit(exit_code)
+    
     if verbose:
         click.echo("🔧 Mode détaillé activé")
     
+    profiler = None
+    if memprofile or memprofile_dir:
+        from .utils.profiling import MemoryProfiler
+        profiler = MemoryProfiler(top_n=memprofile_top, snapshot_dir=memprofile_dir)
+        profiler.start()
+    
+    generation_timings = None
+    if timings:
+        from .utils.timings import GenerationTimings
+        generation_timings = GenerationTimings()
+    
+    from .utils.render_cache import RenderCache, cache_requested
+    render_cache = None
+    if cache_requested(use_cache, cache_dir, no_cache):
+        render_cache = RenderCache(cache_dir, max_bytes=cache_max_size * 1024 * 1024,
+                                   compress=cache_compress)
+    
+    python_formatter = _create_python_formatter(format_python, render_cache, default_cache=False)
+    
     try:
         # Obtention de la configuration
         if interactive:
@@ -50,7 +175,11 @@ def generate(config, output, module_name, interactive, validate_only, verbose):
                 module_name = config_data.get('module', {}).get('name', 'custom_module')
         elif config:
             click.echo(f"📄 Chargement de la configuration: {config}")
-            config_data = _load_config_file(config)
+            if profiler:
+                with profiler.stage('load'):
+                    config_data = _load_config_file(config)
+            else:
+                config_data = _load_config_file(config)
             if not module_name:
                 module_name = config_data.get('module', {}).get('name') or Path(config).stem
         else:
@@ -61,7 +190,7 @@ def generate(config, output, module_name, interactive, validate_only, verbose):
         # Validation uniquement
         if validate_only:
             click.echo("🔍 Validation de la configuration...")
-            generator = OdooModelGenerator()
+            generator = _get_generator()
             try:
                 models = generator._parse_models_config(config_data.get('models', []))
                 module_config = generator._parse_module_config(config_data.get('module', {}), module_name)
@@ -75,11 +204,20 @@ def generate(config, output, module_name, interactive, validate_only, verbose):
         # Nettoyage du nom du module
         module_name = _clean_module_name(module_name)
         
+        if shard:
+            from .core.sharding import ShardedModuleGenerator
+            click.echo(f"🧩 Génération du shard {shard_index}/{shard_count} du module '{module_name}'...")
+            manifest_path = ShardedModuleGenerator(_get_generator()).generate_shard(
+                config_data, output, module_name, shard_index, shard_count)
+            click.echo(f"✅ Shard généré: {manifest_path}")
+            click.echo(f"💡 Une fois tous les shards réunis: omg merge-shards -c {config} -n {module_name} -o {output}")
+            return
+        
         # Génération du module
         click.echo(f"🚀 Génération du module '{module_name}'...")
         click.echo(f"📁 Dossier de sortie: {output}")
         
-        generator = OdooModelGenerator()
+        generator = _get_generator()
         
         with click.progressbar(length=100, label='Génération en cours') as bar:
             # Simulation de progression
@@ -87,13 +225,33 @@ def generate(config, output, module_name, interactive, validate_only, verbose):
             module_path = generator.generate_module(
                 config_data=config_data,
                 output_path=output,
-                module_name=module_name
+                module_name=module_name,
+                options={
+                    'memory_profiler': profiler,
+                    'timings': generation_timings,
+                    'write_workers': write_workers,
+                    'write_queue_depth': write_queue_depth,
+                    'render_cache': render_cache,
+                    'asset_store': _create_asset_store(asset_store, asset_link),
+                    'atomic_publish': atomic_publish,
+                    'keep_generations': keep_generations,
+                    'format_xml': format_xml,
+                    'python_formatter': python_formatter,
+                }
             )
             bar.update(80)
         
         click.echo(f"✅ Module généré avec succès!")
         click.echo(f"📂 Emplacement: {module_path}")
         
+        if profiler:
+            click.echo("\n🧠 Profil mémoire par étape:")
+            click.echo(profiler.format_report())
+        
+        if generation_timings:
+            click.echo("\n⏱️  Temps par étape:")
+            click.echo(generation_timings.format_report())
+        
         # Affichage de la structure
         if verbose:
             click.echo(f"\n📋 Structure créée:")
@@ -113,6 +271,11 @@ def generate(config, output, module_name, interactive, validate_only, verbose):
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
+        if python_formatter and python_formatter is not _warm_python_formatter:
+            python_formatter.close()
 
 @cli.command()
 @click.option('--template', '-t', 
@@ -141,7 +304,7 @@ def init_config(template, output, format):
         if not format:
             format = 'json' if output_path.suffix.lower() == '.json' else 'yaml'
         
-        generator = OdooModelGenerator()
+        generator = _get_generator()
         config_file = generator.create_config_template(
             template_type=template,
             output_path=str(output_path.with_suffix(f'.{format}'))
@@ -162,10 +325,17 @@ def init_config(template, output, format):
 def validate(config_file, verbose):
     """Valide un fichier de configuration sans générer le module"""
     
+    exit_code = _forward_to_daemon('validate', {
+        'config_file': str(Path(config_file).resolve()),
+        'verbose': verbose,
+    })
+    if exit_code is not None:
+        sys.exit(exit_code)
+    
     try:
         click.echo(f"🔍 Validation du fichier: {config_file}")
         
-        generator = OdooModelGenerator()
+        generator = _get_generator()
         config_data = generator._load_config_file(config_file)
         
         # Parse et validation
@@ -191,6 +361,505 @@ def validate(config_file, verbose):
         click.echo(f"❌ Erreur de validation: {str(e)}")
         sys.exit(1)
 
+@cli.command()
+@click.option('--config', '-c', type=click.Path(exists=True, dir_okay=False), required=True,
+              help='Fichier de configuration (JSON ou YAML) à surveiller')
+@click.option('--output', '-o', type=click.Path(), default='./output',
+              help='Dossier de sortie (défaut: ./output)')
+@click.option('--module-name', '-n', help='Nom du module à générer')
+@click.option('--debounce', type=float, default=0.15, show_default=True,
+              help='Délai de stabilisation après une sauvegarde (secondes)')
+@click.option('--poll', is_flag=True, help="Scrutation des fichiers au lieu d'inotify")
+def watch(config, output, module_name, debounce, poll):
+    """Surveille une configuration et régénère le module à chaque sauvegarde
+
+    La configuration et ses fragments (`include`) sont surveillés ; seuls les
+    documents modifiés sont relus et seuls les fichiers concernés réécrits.
+    """
+    from .core.watch import ConfigWatcher, IncrementalModuleGenerator, InotifyBackend, create_backend
+
+    try:
+        config_data = _load_config_file(config)
+    except Exception as e:
+        click.echo(f"❌ {str(e)}")
+        sys.exit(1)
+    module_name = _clean_module_name(
+        module_name or config_data.get('module', {}).get('name') or Path(config).stem)
+
+    incremental = IncrementalModuleGenerator(config, output, module_name, generator=_get_generator())
+    backend = create_backend(polling=poll)
+    watcher = ConfigWatcher(incremental, debounce=debounce, backend=backend)
+    mode = 'inotify' if isinstance(backend, InotifyBackend) else 'scrutation'
+
+    def _on_update(update):
+        click.echo(f"🔁 {update.documents_parsed} document(s) relu(s), "
+                   f"{update.models_rendered}/{update.models_total} modèle(s) rendu(s), "
+                   f"{len(update.files_written)} fichier(s) écrit(s), "
+                   f"{len(update.files_removed)} supprimé(s) en {update.duration:.2f}s")
+
+    def _on_error(error):
+        click.echo(f"❌ {str(error)} (en attente de la prochaine sauvegarde)")
+
+    click.echo(f"👀 Surveillance de {config} ({mode}) → {Path(output) / module_name} (Ctrl+C pour arrêter)")
+    try:
+        watcher.run(on_update=_on_update, on_error=_on_error)
+    except KeyboardInterrupt:
+        click.echo("\n⏹️  Surveillance arrêtée")
+
+@cli.command('generate-batch')
+@click.argument('source')
+@click.option('--output', '-o', type=click.Path(), default='./output',
+              help='Répertoire de sortie commun des modules')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='Nombre de workers (défaut: nombre de CPU)')
+@click.option('--resume', is_flag=True,
+              help='Reprend un lot interrompu : saute les modules journalisés dont les fichiers sont intacts')
+@click.option('--journal', 'journal_path', type=click.Path(dir_okay=False),
+              help='Journal de reprise (défaut: <output>/.omg-journal.jsonl)')
+@click.option('--asset-store', type=click.Path(file_okay=False),
+              help="Magasin d'assets partagé : les fichiers static/ identiques y sont stockés une fois puis liés")
+@click.option('--asset-link', type=click.Choice(['hardlink', 'symlink', 'copy']), default='hardlink',
+              show_default=True, help="Mode de liaison des assets (copie en repli entre systèmes de fichiers)")
+@click.option('--atomic-publish', is_flag=True,
+              help="Génère dans un dossier de préparation puis remplace le module publié en un renommage atomique")
+@click.option('--keep-generations', type=click.IntRange(min=0), default=1, show_default=True,
+              help="Générations remplacées conservées pour 'omg rollback' (avec --atomic-publish)")
+@click.option('--format-xml', is_flag=True,
+              help='Réindente les fichiers XML générés (formateur en flux, attributs multi-lignes et CDATA préservés)')
+@click.option('--format-python', is_flag=True,
+              help="Formate les fichiers Python générés avec black (API, résultats en cache, pool de processus)")
+def generate_batch(source, output, jobs, resume, journal_path, asset_store, asset_link,
+                   atomic_publish, keep_generations, format_xml, format_python):
+    """Génère un module par configuration d'un dossier ou d'un glob
+
+    SOURCE est un dossier, un glob (ex: 'configs/*.yaml') ou un fichier.
+    Les modules sont répartis sur un pool de processus gardant les templates
+    compilés ; une configuration invalide n'interrompt pas le lot.
+    """
+    from .core.batch import BatchGenerator
+    from .core.journal import JOURNAL_FILE_NAME, CheckpointJournal
+
+    batch = BatchGenerator(jobs=jobs)
+    config_paths = batch.discover_configs(source)
+    if not config_paths:
+        click.echo(f"❌ Aucune configuration (.json, .yaml, .yml) trouvée pour: {source}")
+        sys.exit(1)
+
+    click.echo(f"🚀 Génération de {len(config_paths)} module(s) avec {batch.jobs} worker(s)")
+    Path(output).mkdir(parents=True, exist_ok=True)
+
+    def _on_result(result):
+        icon = '⏭️ ' if result.skipped else ('✅' if result.success else '❌')
+        click.echo(f"   {icon} {result.job.module_name} ({result.duration:.2f}s)")
+
+    with CheckpointJournal(journal_path or Path(output) / JOURNAL_FILE_NAME, resume=resume) as journal:
+        report = batch.run(batch.plan(config_paths), output, on_result=_on_result, journal=journal,
+                           options={'asset_store': _create_asset_store(asset_store, asset_link),
+                                    'atomic_publish': atomic_publish,
+                                    'keep_generations': keep_generations,
+                                    'format_xml': format_xml,
+                                    'python_formatter': _create_python_formatter(format_python)})
+
+    click.echo("\n📊 Rapport du lot:\n")
+    click.echo(report.format_report())
+
+    if report.failed:
+        sys.exit(1)
+
+@cli.command()
+@click.option('--cache-dir', type=click.Path(file_okay=False),
+              help='Dossier du cache de rendu (défaut: $OMG_CACHE_DIR ou ~/.cache/omg)')
+@click.option('--clear', is_flag=True, help='Vide le cache')
+def cache(cache_dir, clear):
+    """Affiche l'occupation du cache persistant des rendus ou le vide"""
+    from .utils.file_manager import FileManager
+    from .utils.render_cache import RenderCache
+
+    render_cache = RenderCache(cache_dir)
+    if clear:
+        removed = render_cache.clear()
+        click.echo(f"🧹 {removed} entrée(s) supprimée(s) de {render_cache.cache_dir}")
+        return
+
+    entries, size = render_cache.usage()
+    click.echo(f"🗄️  Cache de rendu: {render_cache.cache_dir}")
+    click.echo(f"   • Entrées: {entries}")
+    click.echo(f"   • Taille: {FileManager.format_file_size(size)}")
+
+@cli.command()
+@click.argument('module_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help="Archive à créer (défaut: <module>.<format> à côté du module)")
+@click.option('--format', 'format_type', type=click.Choice(['zip', 'tar.gz', 'tar']), default='tar.gz',
+              show_default=True, help="Format de l'archive")
+@click.option('--reproducible', is_flag=True,
+              help='Archive identique octet pour octet pour un module inchangé (dates: $SOURCE_DATE_EPOCH)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='Threads de compression (défaut: nombre de CPU)')
+def package(module_dir, output, format_type, reproducible, jobs):
+    """Archive un module généré (compression parallèle par blocs)"""
+    from .utils.file_manager import FileManager
+
+    module_path = Path(module_dir)
+    output = output or str(module_path.parent / f"{module_path.name}.{format_type}")
+    if not FileManager.create_archive(str(module_path), output, format_type,
+                                      reproducible=reproducible, workers=jobs):
+        sys.exit(1)
+
+    size = FileManager.format_file_size(Path(output).stat().st_size)
+    click.echo(f"📦 Archive créée: {output} ({size})")
+
+@cli.command()
+@click.argument('module_dir', type=click.Path(file_okay=False))
+@click.option('--steps', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Nombre de générations à remonter')
+@click.option('--list', 'list_only', is_flag=True, help='Liste les générations conservées')
+def rollback(module_dir, steps, list_only):
+    """Republie une génération précédente d'un module (publié avec --atomic-publish)"""
+    from datetime import datetime
+    from .utils.publish import ModulePublisher
+
+    module_path = Path(module_dir)
+    publisher = ModulePublisher(module_path.parent, module_path.name)
+    generations = publisher.generations()
+
+    if list_only:
+        if not generations:
+            click.echo(f"ℹ️  Aucune génération conservée pour {module_path.name}")
+        for i, generation in enumerate(generations, 1):
+            published_at = datetime.fromtimestamp(int(generation.name) / 1e9)
+            click.echo(f"   {i}. {published_at:%Y-%m-%d %H:%M:%S}  {generation}")
+        return
+
+    try:
+        publisher.rollback(steps)
+    except ValueError as e:
+        click.echo(f"❌ {str(e)}")
+        sys.exit(1)
+    click.echo(f"⏪ Génération précédente republiée: {module_path}")
+
+@cli.command('format-xml')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help='Fichier produit (un seul fichier source ; défaut: reformatage sur place)')
+def format_xml_command(paths, output):
+    """Réindente des fichiers XML en flux (fichiers de plusieurs centaines de Mo acceptés)
+
+    PATHS sont des fichiers ou des dossiers (tous leurs fichiers .xml).
+    """
+    from .utils.tree_walker import iter_files
+    from .utils.xml_formatter import format_xml_file
+
+    files = []
+    for path in paths:
+        if Path(path).is_dir():
+            files.extend(sorted(entry.path for entry in iter_files(path, '*.xml', skip_hidden=True)))
+        else:
+            files.append(path)
+    if output and len(files) != 1:
+        raise click.BadParameter('un seul fichier source avec --output', param_hint='--output')
+
+    for path in files:
+        try:
+            format_xml_file(path, output)
+        except (OSError, UnicodeDecodeError) as e:
+            click.echo(f"❌ {path}: {str(e)}")
+            sys.exit(1)
+        click.echo(f"✅ {output or path}")
+
+@cli.command()
+@click.option('--config', '-c', type=click.Path(exists=True), required=True,
+              help='Fichier de configuration du module')
+@click.option('--output', '-o', type=click.Path(), default='./output',
+              help='Répertoire de sortie (fichiers écrits dans <module>/demo)')
+@click.option('--module-name', '-n', help='Nom du module')
+@click.option('--rows', type=click.IntRange(min=0), default=None,
+              help="Enregistrements par modèle (défaut: demo.records de chaque modèle)")
+@click.option('--seed', type=click.IntRange(min=0), default=None,
+              help='Graine des valeurs (défaut: demo.seed de chaque modèle)')
+@click.option('--model', 'model_names', multiple=True,
+              help='Modèle à produire (répétable, défaut: tous)')
+@click.option('--format', 'data_format', type=click.Choice(['xml', 'csv']), default=None,
+              help='Format des fichiers (défaut: data_format du modèle ou du module)')
+def demo(config, output, module_name, rows, seed, model_names, data_format):
+    """Produit les données de démo en volume, écrites en flux (tests de charge)"""
+    import time
+    from .utils.file_manager import FileManager
+
+    try:
+        config_data = _load_config_file(config)
+        module_name = _clean_module_name(
+            module_name or config_data.get('module', {}).get('name') or Path(config).stem)
+        generator = _get_generator()
+        models, module_config = generator._prepare_configuration(config_data, module_name)
+    except Exception as e:
+        click.echo(f"❌ Configuration invalide: {str(e)}")
+        sys.exit(1)
+
+    unknown = set(model_names) - {model.name for model in models}
+    if unknown:
+        raise click.BadParameter(f"modèle(s) inconnu(s): {', '.join(sorted(unknown))}", param_hint='--model')
+
+    module_path = Path(output) / module_name
+    (module_path / 'demo').mkdir(parents=True, exist_ok=True)
+    for model in models:
+        if model_names and model.name not in model_names:
+            continue
+        relative_path, content = generator.module_builder._render_demo_file(
+            model, models, module_config, rows=rows, seed=seed, data_format=data_format)
+        file_path = module_path / relative_path
+        started = time.perf_counter()
+        try:
+            size = generator.module_builder._write_file(file_path, content)
+        except OSError as e:
+            click.echo(f"❌ {file_path}: {str(e)}")
+            sys.exit(1)
+        click.echo(f"✅ {file_path} ({content.records} enregistrements, "
+                   f"{FileManager.format_file_size(size)}, {time.perf_counter() - started:.2f}s)")
+
+@cli.command()
+@click.option('--config', '-c', type=click.Path(exists=True), required=True,
+              help='Fichier de configuration du module')
+@click.option('--output', '-o', type=click.Path(), default='./output',
+              help='Répertoire de sortie (fichiers écrits dans <module>/seed)')
+@click.option('--module-name', '-n', help='Nom du module')
+@click.option('--rows', type=click.IntRange(min=0), default=None,
+              help="Enregistrements par modèle (défaut: demo.records de chaque modèle)")
+@click.option('--seed', type=click.IntRange(min=0), default=None,
+              help='Graine des valeurs (défaut: demo.seed de chaque modèle)')
+@click.option('--model', 'model_names', multiple=True,
+              help='Modèle à produire (répétable, défaut: tous)')
+@click.option('--format', 'seed_format', type=click.Choice(['pgcopy']), default='pgcopy',
+              help='Format des fichiers (pgcopy: COPY ... FROM stdin de PostgreSQL)')
+def seed(config, output, module_name, rows, seed, model_names, seed_format):
+    """Produit les données en volume à charger directement dans PostgreSQL (sans l'ORM)"""
+    import time
+    from .core.seed_data import (LOADER_FILE, SEED_DIR, render_seed_files, render_seed_loader,
+                                 validate_seed_selection)
+    from .utils.file_manager import FileManager
+
+    try:
+        config_data = _load_config_file(config)
+        module_name = _clean_module_name(
+            module_name or config_data.get('module', {}).get('name') or Path(config).stem)
+        generator = _get_generator()
+        models, module_config = generator._prepare_configuration(config_data, module_name)
+    except Exception as e:
+        click.echo(f"❌ Configuration invalide: {str(e)}")
+        sys.exit(1)
+
+    unknown = set(model_names) - {model.name for model in models}
+    if unknown:
+        raise click.BadParameter(f"modèle(s) inconnu(s): {', '.join(sorted(unknown))}", param_hint='--model')
+    try:
+        validate_seed_selection(models, model_names, rows=rows)
+    except ValueError as e:
+        click.echo(f"❌ {str(e)}")
+        sys.exit(1)
+
+    module_path = Path(output) / module_name
+    (module_path / SEED_DIR).mkdir(parents=True, exist_ok=True)
+    files = []
+    for relative_path, content in render_seed_files(models, rows=rows, seed=seed, model_names=model_names):
+        file_path = module_path / relative_path
+        started = time.perf_counter()
+        try:
+            size = generator.module_builder._write_file(file_path, content)
+        except OSError as e:
+            click.echo(f"❌ {file_path}: {str(e)}")
+            sys.exit(1)
+        files.append((relative_path, content))
+        click.echo(f"✅ {file_path} ({FileManager.format_file_size(size)}, {time.perf_counter() - started:.2f}s)")
+
+    loader_path = module_path / LOADER_FILE
+    generator.module_builder._write_file(loader_path, render_seed_loader(files))
+    click.echo(f"✅ {loader_path}")
+    click.echo(f"💡 Chargement (tables du module vides): psql -d <base> -f {loader_path}")
+
+@cli.command('merge-shards')
+@click.argument('shard_dirs', nargs=-1, type=click.Path(exists=True, file_okay=False))
+@click.option('--config', '-c', type=click.Path(exists=True), required=True,
+              help='Configuration utilisée pour générer les shards')
+@click.option('--output', '-o', type=click.Path(), default='./output',
+              help='Dossier de sortie du module fusionné')
+@click.option('--module-name', '-n', help='Nom du module')
+def merge_shards(shard_dirs, config, output, module_name):
+    """Fusionne les shards d'un module et génère ses fichiers communs
+
+    SHARD_DIRS sont les dossiers de sortie des shards (artefacts des runners CI) ;
+    sans argument, les shards sont attendus dans le dossier de sortie.
+    """
+    from .core.sharding import ShardedModuleGenerator
+
+    try:
+        config_data = _load_config_file(config)
+        module_name = _clean_module_name(
+            module_name or config_data.get('module', {}).get('name') or Path(config).stem)
+        module_path = ShardedModuleGenerator(_get_generator()).merge_shards(
+            config_data, output, module_name, list(shard_dirs))
+    except Exception as e:
+        click.echo(f"❌ Erreur lors de la fusion: {str(e)}")
+        sys.exit(1)
+
+    click.echo(f"✅ Module fusionné: {module_path}")
+
+@cli.command('generate-workspace')
+@click.argument('workspace_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', type=click.Path(), default='./output',
+              help='Répertoire de sortie commun des modules')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='Nombre de workers (défaut: nombre de CPU)')
+@click.option('--force', is_flag=True, help='Régénère aussi les modules à jour')
+@click.option('--resume', is_flag=True,
+              help='Reprend une génération interrompue : saute les modules journalisés dont les fichiers sont intacts')
+@click.option('--journal', 'journal_path', type=click.Path(dir_okay=False),
+              help='Journal de reprise (défaut: <output>/.omg-journal.jsonl)')
+@click.option('--asset-store', type=click.Path(file_okay=False),
+              help="Magasin d'assets partagé : les fichiers static/ identiques y sont stockés une fois puis liés")
+@click.option('--asset-link', type=click.Choice(['hardlink', 'symlink', 'copy']), default='hardlink',
+              show_default=True, help="Mode de liaison des assets (copie en repli entre systèmes de fichiers)")
+@click.option('--atomic-publish', is_flag=True,
+              help="Génère dans un dossier de préparation puis remplace le module publié en un renommage atomique")
+@click.option('--keep-generations', type=click.IntRange(min=0), default=1, show_default=True,
+              help="Générations remplacées conservées pour 'omg rollback' (avec --atomic-publish)")
+@click.option('--format-xml', is_flag=True,
+              help='Réindente les fichiers XML générés (formateur en flux, attributs multi-lignes et CDATA préservés)')
+@click.option('--format-python', is_flag=True,
+              help="Formate les fichiers Python générés avec black (API, résultats en cache, pool de processus)")
+def generate_workspace(workspace_file, output, jobs, force, resume, journal_path, asset_store, asset_link,
+                       atomic_publish, keep_generations, format_xml, format_python):
+    """Génère les modules interdépendants d'un espace de travail
+
+    Les modules sont générés dans l'ordre de leurs dépendances (`module.depends`),
+    les modules indépendants en parallèle. Les références vers les modèles d'un
+    autre module sont validées, et les modules inchangés ne sont pas régénérés.
+    """
+    from .core.journal import JOURNAL_FILE_NAME, CheckpointJournal
+    from .core.workspace import Workspace, WorkspaceGenerator
+
+    try:
+        workspace = Workspace.load(workspace_file)
+    except Exception as e:
+        click.echo(f"❌ Espace de travail invalide: {str(e)}")
+        sys.exit(1)
+
+    generator = WorkspaceGenerator(jobs=jobs)
+    click.echo(f"🚀 Espace de travail: {len(workspace.modules)} module(s) avec {generator.jobs} worker(s)")
+
+    def _on_result(result):
+        icon = '⏭️ ' if result.skipped else ('✅' if result.success else '❌')
+        click.echo(f"   {icon} {result.job.module_name} ({result.duration:.2f}s)")
+
+    with CheckpointJournal(journal_path or Path(output) / JOURNAL_FILE_NAME, resume=resume) as journal:
+        report = generator.run_workspace(workspace, output, force=force, on_result=_on_result,
+                                         journal=journal,
+                                         options={'asset_store': _create_asset_store(asset_store, asset_link),
+                                                  'atomic_publish': atomic_publish,
+                                                  'keep_generations': keep_generations,
+                                                  'format_xml': format_xml,
+                                                  'python_formatter': _create_python_formatter(format_python)})
+
+    click.echo("\n📊 Rapport de l'espace de travail:\n")
+    click.echo(report.format_report())
+
+    if report.failed:
+        sys.exit(1)
+
+@cli.command()
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False),
+              help='Chemin du socket Unix (défaut: $OMG_DAEMON_SOCKET ou $XDG_RUNTIME_DIR)')
+@click.option('--status', is_flag=True, help="Affiche l'état du démon")
+@click.option('--stop', is_flag=True, help='Arrête le démon')
+def daemon(socket_path, status, stop):
+    """Démarre un démon de génération gardant les templates et configurations en mémoire
+    
+    Tant qu'il tourne, `omg generate` et `omg validate` lui sont transmis
+    automatiquement (désactivable avec OMG_NO_DAEMON=1), avec les variables
+    OMG_CACHE_DIR, OMG_NO_CACHE et XDG_CACHE_HOME du client ; `--memprofile`
+    s'exécute toujours localement.
+    """
+    from .service.daemon import DaemonClient, GenerationDaemon
+    
+    client = DaemonClient(socket_path)
+    
+    if status:
+        state = client.ping()
+        if state is None:
+            click.echo(f"⏹️  Aucun démon sur {client.socket_path}")
+            sys.exit(1)
+        click.echo(f"✅ Démon actif (pid {state['pid']}) sur {client.socket_path}")
+        click.echo(f"   • Requêtes traitées: {state['requests_served']}")
+        click.echo(f"   • Configurations en cache: {state['cached_configs']}")
+        return
+    
+    if stop:
+        if client.shutdown():
+            click.echo("⏹️  Démon arrêté")
+        else:
+            click.echo(f"❌ Aucun démon sur {client.socket_path}")
+            sys.exit(1)
+        return
+    
+    generation_daemon = GenerationDaemon(socket_path)
+    try:
+        generation_daemon.warm_up()
+        click.echo(f"🔥 Démon prêt sur {generation_daemon.socket_path} (Ctrl+C pour arrêter)")
+        generation_daemon.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\n⏹️  Démon arrêté")
+    except Exception as e:
+        click.echo(f"❌ Erreur du démon: {str(e)}")
+        sys.exit(1)
+
+@cli.command()
+@click.option('--http', 'use_http', is_flag=True, help='Service HTTP (POST /generate, GET /metrics)')
+@click.option('--host', default='127.0.0.1', show_default=True, help="Adresse d'écoute")
+@click.option('--port', '-p', type=int, default=8765, show_default=True, help="Port d'écoute")
+@click.option('--workers', '-w', type=int, default=4, show_default=True,
+              help='Nombre de générations simultanées (générateurs chauds)')
+@click.option('--max-body-size', type=int, default=10 * 1024 * 1024, show_default=True,
+              help='Taille maximale du corps de requête (octets)')
+@click.option('--max-models', type=int, default=500, show_default=True,
+              help='Nombre maximal de modèles par requête')
+@click.option('--max-fields', type=int, default=20000, show_default=True,
+              help='Nombre maximal de champs par requête')
+@click.option('--queue-timeout', type=float, default=30.0, show_default=True,
+              help="Attente maximale d'un worker libre avant réponse 503 (secondes)")
+@click.option('--max-output-size', type=int, default=200 * 1024 * 1024, show_default=True,
+              help='Volume maximal produit par une génération (octets)')
+@click.option('--max-generation-time', type=float, default=60.0, show_default=True,
+              help="Durée maximale d'une génération (secondes)")
+def serve(use_http, host, port, workers, max_body_size, max_models, max_fields, queue_timeout,
+          max_output_size, max_generation_time):
+    """Expose la génération en service réseau
+    
+    POST /generate avec une configuration JSON ou YAML (Content-Type) renvoie
+    le module zippé ; GET /metrics expose les métriques Prometheus.
+    """
+    if not use_http:
+        click.echo("❌ Précisez le transport: --http (le démon local est `omg daemon`)")
+        sys.exit(2)
+    
+    from .service.http_server import ServiceLimits, serve_http
+    
+    limits = ServiceLimits(
+        max_body_bytes=max_body_size,
+        max_models=max_models,
+        max_fields=max_fields,
+        queue_timeout=queue_timeout,
+        max_output_bytes=max_output_size,
+        max_generation_time=max_generation_time
+    )
+    
+    click.echo(f"🌐 Service HTTP sur http://{host}:{port} ({workers} worker(s), Ctrl+C pour arrêter)")
+    try:
+        serve_http(host=host, port=port, workers=workers, limits=limits)
+    except KeyboardInterrupt:
+        click.echo("\n⏹️  Service arrêté")
+    except Exception as e:
+        click.echo(f"❌ Erreur du service: {str(e)}")
+        sys.exit(1)
+
 @cli.command()
 def list_templates():
     """Liste les templates de configuration disponibles"""
@@ -332,67 +1001,77 @@ def _interactive_config() -> Dict:
 
 def _load_config_file(config_path: str) -> Dict:
     """Charge un fichier de configuration"""
-    path = Path(config_path)
-    
     try:
-        if path.suffix.lower() == '.json':
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        elif path.suffix.lower() in ['.yaml', '.yml']:
-            with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        else:
-            raise ValueError("Format de fichier non supporté. Utilisez JSON ou YAML.")
+        return _get_generator()._load_config_file(config_path)
     except Exception as e:
         raise Exception(f"Erreur lors du chargement de {config_path}: {e}")
 
 def _clean_module_name(name: str) -> str:
     """Nettoie le nom du module pour Odoo"""
-    # Remplace les espaces et caractères spéciaux par des underscores
-    cleaned = ''.join(c if c.isalnum() else '_' for c in name.lower())
-    # Supprime les underscores multiples
-    while '__' in cleaned:
-        cleaned = cleaned.replace('__', '_')
-    # Supprime les underscores en début et fin
-    return cleaned.strip('_')
-
-def _display_tree(path: str, prefix: str = "", max_depth: int = 3, current_depth: int = 0):
+    from .utils.formatters import CodeFormatter
+    return CodeFormatter.format_module_name(name)
+
+def _create_asset_store(store_dir: str, link_mode: str):
+    """Magasin d'assets partagé (None si non demandé)"""
+    if not store_dir:
+        return None
+    from .utils.asset_store import AssetStore
+    return AssetStore(store_dir, link_mode=link_mode)
+
+def _create_python_formatter(enabled: bool, render_cache=None, default_cache: bool = True):
+    """Passe de formatage Python (None si non demandée)
+
+    Les résultats sont conservés dans le cache de rendu : celui de la commande,
+    sinon (``default_cache``) celui de $OMG_CACHE_DIR s'il est défini ; à
+    défaut, en mémoire pour l'exécution.
+    """
+    if not enabled:
+        return None
+    from .utils.python_formatter import PythonFormatter, black_available
+    
+    if not black_available():
+        click.echo("⚠️  black n'est pas installé (pip install black) : nettoyage des espaces seulement", err=True)
+    if render_cache is None and default_cache:
+        from .utils.render_cache import RenderCache, cache_requested
+        if cache_requested():
+            render_cache = RenderCache()
+    if _warm_python_formatter is not None:
+        _warm_python_formatter.begin_run(render_cache)
+        return _warm_python_formatter
+    return PythonFormatter(cache=render_cache)
+
+def _display_tree(path: str, max_depth: int = 3):
     """Affiche l'arborescence des fichiers"""
-    if current_depth >= max_depth:
-        return
-        
-    path = Path(path)
-    if not path.exists():
-        return
+    from .utils.tree_walker import scan_tree
     
-    contents = sorted(path.iterdir(), key=lambda p: (p.is_file(), p.name))
+    if not Path(path).exists():
+        return
     
-    for i, item in enumerate(contents):
-        if item.name.startswith('.'):
-            continue
-            
-        is_last = i == len(contents) - 1
+    # Préfixe hérité de chaque niveau : "│   " tant que le dossier parent a des frères
+    branches = []
+    for entry, depth, is_last in scan_tree(path, max_depth=max_depth, skip_hidden=True,
+                                           sort_key=lambda e: (not e.is_dir(), e.name)):
+        del branches[depth - 1:]
         current_prefix = "└── " if is_last else "├── "
+        is_dir = entry.is_dir()
+        suffix = os.path.splitext(entry.name)[1]
         
         # Icônes selon le type de fichier
-        if item.is_dir():
+        if is_dir:
             icon = "📁"
-        elif item.suffix == '.py':
+        elif suffix == '.py':
             icon = "🐍"
-        elif item.suffix in ['.xml', '.yml', '.yaml']:
+        elif suffix in ['.xml', '.yml', '.yaml']:
             icon = "📄"
-        elif item.suffix == '.csv':
+        elif suffix == '.csv':
             icon = "📊"
-        elif item.name == 'README.md':
+        elif entry.name == 'README.md':
             icon = "📖"
         else:
             icon = "📄"
         
-        click.echo(f"{prefix}{current_prefix}{icon} {item.name}")
-        
-        if item.is_dir() and current_depth < max_depth - 1:
-            extension = "    " if is_last else "│   "
-            _display_tree(item, prefix + extension, max_depth, current_depth + 1)
+        click.echo(f"{''.join(branches)}{current_prefix}{icon} {entry.name}")
+        branches.append("    " if is_last else "│   ")
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -59,7 +59,9 @@ class ModelConfig:
                  auto_create_views: bool = True,
                  auto_create_menu: bool = True,
                  menu_parent: str = None,
-                 security_groups: List[str] = None):
+                 security_groups: List[str] = None,
+                 demo: Dict[str, Any] = None,
+                 data_format: str = None):
         self.name = name
         self.description = description or name.replace('.', ' ').title()
         self.table_name = table_name
@@ -69,6 +71,10 @@ class ModelConfig:
         self.auto_create_menu = auto_create_menu
         self.menu_parent = menu_parent
         self.security_groups = security_groups or ['base.group_user']
+        # Données de démo : ``records`` (nombre d'enregistrements), ``seed``
+        self.demo = demo or {}
+        # Format des données de démo ('xml' ou 'csv', défaut: celui du module)
+        self.data_format = data_format
 
     def add_field(self, field: FieldConfig):
         """Ajoute un champ au modèle"""
@@ -98,7 +104,8 @@ class ModuleConfig:
                  depends: List[str] = None,
                  license: str = "LGPL-3",
                  is_application: bool = True,
-                 sequence: int = 100):
+                 sequence: int = 100,
+                 data_format: str = 'xml'):
         self.name = name
         self.version = version
         self.category = category
@@ -110,6 +117,7 @@ class ModuleConfig:
         self.license = license
         self.is_application = is_application
         self.sequence = sequence
+        self.data_format = data_format
 
     def __repr__(self):
         return f"ModuleConfig(name='{self.name}', version='{self.version}')"
\ No newline at end of file
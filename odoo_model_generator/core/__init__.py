@@ -3,16 +3,56 @@
 Core components pour Odoo Model Generator
 """
 
-from .generator import OdooModelGenerator
-from .model_builder import ModelBuilder
-from .view_builder import ViewBuilder
-from .menu_builder import MenuBuilder
-from .module_builder import ModuleBuilder
+import importlib
+
+# Import paresseux : chaque constructeur charge jinja2 à l'import
+_LAZY_ATTRIBUTES = {
+    'OdooModelGenerator': '.generator',
+    'ModelBuilder': '.model_builder',
+    'ViewBuilder': '.view_builder',
+    'MenuBuilder': '.menu_builder',
+    'ModuleBuilder': '.module_builder',
+    'AsyncOdooModelGenerator': '.async_generator',
+    'BatchGenerator': '.batch',
+    'Workspace': '.workspace',
+    'WorkspaceGenerator': '.workspace',
+    'ShardedModuleGenerator': '.sharding',
+    'IncrementalModuleGenerator': '.watch',
+    'ConfigWatcher': '.watch',
+    'CheckpointJournal': '.journal',
+    'GenerationBudget': '.budget',
+    'GenerationBudgetExceeded': '.budget',
+    'CancellationToken': '.budget',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     'OdooModelGenerator',
     'ModelBuilder',
     'ViewBuilder',
     'MenuBuilder',
-    'ModuleBuilder'
-]
\ No newline at end of file
+    'ModuleBuilder',
+    'AsyncOdooModelGenerator',
+    'BatchGenerator',
+    'Workspace',
+    'WorkspaceGenerator',
+    'ShardedModuleGenerator',
+    'IncrementalModuleGenerator',
+    'ConfigWatcher',
+    'CheckpointJournal',
+    'GenerationBudget',
+    'GenerationBudgetExceeded',
+    'CancellationToken'
+]
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+API asyncio pour intégrer la génération dans des services asynchrones
+"""
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Tuple, Union
+
+from .generator import OdooModelGenerator
+from .workers import get_worker_generator
+from ..config.field_types import ModelConfig, ModuleConfig
+from ..utils.pipeline import StreamedContent, write_content
+
+logger = logging.getLogger(__name__)
+
+
+def _prepare_in_worker(config_data: Dict, module_name: str) -> Tuple[List[ModelConfig], ModuleConfig]:
+    return get_worker_generator()._prepare_configuration(config_data, module_name)
+
+
+def _render_module_wide_in_worker(module_name: str, models: List[ModelConfig],
+                                  module_config: ModuleConfig) -> List[Tuple[str, Union[str, bytes]]]:
+    generator = get_worker_generator()
+    return list(generator.module_builder.render_module_files(module_name, models, module_config))
+
+
+def _render_model_in_worker(model: ModelConfig, options: Dict) -> List[Tuple[str, str]]:
+    return get_worker_generator()._render_model_files(model, options)
+
+
+def _render_global_menu_in_worker(models: List[ModelConfig], global_menu_config: Dict) -> List[Tuple[str, str]]:
+    content = get_worker_generator().menu_builder.create_menu_structure(models, global_menu_config)
+    return [('views/menu_global.xml', content)]
+
+
+def _write_file(file_path: Path, content: Union[str, bytes, StreamedContent]):
+    write_content(file_path, content)
+
+
+class AsyncOdooModelGenerator:
+    """Générateur asynchrone produisant exactement la même sortie que OdooModelGenerator
+
+    - le rendu Jinja (CPU) s'exécute dans un pool de processus (ou de threads
+      avec ``use_processes=False``), sans bloquer la boucle d'événements
+    - les écritures disque passent par un pool de threads dédié
+    - l'annulation de la tâche asyncio annule les rendus et écritures en attente
+
+    Usage:
+        async with AsyncOdooModelGenerator() as generator:
+            module_path = await generator.generate_module_async(config, './output', 'my_module')
+    """
+
+    def __init__(self, max_workers: int = None, use_processes: bool = True,
+                 io_workers: int = 4, max_pending: int = None):
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.io_workers = io_workers
+        # Nombre maximal de rendus soumis en avance (borne la mémoire)
+        self.max_pending = max_pending or max(2, (max_workers or 4) * 2)
+        self._render_executor = None
+        self._io_executor = None
+        self._sync_generator = OdooModelGenerator()
+
+    @property
+    def render_executor(self) -> Executor:
+        """Pool de rendu (créé à la première utilisation)"""
+        if self._render_executor is None:
+            if self.use_processes:
+                self._render_executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._render_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='omg-render')
+        return self._render_executor
+
+    @property
+    def io_executor(self) -> Executor:
+        """Pool d'écriture disque (créé à la première utilisation)"""
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='omg-io')
+        return self._io_executor
+
+    async def __aenter__(self) -> 'AsyncOdooModelGenerator':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Arrête les pools sans bloquer la boucle"""
+        loop = asyncio.get_running_loop()
+        for executor in (self._render_executor, self._io_executor):
+            if executor is not None:
+                await loop.run_in_executor(None, executor.shutdown)
+        self._render_executor = None
+        self._io_executor = None
+
+    async def iter_module_files_async(self,
+                                      config_data: Dict,
+                                      module_name: str,
+                                      options: Dict = None) -> AsyncIterator[Tuple[str, Union[str, bytes]]]:
+        """
+        Rend un module fichier par fichier, dans le même ordre que iter_module_files
+
+        Args:
+            config_data: Configuration des modèles et du module
+            module_name: Nom du module
+            options: Options de génération (seules les options sérialisables,
+                comme ``menu_config``, sont transmises aux workers)
+
+        Returns:
+            Itérateur asynchrone de (chemin relatif au module, contenu)
+        """
+        options = options or {}
+        render_options = {'menu_config': options.get('menu_config', {})}
+        loop = asyncio.get_running_loop()
+        executor = self.render_executor
+
+        models, module_config = await loop.run_in_executor(
+            executor, _prepare_in_worker, config_data, module_name)
+
+        tasks = [(_render_module_wide_in_worker, (module_name, models, module_config))]
+        tasks += [(_render_model_in_worker, (model, render_options)) for model in models]
+        if len(models) > 1:
+            tasks.append((_render_global_menu_in_worker, (models, config_data.get('global_menu', {}))))
+
+        pending = deque()
+        remaining = iter(tasks)
+        try:
+            for function, args in remaining:
+                pending.append(loop.run_in_executor(executor, function, *args))
+                if len(pending) < self.max_pending:
+                    continue
+                for file_entry in await pending.popleft():
+                    yield file_entry
+            while pending:
+                for file_entry in await pending.popleft():
+                    yield file_entry
+        finally:
+            # Annulation (ou arrêt anticipé du consommateur) : rendus en attente abandonnés
+            for future in pending:
+                future.cancel()
+
+    async def generate_module_async(self,
+                                    config_data: Dict,
+                                    output_path: str,
+                                    module_name: str,
+                                    options: Dict = None) -> str:
+        """
+        Génère un module Odoo complet sans bloquer la boucle d'événements
+
+        Args:
+            config_data: Configuration des modèles et du module
+            output_path: Chemin de sortie pour le module
+            module_name: Nom du module à créer
+            options: Options supplémentaires de génération
+
+        Returns:
+            Chemin vers le module généré
+        """
+        loop = asyncio.get_running_loop()
+        module_builder = self._sync_generator.module_builder
+        module_path = Path(output_path) / module_name
+        logger.info(f"Démarrage de la génération asynchrone du module '{module_name}'")
+
+        writes = set()
+        try:
+            await loop.run_in_executor(self.io_executor, module_builder._create_directory_structure, module_path)
+
+            async for relative_path, content in self.iter_module_files_async(config_data, module_name, options):
+                writes.add(loop.run_in_executor(self.io_executor, _write_file, module_path / relative_path, content))
+                if len(writes) >= self.max_pending:
+                    done, writes = await asyncio.wait(writes, return_when=asyncio.FIRST_COMPLETED)
+                    for write in done:
+                        write.result()
+
+            if writes:
+                done, writes = await asyncio.wait(writes)
+                for write in done:
+                    write.result()
+        finally:
+            for write in writes:
+                write.cancel()
+
+        validation_result = await loop.run_in_executor(
+            self.io_executor, module_builder.validate_module_structure, str(module_path))
+        failed_validations = [k for k, v in validation_result.items() if not v]
+        if failed_validations:
+            logger.warning(f"Validations échouées: {failed_validations}")
+
+        return str(module_path)
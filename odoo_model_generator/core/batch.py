@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Génération par lots : plusieurs modules répartis sur un pool de workers chauds
+"""
+
+import glob
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .journal import CheckpointJournal, hash_module_files, unit_fingerprint
+from .workers import get_worker_generator, warm_up_worker
+
+logger = logging.getLogger(__name__)
+
+CONFIG_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+class BatchJob:
+    """Un module à générer dans un lot"""
+
+    def __init__(self, module_name: str, config_path: str = None,
+                 config_data: Dict = None, estimated_cost: int = 0):
+        self.module_name = module_name
+        self.config_path = config_path
+        self.config_data = config_data
+        self.estimated_cost = estimated_cost
+
+    def __repr__(self):
+        return f"BatchJob(module_name='{self.module_name}', cost={self.estimated_cost})"
+
+
+class BatchResult:
+    """Résultat de la génération d'un module du lot"""
+
+    def __init__(self, job: BatchJob, success: bool, duration: float,
+                 module_path: str = None, error: str = None, skipped: bool = False):
+        self.job = job
+        self.success = success
+        self.duration = duration
+        self.module_path = module_path
+        self.error = error
+        # Module déjà à jour : rien n'a été régénéré
+        self.skipped = skipped
+        # Hash des fichiers produits (journal de reprise)
+        self.files: Optional[Dict[str, str]] = None
+
+    def __repr__(self):
+        status = 'à jour' if self.skipped else ('ok' if self.success else 'échec')
+        return f"BatchResult(module_name='{self.job.module_name}', {status}, {self.duration:.2f}s)"
+
+
+class BatchReport:
+    """Rapport d'un lot : succès, échecs et temps par module"""
+
+    def __init__(self, results: List[BatchResult], wall_time: float):
+        self.results = results
+        self.wall_time = wall_time
+
+    @property
+    def succeeded(self) -> List[BatchResult]:
+        return [r for r in self.results if r.success]
+
+    @property
+    def skipped(self) -> List[BatchResult]:
+        return [r for r in self.results if r.skipped]
+
+    @property
+    def failed(self) -> List[BatchResult]:
+        return [r for r in self.results if not r.success]
+
+    def format_report(self) -> str:
+        """Formate le rapport par module"""
+        lines = [f"{'Module':<32} {'Statut':<8} {'Temps':>8}  Détail"]
+        for result in sorted(self.results, key=lambda r: r.job.module_name):
+            status = 'À JOUR' if result.skipped else ('OK' if result.success else 'ÉCHEC')
+            detail = result.module_path if result.success else result.error
+            lines.append(f"{result.job.module_name:<32} {status:<8} {result.duration:>7.2f}s  {detail}")
+        cpu_time = sum(r.duration for r in self.results)
+        skipped = f", {len(self.skipped)} à jour" if self.skipped else ''
+        lines.append(
+            f"\n{len(self.succeeded) - len(self.skipped)} réussi(s){skipped}, {len(self.failed)} échoué(s) - "
+            f"{self.wall_time:.2f}s écoulées, {cpu_time:.2f}s de génération cumulée"
+        )
+        return '\n'.join(lines)
+
+
+def _generate_job_in_worker(job: BatchJob, output_path: str, options: Dict,
+                            hash_outputs: bool = False) -> BatchResult:
+    """Génère un module dans le worker ; les erreurs sont rapportées, jamais propagées
+
+    Avec ``hash_outputs``, les fichiers produits sont hachés dans le worker
+    (pour le journal de reprise) plutôt que dans le processus principal.
+    """
+    started = time.perf_counter()
+    try:
+        generator = get_worker_generator()
+        config_data = job.config_data
+        if config_data is None:
+            config_data = generator._load_config_file(job.config_path)
+        module_path = generator.generate_module(config_data, output_path, job.module_name, options)
+        result = BatchResult(job, True, time.perf_counter() - started, module_path=module_path)
+        if hash_outputs:
+            result.files = hash_module_files(module_path)
+        return result
+    except Exception as e:
+        # Une ligne par module dans le rapport (les erreurs YAML sont multilignes)
+        message = ' '.join(str(e).split())
+        return BatchResult(job, False, time.perf_counter() - started, error=f"{type(e).__name__}: {message}")
+
+
+class BatchGenerator:
+    """Planifie des modules entiers sur un pool de workers
+
+    Chaque worker garde son générateur (templates compilés) d'un module à
+    l'autre. Les modules sont soumis du plus coûteux au moins coûteux
+    (longest-job-first, coût estimé = modèles + champs) pour limiter la
+    traîne en fin de lot. Une configuration invalide n'interrompt pas le lot.
+    """
+
+    def __init__(self, jobs: int = None, use_processes: bool = True):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.use_processes = use_processes
+
+    def _create_executor(self) -> Executor:
+        """Crée le pool de workers, chacun réchauffant son générateur"""
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.jobs, initializer=warm_up_worker)
+        return ThreadPoolExecutor(max_workers=self.jobs, initializer=warm_up_worker)
+
+    @staticmethod
+    def discover_configs(source: str) -> List[Path]:
+        """Trouve les fichiers de configuration d'un dossier, d'un glob ou d'un fichier"""
+        path = Path(source)
+        if path.is_dir():
+            candidates = [p for p in path.iterdir() if p.is_file()]
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = [Path(p) for p in glob.glob(source, recursive=True) if os.path.isfile(p)]
+        return sorted(p for p in candidates if p.suffix.lower() in CONFIG_EXTENSIONS)
+
+    @staticmethod
+    def estimate_cost(config_data: Dict) -> int:
+        """Estime le coût de génération d'une configuration (modèles + champs)"""
+        models = (config_data or {}).get('models') or []
+        return len(models) + sum(len(m.get('fields') or []) for m in models if isinstance(m, dict))
+
+    def plan(self, config_paths: List[Path]) -> List[BatchJob]:
+        """Crée les jobs d'un lot, triés du plus coûteux au moins coûteux"""
+        from ..utils.formatters import CodeFormatter
+
+        loader = get_worker_generator()
+        jobs = []
+        for config_path in config_paths:
+            try:
+                config_data = loader._load_config_file(str(config_path))
+            except Exception:
+                # Rapporté par le worker, sans bloquer la planification
+                config_data = None
+            module_name = ((config_data or {}).get('module') or {}).get('name') or config_path.stem
+            jobs.append(BatchJob(
+                module_name=CodeFormatter.format_module_name(module_name),
+                config_path=str(config_path),
+                config_data=config_data,
+                estimated_cost=self.estimate_cost(config_data)
+            ))
+        return self.sort_jobs(jobs)
+
+    @staticmethod
+    def sort_jobs(jobs: List[BatchJob]) -> List[BatchJob]:
+        """Ordonne les jobs du plus long au plus court (ordre stable à coût égal)"""
+        return sorted(jobs, key=lambda job: -job.estimated_cost)
+
+    def run(self, jobs: List[BatchJob], output_path: str, options: Dict = None,
+            on_result: Optional[Callable[[BatchResult], None]] = None,
+            journal: CheckpointJournal = None) -> BatchReport:
+        """
+        Exécute un lot de jobs
+
+        Args:
+            jobs: Jobs à exécuter (dans l'ordre de soumission souhaité)
+            output_path: Dossier de sortie commun
+            options: Options de génération (sérialisables)
+            on_result: Rappel appelé à chaque module terminé
+            journal: Journal de reprise : les modules terminés y sont
+                consignés et, en reprise, ceux dont les fichiers sont intacts
+                sont sautés
+
+        Returns:
+            Rapport du lot
+        """
+        options = options or {}
+        started = time.perf_counter()
+        results = []
+
+        # Deux configurations produisant le même module s'écraseraient
+        seen = set()
+        runnable = []
+        fingerprints = {}
+        for job in jobs:
+            if job.module_name in seen:
+                results.append(BatchResult(job, False, 0.0, error="Nom de module dupliqué dans le lot"))
+                continue
+            seen.add(job.module_name)
+            if journal is not None and job.config_data is not None:
+                fingerprints[job.module_name] = unit_fingerprint(job.module_name, job.config_data, options)
+                module_path = str(Path(output_path) / job.module_name)
+                if journal.is_complete(job.module_name, fingerprints[job.module_name], module_path):
+                    result = BatchResult(job, True, 0.0, module_path=module_path, skipped=True)
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+                    continue
+            runnable.append(job)
+
+        with self._create_executor() as executor:
+            futures = {executor.submit(_generate_job_in_worker, job, output_path, options,
+                                       journal is not None): job
+                       for job in runnable}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker mort (OOM, signal) : seul ce module est en échec
+                    result = BatchResult(futures[future], False, 0.0, error=f"Worker interrompu: {e}")
+                if result.success and journal is not None and result.job.module_name in fingerprints:
+                    journal.record(result.job.module_name, fingerprints[result.job.module_name], result.files)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        for result in results:
+            if not result.success:
+                logger.warning(f"Échec du module {result.job.module_name}: {result.error}")
+
+        return BatchReport(results, time.perf_counter() - started)
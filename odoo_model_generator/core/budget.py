@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Budgets de génération et annulation coopérative
+
+Un ``GenerationBudget`` passé dans ``options['budget']`` borne une génération :
+nombre de modèles et de champs, octets produits et durée. Les limites sont
+vérifiées entre les étapes et à chaque modèle ; un dépassement (ou une
+annulation via ``CancellationToken``) lève ``GenerationBudgetExceeded`` avec
+les temps des étapes déjà parcourues.
+"""
+
+import threading
+import time
+from typing import List, Tuple
+
+
+class GenerationBudgetExceeded(Exception):
+    """Limite de génération dépassée
+
+    Attributes:
+        limit: Limite dépassée ('models', 'fields', 'output_bytes', 'deadline', 'cancelled')
+        value: Valeur atteinte
+        maximum: Valeur maximale autorisée
+        stage: Étape en cours au moment du dépassement
+        elapsed: Temps écoulé depuis le début de la génération (secondes)
+        timings: Temps des étapes parcourues, étape en cours comprise
+    """
+
+    def __init__(self, limit: str, message: str, value=None, maximum=None, stage: str = None,
+                 elapsed: float = 0.0, timings: List[Tuple[str, float]] = None):
+        super().__init__(message)
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+        self.stage = stage
+        self.elapsed = elapsed
+        self.timings = timings or []
+
+
+class GenerationCancelled(GenerationBudgetExceeded):
+    """Génération annulée via son ``CancellationToken``"""
+
+
+class CancellationToken:
+    """Jeton d'annulation partagé entre le demandeur et la génération (thread-safe)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason: str = None):
+        """Demande l'arrêt de la génération au prochain point de contrôle"""
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class GenerationBudget:
+    """Limites d'une génération, vérifiées de façon coopérative
+
+    Même interface d'étapes que GenerationTimings (``start_stage``/``end_stage``) :
+    le budget suit les étapes pour rapporter des temps partiels. Une limite à
+    None n'est pas appliquée.
+
+    Usage:
+        budget = GenerationBudget(max_models=200, max_output_bytes=50 * 1024 * 1024, timeout=30)
+        generator.generate_module(config, output, name, {'budget': budget})
+    """
+
+    def __init__(self, max_models: int = None, max_fields: int = None,
+                 max_output_bytes: int = None, timeout: float = None,
+                 token: CancellationToken = None):
+        self.max_models = max_models
+        self.max_fields = max_fields
+        self.max_output_bytes = max_output_bytes
+        self.timeout = timeout
+        self.token = token
+        self.output_bytes = 0
+        self.stages: List[Tuple[str, float]] = []
+        self._started = None
+        self._stage = None
+        self._stage_started = None
+
+    def start(self):
+        """Démarre le décompte du temps (appelé par la génération, une seule fois)"""
+        if self._started is None:
+            self._started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started if self._started is not None else 0.0
+
+    def start_stage(self, name: str):
+        """Début d'une étape : point de contrôle"""
+        self.start()
+        self._stage = name
+        self._stage_started = time.monotonic()
+        self.check()
+
+    def end_stage(self, name: str):
+        """Fin d'une étape (ne lève jamais : appelée aussi pendant la propagation d'une erreur)"""
+        if self._stage_started is not None:
+            self.stages.append((name, time.monotonic() - self._stage_started))
+        self._stage = None
+        self._stage_started = None
+
+    def partial_timings(self) -> List[Tuple[str, float]]:
+        """Temps des étapes terminées et de l'étape en cours"""
+        timings = list(self.stages)
+        if self._stage is not None:
+            timings.append((self._stage, time.monotonic() - self._stage_started))
+        return timings
+
+    def _exceeded(self, limit: str, message: str, value=None, maximum=None,
+                  error_class=GenerationBudgetExceeded):
+        raise error_class(limit, message, value=value, maximum=maximum, stage=self._stage,
+                          elapsed=self.elapsed, timings=self.partial_timings())
+
+    def check(self):
+        """Vérifie l'annulation et l'échéance"""
+        self.start()
+        if self.token is not None and self.token.cancelled:
+            reason = f": {self.token.reason}" if self.token.reason else ''
+            self._exceeded('cancelled', f"Génération annulée{reason}", error_class=GenerationCancelled)
+        if self.timeout is not None:
+            elapsed = self.elapsed
+            if elapsed > self.timeout:
+                self._exceeded('deadline', f"Durée maximale dépassée: {elapsed:.2f}s (max {self.timeout:g}s)",
+                               value=elapsed, maximum=self.timeout)
+
+    def check_models(self, models: list):
+        """Vérifie le nombre de modèles et de champs d'une configuration parsée"""
+        if self.max_models is not None and len(models) > self.max_models:
+            self._exceeded('models', f"Trop de modèles: {len(models)} (max {self.max_models})",
+                           value=len(models), maximum=self.max_models)
+        if self.max_fields is not None:
+            field_count = sum(len(model.fields) for model in models)
+            if field_count > self.max_fields:
+                self._exceeded('fields', f"Trop de champs: {field_count} (max {self.max_fields})",
+                               value=field_count, maximum=self.max_fields)
+
+    def consume_output(self, content):
+        """Comptabilise un fichier produit et vérifie le volume total"""
+        size = len(content) if isinstance(content, bytes) else len(content.encode('utf-8'))
+        self.output_bytes += size
+        if self.max_output_bytes is not None and self.output_bytes > self.max_output_bytes:
+            self._exceeded('output_bytes',
+                           f"Volume produit trop important: {self.output_bytes} octets "
+                           f"(max {self.max_output_bytes})",
+                           value=self.output_bytes, maximum=self.max_output_bytes)
+
+    def consume_chunks(self, chunks):
+        """Comptabilise un contenu en flux au fil de sa production (à l'écriture)"""
+        for chunk in chunks:
+            self.consume_output(chunk)
+            yield chunk
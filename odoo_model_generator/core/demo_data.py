@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Données de démonstration en volume (tests de charge)
+
+Chaque modèle produit ``demo.records`` enregistrements (3 par défaut), écrits
+par paquets : la mémoire reste constante de 3 à plusieurs millions de lignes.
+Les valeurs de chaque paquet sont produites colonne par colonne
+(``demo_values``), avec une graine par colonne dérivée de ``demo.seed`` :
+même configuration, même fichier.
+
+Relations :
+
+- les fichiers sont chargés dans l'ordre des dépendances (``demo_load_order``,
+  repris par le manifeste) : un modèle après les modèles qu'il référence
+- many2one / many2many vers un modèle du module chargé avant ou vers le
+  modèle lui-même (enregistrements précédents) : ``ref`` vers ses
+  enregistrements de démo, tirés uniformément ou selon une loi de Zipf
+  (``demo.relations``), avec 1 à 3 cibles par many2many par défaut
+- vers les modèles de base courants (partenaires, utilisateurs, devises...) :
+  enregistrements de démo du module ``base``
+- sinon le champ est omis, comme les one2many, les binaires et les champs
+  calculés
+
+Deux formats (``data_format`` du module ou du modèle) : ``xml`` (balises
+``<record>``) ou ``csv`` (``demo/<modèle>.csv``, colonnes ``id`` et
+``champ/id`` pour les relations), chargé bien plus vite par Odoo.
+"""
+
+import csv
+import io
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from xml.sax.saxutils import escape
+
+from ..config.field_types import FieldType, ModelConfig, ModuleConfig
+from ..utils.pipeline import StreamedContent
+from .demo_values import DemoColumn, DemoReference, demo_record_id
+
+DEFAULT_RECORDS = 3
+DEFAULT_SEED = 0
+
+DATA_FORMATS = ('xml', 'csv')
+
+RELATION_DISTRIBUTIONS = ('uniform', 'zipf')
+
+# Enregistrements par morceau produit
+CHUNK_RECORDS = 1000
+
+# Enregistrements du module base utilisables comme cibles de relations
+EXTERNAL_REFERENCES = {
+    'res.partner': ('base.res_partner_1', 'base.res_partner_2', 'base.res_partner_3', 'base.res_partner_4'),
+    'res.users': ('base.user_admin', 'base.user_demo'),
+    'res.company': ('base.main_company',),
+    'res.currency': ('base.EUR', 'base.USD'),
+    'res.country': ('base.fr', 'base.be', 'base.us'),
+}
+
+# Échappement des valeurs d'attributs (``escape`` ne traite que &, < et >)
+_QUOTE = {'"': '&quot;'}
+
+def demo_record_count(model: ModelConfig, rows: int = None) -> int:
+    """Nombre d'enregistrements de démo d'un modèle (``rows`` prioritaire)"""
+    return rows if rows is not None else model.demo.get('records', DEFAULT_RECORDS)
+
+
+def demo_data_format(model: ModelConfig, module_config: ModuleConfig = None) -> str:
+    """Format des données de démo d'un modèle (modèle, puis module, puis xml)"""
+    return model.data_format or (module_config.data_format if module_config is not None else None) or 'xml'
+
+
+def demo_file_path(model: ModelConfig, data_format: str = 'xml') -> str:
+    """Chemin du fichier de démo d'un modèle, relatif au module"""
+    if data_format == 'csv':
+        # Odoo déduit le modèle du nom d'un fichier CSV
+        return f"demo/{model.name}.csv"
+    return f"demo/{model.name.replace('.', '_')}_demo.xml"
+
+
+def _relation_comodels(model: ModelConfig) -> Set[str]:
+    """Modèles ciblés par les many2one / many2many d'un modèle"""
+    return {
+        field.extra_attrs['comodel_name'] for field in model.fields
+        if field.field_type in (FieldType.MANY2ONE, FieldType.MANY2MANY) and field.extra_attrs.get('comodel_name')
+    }
+
+
+def demo_load_order(models: List[ModelConfig]) -> List[ModelConfig]:
+    """Modèles dans l'ordre de chargement des données de démo
+
+    Tri topologique stable : chaque modèle après les modèles du module qu'il
+    référence, l'ordre de la configuration départageant les autres. Sur un
+    cycle, le premier modèle restant de la configuration est chargé et ses
+    relations vers des modèles non encore chargés sont omises.
+    """
+    names = {model.name for model in models}
+    dependencies = {model.name: (_relation_comodels(model) & names) - {model.name} for model in models}
+    ordered, loaded = [], set()
+    remaining = list(models)
+    while remaining:
+        ready = next((model for model in remaining if dependencies[model.name] <= loaded), remaining[0])
+        remaining.remove(ready)
+        ordered.append(ready)
+        loaded.add(ready.name)
+    return ordered
+
+
+def validate_demo_config(models: List[ModelConfig], module_config: ModuleConfig = None):
+    """Vérifie les options de démo (``data_format``, ``demo``) ; lève ValueError"""
+    owners = [(model.name, model.data_format) for model in models]
+    if module_config is not None:
+        owners.insert(0, (module_config.name, module_config.data_format))
+    for owner, data_format in owners:
+        if data_format is not None and data_format not in DATA_FORMATS:
+            raise ValueError(f"data_format invalide pour {owner}: {data_format} "
+                             f"(attendu: {', '.join(DATA_FORMATS)})")
+
+    for model in models:
+        # Volume et graine des données de démo
+        for key in ('records', 'seed'):
+            value = model.demo.get(key)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                raise ValueError(f"demo.{key} invalide pour {model.name}: {value} (entier positif ou nul attendu)")
+
+        relations = model.demo.get('relations') or {}
+        if not isinstance(relations, dict):
+            raise ValueError(f"demo.relations invalide pour {model.name}: dictionnaire par champ attendu")
+        fields = {field.name: field for field in model.fields}
+        for field_name, options in relations.items():
+            field = fields.get(field_name)
+            if field is None or field.field_type not in (FieldType.MANY2ONE, FieldType.MANY2MANY):
+                raise ValueError(f"demo.relations.{field_name} invalide pour {model.name}: "
+                                 f"many2one ou many2many attendu")
+            if not isinstance(options, dict):
+                raise ValueError(f"demo.relations.{field_name} invalide pour {model.name}: dictionnaire attendu")
+            distribution = options.get('distribution', 'uniform')
+            if distribution not in RELATION_DISTRIBUTIONS:
+                raise ValueError(f"Distribution invalide pour {model.name}.{field_name}: {distribution} "
+                                 f"(attendu: {', '.join(RELATION_DISTRIBUTIONS)})")
+            skew = options.get('skew', 1.0)
+            if not isinstance(skew, (int, float)) or isinstance(skew, bool) or skew <= 0:
+                raise ValueError(f"skew invalide pour {model.name}.{field_name}: {skew} (nombre positif attendu)")
+            fan_out = options.get('fan_out', (1, 3))
+            if not (isinstance(fan_out, (list, tuple)) and len(fan_out) == 2
+                    and all(isinstance(bound, int) and not isinstance(bound, bool) for bound in fan_out)
+                    and 0 <= fan_out[0] <= fan_out[1]):
+                raise ValueError(f"fan_out invalide pour {model.name}.{field_name}: {fan_out} "
+                                 f"([min, max] attendu, 0 <= min <= max)")
+
+
+def create_demo_content(model: ModelConfig, models: List[ModelConfig] = None, data_format: str = 'xml',
+                        rows: int = None, seed: int = None) -> 'DemoContent':
+    """Contenu en flux du fichier de démo d'un modèle dans le format demandé"""
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f"Format de données inconnu: {data_format} (attendu: {', '.join(DATA_FORMATS)})")
+    content_class = DemoCsvContent if data_format == 'csv' else DemoXmlContent
+    return content_class(model, models, rows=rows, seed=seed)
+
+
+class DemoContent(StreamedContent):
+    """Enregistrements de démo d'un modèle, produits par paquets
+
+    Les enregistrements sont produits par paquets de colonnes, que les
+    sous-classes sérialisent selon le type de chaque colonne
+    (``DemoColumn.kind``) : 'text', 'bool', 'ref' (identifiant XML) ou 'refs'
+    (liste d'identifiants XML).
+
+    Usage:
+        content = DemoXmlContent(model, models, rows=100000, seed=42)
+        for chunk in content:
+            stream.write(chunk)
+    """
+
+    # Références aux enregistrements précédents du même fichier
+    self_references = True
+
+    def __init__(self, model: ModelConfig, models: List[ModelConfig] = None,
+                 rows: int = None, seed: int = None, chunk_records: int = CHUNK_RECORDS):
+        """
+        Args:
+            model: Modèle dont les enregistrements sont produits
+            models: Modèles du module (cibles des relations)
+            rows: Nombre d'enregistrements de chaque modèle (défaut: ``demo.records``)
+            seed: Graine (défaut: ``demo.seed`` du modèle)
+        """
+        self.model = model
+        self.records = demo_record_count(model, rows)
+        self.seed = seed if seed is not None else model.demo.get('seed', DEFAULT_SEED)
+        self.chunk_records = max(1, chunk_records)
+        self.references = self._resolve_references(model, models or [model], rows, self.self_references)
+
+    @staticmethod
+    def _resolve_references(model: ModelConfig, models: List[ModelConfig],
+                            rows: Optional[int], self_references: bool = True) -> Dict[str, DemoReference]:
+        loaded_before = {}
+        for other in demo_load_order(models):
+            if other.name == model.name:
+                break
+            loaded_before[other.name] = demo_record_count(other, rows)
+
+        relations = model.demo.get('relations') or {}
+        references = {}
+        for field in model.fields:
+            comodel = field.extra_attrs.get('comodel_name')
+            if field.field_type not in (FieldType.MANY2ONE, FieldType.MANY2MANY) or not comodel:
+                continue
+            options = relations.get(field.name) or {}
+            sampling = {
+                'distribution': options.get('distribution', 'uniform'),
+                'skew': options.get('skew', 1.0),
+                'fan_out': options.get('fan_out', (1, 3)),
+            }
+            if comodel == model.name:
+                if self_references:
+                    references[field.name] = DemoReference(comodel, **sampling)  # enregistrements précédents
+            elif loaded_before.get(comodel):
+                references[field.name] = DemoReference(comodel, loaded_before[comodel], **sampling)
+            elif comodel in EXTERNAL_REFERENCES:
+                references[field.name] = DemoReference(xmlids=EXTERNAL_REFERENCES[comodel],
+                                                       fan_out=sampling['fan_out'])
+        return references
+
+    def create_columns(self) -> List[DemoColumn]:
+        """Colonnes des champs renseignés (générateurs réinitialisés à chaque appel)"""
+        columns = []
+        for field in self.model.fields:
+            if field.extra_attrs.get('compute') or field.extra_attrs.get('related'):
+                continue
+            if field.field_type == FieldType.SELECTION and not field.extra_attrs.get('selection'):
+                continue
+            if field.field_type in (FieldType.MANY2ONE, FieldType.MANY2MANY) and field.name not in self.references:
+                continue
+            column = DemoColumn(self.model, field, self.seed, self.references.get(field.name))
+            if column.generator is not None:  # one2many, binary
+                columns.append(column)
+        return columns
+
+    def iter_batches(self, columns: List[DemoColumn]) -> Iterator[Tuple[List[str], List[List]]]:
+        """Paquets de (identifiants XML, valeurs de chaque colonne) ; None si omise"""
+        model_name = self.model.name
+        for start in range(1, self.records + 1, self.chunk_records):
+            count = min(self.chunk_records, self.records - start + 1)
+            record_ids = [demo_record_id(model_name, index) for index in range(start, start + count)]
+            yield record_ids, [column.values(start, count) for column in columns]
+
+
+class DemoXmlContent(DemoContent):
+    """Fichier ``demo/<modèle>_demo.xml`` (balises ``<record>``)"""
+
+    def iter_chunks(self) -> Iterator[str]:
+        model = self.model
+        columns = self.create_columns()
+        yield (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<odoo>\n'
+            '    <data noupdate="1">\n'
+            f'        <!-- Données de démonstration pour {model.name} -->\n'
+        )
+        for record_ids, values in self.iter_batches(columns):
+            cells = [self._render_cells(column, column_values) for column, column_values in zip(columns, values)]
+            yield ''.join([
+                f'        <record id="{record_id}" model="{model.name}">\n{"".join(row)}        </record>\n'
+                for record_id, *row in zip(record_ids, *cells)
+            ])
+        yield '    </data>\n</odoo>\n'
+
+    @staticmethod
+    def _render_cells(column: DemoColumn, values: List) -> List[str]:
+        """Balises ``<field>`` d'une colonne ('' pour une valeur omise)"""
+        prefix = f'            <field name="{column.field.name}"'
+        if column.kind == 'text':
+            return [f'{prefix}>{escape(value)}</field>\n' if value is not None else '' for value in values]
+        if column.kind == 'bool':
+            return [f'{prefix} eval="{value}"/>\n' if value is not None else '' for value in values]
+        if column.kind == 'ref':
+            return [f'{prefix} ref="{escape(value, _QUOTE)}"/>\n' if value is not None else '' for value in values]
+        cells = []
+        for targets in values:
+            if targets is None:
+                cells.append('')
+                continue
+            references = ', '.join(f'ref({target!r})' for target in targets)
+            cells.append(f'{prefix} eval="{escape(f"[(6, 0, [{references}])]", _QUOTE)}"/>\n')
+        return cells
+
+
+class DemoCsvContent(DemoContent):
+    """Fichier ``demo/<modèle>.csv`` : colonne ``id``, ``champ/id`` pour les relations
+
+    Odoo charge un CSV par lots : une relation vers un enregistrement du même
+    fichier n'est pas garantie d'être résolue, les auto-références sont omises.
+    """
+
+    self_references = False
+
+    def iter_chunks(self) -> Iterator[str]:
+        columns = self.create_columns()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['id'] + [
+            f"{column.field.name}/id" if column.kind in ('ref', 'refs') else column.field.name
+            for column in columns
+        ])
+        for record_ids, values in self.iter_batches(columns):
+            cells = [self._cells(column, column_values) for column, column_values in zip(columns, values)]
+            writer.writerows(zip(record_ids, *cells))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def _cells(column: DemoColumn, values: List) -> List[str]:
+        if column.kind == 'refs':
+            return [','.join(targets) if targets else '' for targets in values]
+        return ['' if value is None else str(value) for value in values]
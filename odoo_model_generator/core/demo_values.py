@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+Générateurs de valeurs de démo, colonne par colonne
+
+Un générateur produit d'un coup les valeurs d'un champ pour une plage
+d'enregistrements (``start`` à ``start + count - 1``) ; les lignes sont
+ensuite assemblées en zippant les colonnes. Chaque colonne a son propre
+générateur pseudo-aléatoire, initialisé par la graine, le modèle et le champ :
+ajouter un champ ou changer la taille des paquets ne modifie pas les autres
+valeurs.
+
+Les générateurs sont enregistrés par type de champ et, optionnellement, par
+motif sur le nom du champ (prioritaire)::
+
+    @register_value_generator(FieldType.CHAR, r'(^|_)siret$')
+    def siret_column(column, start, count):
+        return [f"{index:014d}" for index in range(start, start + count)]
+"""
+
+import random
+import re
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Pattern, Tuple
+
+from ..config.field_types import FieldConfig, FieldType, ModelConfig
+
+# Dates réparties sur deux ans à partir de cette date
+BASE_DATE = date(2024, 1, 1)
+DATE_SPAN_DAYS = 730
+
+# Écart (secondes) entre deux datetimes successifs ; premier avec la durée de
+# la période : un cycle complet passe par chaque seconde
+_DATETIME_STRIDE = 7919
+
+_WORDS = (
+    'alpha', 'bureau', 'client', 'contrat', 'devis', 'dossier', 'entrepôt', 'facture',
+    'livraison', 'lot', 'marché', 'opération', 'projet', 'produit', 'service', 'stock',
+    'suivi', 'tâche', 'tarif', 'valeur', 'zone',
+)
+
+_CAPITALIZED_WORDS = tuple(word.capitalize() for word in _WORDS)
+
+# Dates de la période, formatées une fois pour toutes
+_DATES = [(BASE_DATE + timedelta(days=day)).isoformat() for day in range(DATE_SPAN_DAYS)]
+
+# Sérialisation des valeurs selon le type de champ ('text' par défaut)
+_KINDS = {
+    FieldType.BOOLEAN: 'bool',
+    FieldType.MANY2ONE: 'ref',
+    FieldType.MANY2MANY: 'refs',
+}
+
+
+def demo_record_id(model_name: str, index: int) -> str:
+    """Identifiant XML du ``index``-ième enregistrement de démo (à partir de 1)"""
+    return f"{model_name.replace('.', '_')}_demo_{index}"
+
+
+ValueGenerator = Callable[['DemoColumn', int, int], List]
+
+# (type, motif sur le nom, générateur), du plus prioritaire au moins prioritaire
+_GENERATORS: List[Tuple[FieldType, Optional[Pattern], ValueGenerator]] = []
+
+
+def register_value_generator(field_type: FieldType, name_pattern: str = None):
+    """Enregistre un générateur de colonne (décorateur)
+
+    Args:
+        field_type: Type de champ concerné
+        name_pattern: Expression régulière cherchée dans le nom du champ ; un
+            générateur avec motif passe avant les générateurs du type, et le
+            dernier enregistré avant les précédents
+    """
+    def decorator(generator: ValueGenerator) -> ValueGenerator:
+        _GENERATORS.insert(0, (field_type, re.compile(name_pattern) if name_pattern else None, generator))
+        return generator
+    return decorator
+
+
+def resolve_value_generator(field: FieldConfig) -> Optional[ValueGenerator]:
+    """Générateur d'un champ, ou None si le type n'a pas de données de démo"""
+    fallback = None
+    for field_type, pattern, generator in _GENERATORS:
+        if field_type != field.field_type:
+            continue
+        if pattern is None:
+            fallback = fallback or generator
+        elif pattern.search(field.name):
+            return generator
+    return fallback
+
+
+class DemoReference:
+    """Cible des valeurs d'une relation
+
+    Soit des enregistrements fixes (``xmlids``, modèles de base) tirés
+    uniformément, soit les ``available`` enregistrements de démo de
+    ``comodel`` (le modèle lui-même : enregistrements déjà créés), tirés selon
+    ``distribution`` :
+
+    - ``uniform`` : tous les enregistrements également
+    - ``zipf`` : rang k tiré avec une probabilité ~ 1/k^skew (inversion de la
+      loi continue) ; quelques enregistrements « chauds » concentrent les
+      références, comme les meilleurs clients
+
+    ``fan_out`` borne le nombre de cibles d'un many2many (min, max).
+    """
+
+    def __init__(self, comodel: str = None, available: int = 0, xmlids: Tuple[str, ...] = (),
+                 distribution: str = 'uniform', skew: float = 1.0, fan_out: Tuple[int, int] = (1, 3)):
+        self.comodel = comodel
+        self.available = available
+        self.xmlids = tuple(xmlids)
+        self.distribution = distribution
+        self.skew = skew
+        self.fan_out = tuple(fan_out)
+
+    def rank_sampler(self, available: int) -> Callable[[float], int]:
+        """Fonction u ∈ [0, 1) → rang (1 à ``available``) selon la distribution"""
+        if self.distribution != 'zipf' or available <= 1:
+            return lambda u: int(u * available) + 1
+        bound = available + 1
+        if self.skew == 1:
+            return lambda u: min(int(bound ** u), available)
+        exponent = 1 - self.skew
+        scale = bound ** exponent - 1
+        inverse = 1 / exponent
+        return lambda u: min(int((1 + u * scale) ** inverse), available)
+
+
+class DemoColumn:
+    """Valeurs de démo d'un champ : générateur, graine et cible des relations
+
+    ``reference`` est la ``DemoReference`` d'une relation ; None pour les
+    autres champs.
+    """
+
+    def __init__(self, model: ModelConfig, field: FieldConfig, seed: int, reference: DemoReference = None):
+        self.model = model
+        self.field = field
+        self.reference = reference
+        self.kind = _KINDS.get(field.field_type, 'text')
+        self.generator = resolve_value_generator(field)
+        self.rng = random.Random(f"{seed}:{model.name}:{field.name}")
+        size = field.extra_attrs.get('size') if field.field_type == FieldType.CHAR else None
+        self._size = size if isinstance(size, int) and size > 0 else None
+
+    def values(self, start: int, count: int) -> List:
+        """Valeurs des enregistrements ``start`` (à partir de 1) à ``start + count - 1``
+
+        None pour un enregistrement où le champ est omis.
+        """
+        values = self.generator(self, start, count)
+        if self._size is not None:
+            size = self._size
+            values = [value[:size] for value in values]
+        return values
+
+    def pick_targets(self, index: int, count: int) -> List[str]:
+        """Identifiants XML distincts ciblés par la relation de l'enregistrement ``index``"""
+        reference = self.reference
+        rng = self.rng
+        if reference.comodel is None:
+            return rng.sample(reference.xmlids, min(count, len(reference.xmlids)))
+        # Relation du modèle vers lui-même : seuls les enregistrements déjà créés
+        available = index - 1 if reference.comodel == self.model.name else reference.available
+        if available <= count:
+            picked = range(1, available + 1)
+        else:
+            rank, random_value = reference.rank_sampler(available), rng.random
+            picked, attempts = set(), 0
+            # Tirages sans remise, bornés : une distribution très concentrée peut répéter les mêmes rangs
+            while len(picked) < count and attempts < count * 20:
+                picked.add(rank(random_value()))
+                attempts += 1
+            picked = sorted(picked)
+        return [demo_record_id(reference.comodel, target) for target in picked]
+
+def _indexes(start: int, count: int) -> range:
+    return range(start, start + count)
+
+
+# Types simples
+
+@register_value_generator(FieldType.INTEGER)
+def integer_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    """Suite arithmétique : 10, 20, 30..."""
+    return [str(index * 10) for index in _indexes(start, count)]
+
+
+@register_value_generator(FieldType.FLOAT)
+def float_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    random_value = column.rng.random
+    return [f"{random_value() * 1000:.2f}" for _ in range(count)]
+
+
+@register_value_generator(FieldType.MONETARY)
+def monetary_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    random_value = column.rng.random
+    return [f"{1 + random_value() * 9999:.2f}" for _ in range(count)]
+
+
+@register_value_generator(FieldType.BOOLEAN)
+def boolean_column(column: DemoColumn, start: int, count: int) -> List[bool]:
+    random_value = column.rng.random
+    return [random_value() < 0.5 for _ in range(count)]
+
+
+@register_value_generator(FieldType.BOOLEAN, r'^active$')
+def active_column(column: DemoColumn, start: int, count: int) -> List[bool]:
+    return [True] * count
+
+
+@register_value_generator(FieldType.SELECTION)
+def selection_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    """Clés de la sélection, en cycle"""
+    keys = [str(item[0]) for item in column.field.extra_attrs.get('selection') or []]
+    if not keys:
+        return [None] * count
+    return [keys[(index - 1) % len(keys)] for index in _indexes(start, count)]
+
+
+@register_value_generator(FieldType.DATE)
+def date_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    """Jours successifs de la période, en cycle"""
+    return [_DATES[(index - 1) % DATE_SPAN_DAYS] for index in _indexes(start, count)]
+
+
+@register_value_generator(FieldType.DATETIME)
+def datetime_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    """Instants espacés de ``_DATETIME_STRIDE`` secondes, en cycle sur la période"""
+    span = DATE_SPAN_DAYS * 86400
+    values = []
+    for index in _indexes(start, count):
+        day, seconds = divmod((index - 1) * _DATETIME_STRIDE % span, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        values.append(f"{_DATES[day]} {hours:02d}:{seconds // 60:02d}:{seconds % 60:02d}")
+    return values
+
+
+# Textes
+
+@register_value_generator(FieldType.CHAR)
+def char_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    words = column.rng.choices(_CAPITALIZED_WORDS, k=count)
+    return [f"{word} {index}" for word, index in zip(words, _indexes(start, count))]
+
+
+@register_value_generator(FieldType.CHAR, r'name')
+def name_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    prefix = f"{column.model.description} Demo"
+    return [f"{prefix} {index}" for index in _indexes(start, count)]
+
+
+@register_value_generator(FieldType.CHAR, r'email')
+def email_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    return [f"demo{index}@example.com" for index in _indexes(start, count)]
+
+
+@register_value_generator(FieldType.CHAR, r'phone|mobile')
+def phone_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    randrange = column.rng.randrange
+    return [f"+33 6 {number // 1000000:02d} {number // 10000 % 100:02d} {number // 100 % 100:02d} {number % 100:02d}"
+            for number in (randrange(100000000) for _ in range(count))]
+
+
+@register_value_generator(FieldType.CHAR, r'^(code|ref|reference)$|_code$')
+def code_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    prefix = column.model.name.split('.')[-1][:3].upper()
+    return [f"{prefix}{index:06d}" for index in _indexes(start, count)]
+
+
+def _sentences(rng: random.Random, count: int) -> List[str]:
+    """Phrases de 6 à 14 mots, tirés en un seul appel pour toute la colonne"""
+    lengths = rng.choices(range(6, 15), k=count)
+    words = rng.choices(_WORDS, k=sum(lengths))
+    sentences, position = [], 0
+    for length in lengths:
+        sentences.append(' '.join(words[position:position + length]).capitalize() + '.')
+        position += length
+    return sentences
+
+
+@register_value_generator(FieldType.TEXT)
+def text_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    return _sentences(column.rng, count)
+
+
+@register_value_generator(FieldType.HTML)
+def html_column(column: DemoColumn, start: int, count: int) -> List[str]:
+    return [f"<p>{sentence}</p>" for sentence in _sentences(column.rng, count)]
+
+
+# Relations
+
+@register_value_generator(FieldType.MANY2ONE)
+def many2one_column(column: DemoColumn, start: int, count: int) -> List[Optional[str]]:
+    reference = column.reference
+    if reference.comodel is None:
+        return column.rng.choices(reference.xmlids, k=count)
+    if reference.comodel != column.model.name:
+        prefix = demo_record_id(reference.comodel, '')  # préfixe commun des identifiants
+        rank, random_value = reference.rank_sampler(reference.available), column.rng.random
+        return [f"{prefix}{rank(random_value())}" for _ in range(count)]
+    values = []
+    for index in _indexes(start, count):
+        targets = column.pick_targets(index, 1)
+        values.append(targets[0] if targets else None)
+    return values
+
+
+@register_value_generator(FieldType.MANY2MANY)
+def many2many_column(column: DemoColumn, start: int, count: int) -> List[Optional[List[str]]]:
+    """Entre ``fan_out[0]`` et ``fan_out[1]`` cibles distinctes par enregistrement"""
+    randint = column.rng.randint
+    low, high = column.reference.fan_out
+    values = []
+    for index in _indexes(start, count):
+        targets = column.pick_targets(index, randint(low, high))
+        values.append(targets or None)
+    return values
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Journal de reprise des générations par lots et des espaces de travail
+
+Journal en ajout seul (une ligne JSON par événement, synchronisée sur disque)
+des modules terminés, avec l'empreinte de leurs entrées et le hash de chacun de
+leurs fichiers. Après une interruption (OOM, runner préempté), ``--resume``
+saute les modules dont les fichiers sur disque correspondent encore au journal.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE_NAME = '.omg-journal.jsonl'
+
+
+def output_options(options: Dict = None) -> Dict:
+    """Options de génération qui changent les fichiers produits (partie des empreintes)
+
+    Les réglages d'exécution (workers, profondeur de file, cache de rendu,
+    budget...) n'y figurent pas : ils ne changent pas le résultat.
+    """
+    options = options or {}
+    asset_store = options.get('asset_store')
+    python_formatter = options.get('python_formatter')
+    return {
+        'format_xml': bool(options.get('format_xml')),
+        'format_python': python_formatter.engine if python_formatter is not None else None,
+        'atomic_publish': bool(options.get('atomic_publish')),
+        'asset_store': [str(asset_store.store_dir), asset_store.link_mode] if asset_store is not None else None,
+    }
+
+
+def unit_fingerprint(module_name: str, config_data: Dict, options: Dict = None) -> str:
+    """Empreinte des entrées d'un module (configuration, nom, options de sortie, version du générateur)"""
+    from .. import __version__
+
+    payload = json.dumps({'version': __version__, 'module_name': module_name, 'config': config_data,
+                          'options': output_options(options)},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_module_files(module_path: str) -> Dict[str, str]:
+    """Hash sha256 de chaque fichier d'un module (chemins relatifs, séparateur '/')"""
+    root = Path(module_path)
+    hashes = {}
+    for directory, dir_names, file_names in os.walk(root):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = Path(directory) / file_name
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            hashes[path.relative_to(root).as_posix()] = digest.hexdigest()
+    return hashes
+
+
+class CheckpointJournal:
+    """Journal des modules terminés d'un lot
+
+    Usage:
+        journal = CheckpointJournal(output / JOURNAL_FILE_NAME, resume=True)
+        if journal.is_complete(name, fingerprint, module_path): ...
+        journal.record(name, fingerprint, hash_module_files(module_path))
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = Path(path)
+        self.resume = resume
+        self._completed: Dict[str, Dict] = {}
+
+        if resume:
+            self._completed = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Sans reprise, un nouveau journal remplace l'ancien
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._append({'event': 'resume' if resume else 'start', 'time': time.time()})
+
+    def _load(self) -> Dict[str, Dict]:
+        completed = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par l'interruption
+                        continue
+                    if entry.get('event') == 'done':
+                        completed[entry['unit']] = entry
+        except FileNotFoundError:
+            pass
+        return completed
+
+    def _append(self, entry: Dict):
+        self._file.write(json.dumps(entry, sort_keys=True) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def completed_entry(self, unit: str) -> Optional[Dict]:
+        """Entrée du journal d'un module terminé lors d'une exécution précédente"""
+        return self._completed.get(unit)
+
+    def is_complete(self, unit: str, fingerprint: str, module_path: str) -> bool:
+        """Vrai si le module est journalisé avec les mêmes entrées et des fichiers intacts"""
+        entry = self._completed.get(unit)
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return False
+
+        root = Path(module_path)
+        for relative_path, expected in entry.get('files', {}).items():
+            path = root / relative_path
+            if not path.is_file():
+                return False
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != expected:
+                    logger.info(f"Fichier modifié depuis le journal: {path}")
+                    return False
+        return True
+
+    def record(self, unit: str, fingerprint: str, files: Dict[str, str]):
+        """Journalise un module terminé (écriture synchronisée sur disque)"""
+        entry = {'event': 'done', 'unit': unit, 'fingerprint': fingerprint,
+                 'files': files, 'time': time.time()}
+        self._append(entry)
+        self._completed[unit] = entry
+
+    def close(self):
+        """Ferme le journal"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'CheckpointJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,11 +4,12 @@ Générateur de modules complets pour Odoo
 """
 
 import os
-import shutil
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple, Union
 from jinja2 import Template
 from ..config.field_types import ModelConfig, ModuleConfig
+from ..utils.pipeline import StreamedContent, write_content
+from .demo_data import create_demo_content, demo_data_format, demo_file_path, demo_load_order
 
 class ModuleBuilder:
     """Construit la structure complète d'un module Odoo"""
@@ -136,15 +137,43 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
         self._create_directory_structure(module_path)
         
         # Génération des fichiers
-        self._generate_manifest(module_path, module_name, models, module_config)
-        self._generate_init_files(module_path, module_name, models)
-        self._generate_security_files(module_path, models)
-        self._generate_demo_data(module_path, models)
-        self._copy_static_files(module_path, module_config)
-        self._generate_readme(module_path, module_name, models, module_config)
+        for relative_path, content in self.render_module_files(module_name, models, module_config):
+            self._write_file(module_path / relative_path, content)
         
         return str(module_path)
 
+    def render_module_files(self,
+                            module_name: str,
+                            models: List[ModelConfig],
+                            module_config: ModuleConfig = None,
+                            include_demo: bool = True) -> Iterator[Tuple[str, Union[str, bytes]]]:
+        """Produit les fichiers communs du module sans les écrire
+        
+        Args:
+            include_demo: Inclut les données de démo (un fichier par modèle,
+                produit par chaque shard lors d'une génération distribuée)
+        
+        Returns:
+            Itérateur de (chemin relatif au module, contenu texte ou binaire)
+        """
+        module_config = module_config or ModuleConfig(name=module_name)
+        
+        yield '__manifest__.py', self._render_manifest(module_name, models, module_config)
+        yield from self._render_init_files(module_name, models)
+        yield 'security/ir.model.access.csv', self._render_security_file(models)
+        if include_demo:
+            yield from self._render_demo_data(models, module_config)
+        yield from self._render_static_files(module_config)
+        yield 'README.md', self._render_readme(module_name, models, module_config)
+
+    def _write_file(self, file_path: Path, content: Union[str, bytes, StreamedContent]) -> int:
+        """Écrit un fichier texte (UTF-8), binaire ou en flux ; retourne sa taille"""
+        from ..utils.asset_store import ensure_private_file
+        
+        # Un lien vers le magasin d'assets ne doit pas être écrit sur place
+        ensure_private_file(file_path)
+        return write_content(file_path, content)
+
     def _create_directory_structure(self, module_path: Path):
         """Crée la structure de dossiers du module"""
         folders = [
@@ -166,37 +195,37 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
         for folder in folders:
             (module_path / folder).mkdir(parents=True, exist_ok=True)
 
-    def _generate_manifest(self, module_path: Path, module_name: str, 
-                          models: List[ModelConfig], config: ModuleConfig):
-        """Génère le fichier __manifest__.py"""
+    def _render_manifest(self, module_name: str, 
+                         models: List[ModelConfig], config: ModuleConfig) -> str:
+        """Génère le contenu du fichier __manifest__.py"""
         
-        # Collecte des fichiers de données
+        # Collecte des fichiers de données (chemins rendus en liste Python)
         data_files = []
         
         # Fichiers de sécurité
-        data_files.append("'security/ir.model.access.csv'")
+        data_files.append('security/ir.model.access.csv')
         
         # Fichiers de vues pour chaque modèle
         for model in models:
             model_underscore = model.name.replace('.', '_')
             if model.auto_create_views:
-                data_files.append(f"'views/{model_underscore}_views.xml'")
+                data_files.append(f'views/{model_underscore}_views.xml')
             if model.auto_create_menu:
-                data_files.append(f"'views/{model_underscore}_menu.xml'")
+                data_files.append(f'views/{model_underscore}_menu.xml')
         
         # Fichier de menu global s'il y a plusieurs modèles
         if len(models) > 1:
-            data_files.append("'views/menu_global.xml'")
+            data_files.append('views/menu_global.xml')
         
-        # Données de démonstration
+        # Données de démonstration (XML ou CSV selon data_format), modèles référencés d'abord
         demo_files = []
-        for model in models:
-            demo_files.append(f"'demo/{model.name.replace('.', '_')}_demo.xml'")
+        for model in demo_load_order(models):
+            demo_files.append(demo_file_path(model, demo_data_format(model, config)))
         
         # Fonctionnalités du module
         features = [f"Gestion des {model.description}" for model in models]
         
-        manifest_content = self.manifest_template.render(
+        return self.manifest_template.render(
             module_name=config.name,
             version=config.version,
             category=config.category,
@@ -216,11 +245,9 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
             features=features,
             models=models
         )
-        
-        with open(module_path / '__manifest__.py', 'w', encoding='utf-8') as f:
-            f.write(manifest_content)
 
-    def _generate_init_files(self, module_path: Path, module_name: str, models: List[ModelConfig]):
+    def _render_init_files(self, module_name: str,
+                           models: List[ModelConfig]) -> Iterator[Tuple[str, str]]:
         """Génère les fichiers __init__.py"""
         
         # __init__.py principal du module
@@ -231,9 +258,7 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
             has_wizards=False,
             has_reports=False
         )
-        
-        with open(module_path / '__init__.py', 'w', encoding='utf-8') as f:
-            f.write(init_content)
+        yield '__init__.py', init_content
         
         # models/__init__.py
         model_files = [model.name.replace('.', '_') for model in models]
@@ -241,19 +266,15 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
             module_name=module_name,
             model_files=model_files
         )
-        
-        with open(module_path / 'models' / '__init__.py', 'w', encoding='utf-8') as f:
-            f.write(models_init_content)
+        yield 'models/__init__.py', models_init_content
         
         # __init__.py vides pour les autres dossiers
         empty_dirs = ['controllers', 'wizards', 'reports']
         for dir_name in empty_dirs:
-            init_file = module_path / dir_name / '__init__.py'
-            with open(init_file, 'w', encoding='utf-8') as f:
-                f.write('# -*- coding: utf-8 -*-\n')
+            yield f'{dir_name}/__init__.py', '# -*- coding: utf-8 -*-\n'
 
-    def _generate_security_files(self, module_path: Path, models: List[ModelConfig]):
-        """Génère les fichiers de sécurité"""
+    def _render_security_file(self, models: List[ModelConfig]) -> str:
+        """Génère le contenu du fichier ir.model.access.csv"""
         
         # ir.model.access.csv
         access_content = ['id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink\n']
@@ -277,97 +298,58 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
                     f'{model_id},{group},{perms}\n'
                 )
         
-        with open(module_path / 'security' / 'ir.model.access.csv', 'w', encoding='utf-8') as f:
-            f.writelines(access_content)
+        return ''.join(access_content)
 
-    def _generate_demo_data(self, module_path: Path, models: List[ModelConfig]):
-        """Génère des données de démonstration"""
+    def _render_demo_data(self, models: List[ModelConfig],
+                          module_config: ModuleConfig = None) -> Iterator[Tuple[str, StreamedContent]]:
+        """Génère des données de démonstration (produites en flux à l'écriture)"""
         
-        for model in models:
-            model_underscore = model.name.replace('.', '_')
-            demo_file = module_path / 'demo' / f'{model_underscore}_demo.xml'
-            
-            demo_content = self._create_demo_records(model)
-            
-            with open(demo_file, 'w', encoding='utf-8') as f:
-                f.write(demo_content)
-
-    def _create_demo_records(self, model: ModelConfig) -> str:
-        """Crée des enregistrements de démonstration pour un modèle"""
-        model_underscore = model.name.replace('.', '_')
-        
-        demo_template = Template('''<?xml version="1.0" encoding="utf-8"?>
-<odoo>
-    <data noupdate="1">
-        <!-- Données de démonstration pour {{ model_name }} -->
-        {% for record in demo_records %}
-        <record id="{{ model_underscore }}_demo_{{ loop.index }}" model="{{ model_name }}">
-            {% for field, value in record.items() %}
-            <field name="{{ field }}">{{ value }}</field>
-            {% endfor %}
-        </record>
-        {% endfor %}
-    </data>
-</odoo>''')
-        
-        # Génération d'enregistrements de démonstration
-        demo_records = []
-        for i in range(3):  # 3 enregistrements de démo
-            record = {}
-            
-            for field in model.fields:
-                if field.name == 'active':
-                    record[field.name] = True
-                elif field.field_type.value == 'char':
-                    if 'name' in field.name.lower():
-                        record[field.name] = f"{model.description} Demo {i+1}"
-                    elif 'email' in field.name.lower():
-                        record[field.name] = f"demo{i+1}@example.com"
-                    else:
-                        record[field.name] = f"Valeur démo {i+1}"
-                elif field.field_type.value == 'text':
-                    record[field.name] = f"Description de démonstration pour l'enregistrement {i+1}"
-                elif field.field_type.value == 'integer':
-                    record[field.name] = (i + 1) * 10
-                elif field.field_type.value == 'float':
-                    record[field.name] = (i + 1) * 10.5
-                elif field.field_type.value == 'boolean':
-                    record[field.name] = i % 2 == 0
-                elif field.field_type.value == 'selection' and field.extra_attrs.get('selection'):
-                    selection = field.extra_attrs['selection']
-                    if selection:
-                        record[field.name] = selection[i % len(selection)][0]
-        
-            if record:  # Seulement si des champs ont été remplis
-                demo_records.append(record)
-        
-        return demo_template.render(
-            model_name=model.name,
-            model_underscore=model_underscore,
-            demo_records=demo_records
-        )
+        for model in demo_load_order(models):
+            yield self._render_demo_file(model, models, module_config)
 
-    def _copy_static_files(self, module_path: Path, config: ModuleConfig):
-        """Copie les fichiers statiques du module"""
+    def _render_demo_file(self, model: ModelConfig, models: List[ModelConfig] = None,
+                          module_config: ModuleConfig = None, rows: int = None, seed: int = None,
+                          data_format: str = None) -> Tuple[str, StreamedContent]:
+        """Fichier de démo d'un modèle : (chemin relatif au module, contenu en flux)
+        
+        Args:
+            models: Modèles du module dans l'ordre de chargement (cibles des relations)
+            rows: Nombre d'enregistrements imposé pour chaque modèle
+            seed: Graine imposée
+            data_format: Format imposé ('xml' ou 'csv', défaut: ``data_format``
+                du modèle puis du module)
+        """
+        data_format = data_format or demo_data_format(model, module_config)
+        return demo_file_path(model, data_format), self._create_demo_records(
+            model, models, rows=rows, seed=seed, data_format=data_format)
+
+    def _create_demo_records(self, model: ModelConfig, models: List[ModelConfig] = None,
+                             rows: int = None, seed: int = None, data_format: str = 'xml') -> StreamedContent:
+        """Crée les enregistrements de démonstration d'un modèle (``demo.records``, ``demo.seed``)"""
+        return create_demo_content(model, models, data_format, rows=rows, seed=seed)
+
+    def _render_static_files(self, config: ModuleConfig) -> Iterator[Tuple[str, Union[str, bytes]]]:
+        """Produit les fichiers statiques du module"""
         
         # Icône du module
         icon_path = getattr(config, 'icon_path', None)
         if icon_path and os.path.exists(icon_path):
-            shutil.copy2(icon_path, module_path / 'static' / 'description' / 'icon.png')
+            with open(icon_path, 'rb') as f:
+                yield 'static/description/icon.png', f.read()
         else:
             # Créer une icône par défaut
-            self._create_default_icon(module_path / 'static' / 'description' / 'icon.png')
+            yield 'static/description/icon.svg', self._create_default_icon()
         
         # Description HTML du module
-        self._create_module_description_html(module_path, config)
+        yield 'static/description/index.html', self._create_module_description_html(config)
         
         # Fichier CSS personnalisé
-        self._create_default_css(module_path / 'static' / 'src' / 'css' / 'module.css')
+        yield 'static/src/css/module.css', self._create_default_css()
         
         # Fichier JS personnalisé
-        self._create_default_js(module_path / 'static' / 'src' / 'js' / 'module.js')
+        yield 'static/src/js/module.js', self._create_default_js()
 
-    def _create_default_icon(self, icon_path: Path):
+    def _create_default_icon(self) -> str:
         """Crée une icône par défaut pour le module"""
         # SVG simple comme icône par défaut
         svg_content = '''<svg width="128" height="128" viewBox="0 0 128 128" xmlns="http://www.w3.org/2000/svg">
@@ -375,11 +357,9 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
   <text x="64" y="74" font-family="Arial" font-size="48" fill="white" text-anchor="middle">M</text>
 </svg>'''
         
-        icon_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(icon_path.with_suffix('.svg'), 'w') as f:
-            f.write(svg_content)
+        return svg_content
 
-    def _create_module_description_html(self, module_path: Path, config: ModuleConfig):
+    def _create_module_description_html(self, config: ModuleConfig) -> str:
         """Crée le fichier de description HTML du module"""
         html_content = f"""
 <!DOCTYPE html>
@@ -442,11 +422,9 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
 </html>
         """
         
-        description_file = module_path / 'static' / 'description' / 'index.html'
-        with open(description_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        return html_content
 
-    def _create_default_css(self, css_path: Path):
+    def _create_default_css(self) -> str:
         """Crée un fichier CSS par défaut"""
         css_content = '''/* Styles personnalisés pour le module */
 
@@ -463,11 +441,9 @@ Pour des modifications, utilisez l'outil de génération ou modifiez le code man
 }
 '''
         
-        css_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(css_path, 'w', encoding='utf-8') as f:
-            f.write(css_content)
+        return css_content
 
-    def _create_default_js(self, js_path: Path):
+    def _create_default_js(self) -> str:
         """Crée un fichier JS par défaut"""
         js_content = '''odoo.define('module.custom', function (require) {
 "use strict";
@@ -484,13 +460,11 @@ return {
 });
 '''
         
-        js_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(js_path, 'w', encoding='utf-8') as f:
-            f.write(js_content)
+        return js_content
 
-    def _generate_readme(self, module_path: Path, module_name: str, 
-                        models: List[ModelConfig], config: ModuleConfig):
-        """Génère le fichier README.md du module"""
+    def _render_readme(self, module_name: str, 
+                       models: List[ModelConfig], config: ModuleConfig) -> str:
+        """Génère le contenu du fichier README.md du module"""
         
         features = [
             f"Gestion complète des {model.description.lower()}s" for model in models
@@ -502,20 +476,23 @@ return {
             "Données de démonstration incluses"
         ])
         
-        readme_content = self.readme_template.render(
+        return self.readme_template.render(
             module_name=config.name,
             description=config.description,
             features=features,
             models=models,
             license=config.license
         )
-        
-        with open(module_path / 'README.md', 'w', encoding='utf-8') as f:
-            f.write(readme_content)
 
-    def create_module_package(self, module_path: str, output_file: str = None) -> str:
-        """Crée un package tar.gz du module"""
-        import tarfile
+    def create_module_package(self, module_path: str, output_file: str = None,
+                              reproducible: bool = False, workers: int = None) -> str:
+        """Crée un package tar.gz du module
+        
+        La compression gzip est répartie par blocs sur ``workers`` threads
+        (défaut: nombre de CPU). Avec ``reproducible``, un module inchangé
+        donne une archive identique octet pour octet (cf. ``utils.archives``).
+        """
+        from ..utils.archives import write_tar
         
         module_path = Path(module_path)
         if not output_file:
@@ -523,10 +500,8 @@ return {
         
         output_path = module_path.parent / output_file
         
-        with tarfile.open(output_path, 'w:gz') as tar:
-            tar.add(module_path, arcname=module_path.name)
-        
-        return str(output_path)
+        return write_tar(module_path, output_path, arcname=module_path.name,
+                         reproducible=reproducible, workers=workers)
 
     def validate_module_structure(self, module_path: str) -> Dict[str, bool]:
         """Valide la structure d'un module généré"""
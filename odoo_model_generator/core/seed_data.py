@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Données de démo en volume au format COPY de PostgreSQL (``omg seed``)
+
+Pour les environnements de performance de plusieurs millions de lignes, les
+enregistrements de ``demo_data`` (mêmes valeurs, même graine) sont écrits
+directement dans les tables, sans passer par l'ORM :
+
+- ``seed/<table>.sql`` : ``COPY <table> (...) FROM stdin;`` suivi des lignes
+  au format texte de PostgreSQL, une table par modèle (``table_name`` ou nom
+  dérivé du modèle)
+- ``seed/<relation>.sql`` : tables de relation des many2many
+  (``relation``/``column1``/``column2`` du champ, ou noms dérivés comme Odoo)
+- ``seed/load.sql`` : chargement de tous les fichiers dans une transaction,
+  dans l'ordre des dépendances, puis remise à niveau des séquences ``id``
+
+Les enregistrements du ``index``-ième de démo ont l'id ``index`` : les tables
+du module doivent être vides (module installé sans données de démo). Les
+relations vers les modèles de base (partenaires, devises...) sont omises, leurs
+ids dépendant de la base. ``validate_seed_selection`` refuse les exports dont
+le chargement violerait une contrainte : many2one requis sans valeur possible
+(modèle de base, enregistrement précédent du même modèle) ou, avec
+``--model``, relation vers un modèle du module non sélectionné (table vide).
+
+Usage:
+    omg seed -c config.yaml -o ./addons --rows 5000000
+    psql -d perf_db -f ./addons/my_module/seed/load.sql
+"""
+
+import json
+from typing import Iterator, List, Optional, Tuple
+
+from ..config.field_types import FieldConfig, FieldType, ModelConfig
+from .demo_data import DemoContent, demo_load_order
+from .demo_values import DemoColumn, demo_record_id
+
+SEED_FORMATS = ('pgcopy',)
+
+SEED_DIR = 'seed'
+LOADER_FILE = f'{SEED_DIR}/load.sql'
+
+# Échappements du format texte de COPY
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_NULL = '\\N'
+
+
+def table_name(model: ModelConfig) -> str:
+    """Table PostgreSQL d'un modèle (``_table`` du modèle généré)"""
+    return model.table_name or model.name.replace('.', '_')
+
+
+def relation_table(model: ModelConfig, field: FieldConfig,
+                   models: List[ModelConfig] = None) -> Optional[Tuple[str, str, str]]:
+    """Table de relation d'un many2many : (table, colonne du modèle, colonne du comodèle)
+
+    Noms par défaut d'Odoo : ``<table1>_<table2>_rel`` (tables triées),
+    ``<table>_id`` ; None pour un many2many d'un modèle vers lui-même sans
+    ``relation`` explicite (refusé par Odoo).
+    """
+    comodel_name = field.extra_attrs.get('comodel_name')
+    comodel = next((other for other in models or [] if other.name == comodel_name), None)
+    model_table = table_name(model)
+    comodel_table = table_name(comodel) if comodel is not None else comodel_name.replace('.', '_')
+    relation = field.extra_attrs.get('relation')
+    if not relation:
+        if model_table == comodel_table:
+            return None
+        relation = '{}_{}_rel'.format(*sorted([model_table, comodel_table]))
+    return (relation,
+            field.extra_attrs.get('column1') or f"{model_table}_id",
+            field.extra_attrs.get('column2') or f"{comodel_table}_id")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class PgCopyContent(DemoContent):
+    """Fichier ``seed/<table>.sql`` : table d'un modèle au format COPY"""
+
+    def create_columns(self) -> List[DemoColumn]:
+        # Relations vers les enregistrements du module seulement ; many2many dans leurs tables de relation
+        return [
+            column for column in super().create_columns()
+            if column.kind == 'text' or column.kind == 'bool'
+            or (column.kind == 'ref' and column.reference.comodel is not None)
+        ]
+
+    def iter_chunks(self) -> Iterator[str]:
+        columns = self.create_columns()
+        names = ', '.join(_quote(name) for name in ['id'] + [column.field.name for column in columns])
+        yield f"COPY {_quote(table_name(self.model))} ({names}) FROM stdin;\n"
+        record_id = 1
+        for record_ids, values in self.iter_batches(columns):
+            cells = [self._cells(column, column_values) for column, column_values in zip(columns, values)]
+            ids = range(record_id, record_id + len(record_ids))
+            record_id += len(record_ids)
+            yield ''.join(['\t'.join(row) + '\n' for row in zip(map(str, ids), *cells)])
+        yield '\\.\n'
+
+    @staticmethod
+    def _cells(column: DemoColumn, values: List) -> List[str]:
+        if column.kind == 'bool':
+            return [_NULL if value is None else ('t' if value else 'f') for value in values]
+        if column.kind == 'ref':
+            offset = len(demo_record_id(column.reference.comodel, ''))
+            return [_NULL if value is None else value[offset:] for value in values]
+        if column.field.extra_attrs.get('translate'):
+            # Champs traduisibles : jsonb par langue
+            return [_NULL if value is None else json.dumps({'en_US': value}).translate(_COPY_ESCAPES)
+                    for value in values]
+        return [_NULL if value is None else value.translate(_COPY_ESCAPES) for value in values]
+
+
+class PgCopyRelationContent(DemoContent):
+    """Fichier ``seed/<relation>.sql`` : paires (id, id cible) d'un many2many
+
+    Les cibles sont celles de la colonne du champ dans ``DemoXmlContent`` (même
+    graine par colonne).
+    """
+
+    def __init__(self, model: ModelConfig, field: FieldConfig, models: List[ModelConfig] = None, **kwargs):
+        super().__init__(model, models, **kwargs)
+        self.field = field
+        self.relation = relation_table(model, field, models)
+
+    def create_columns(self) -> List[DemoColumn]:
+        return [column for column in super().create_columns() if column.field.name == self.field.name]
+
+    def iter_chunks(self) -> Iterator[str]:
+        relation, column1, column2 = self.relation
+        yield f"COPY {_quote(relation)} ({_quote(column1)}, {_quote(column2)}) FROM stdin;\n"
+        columns = self.create_columns()
+        record_id = 1
+        for record_ids, values in self.iter_batches(columns):
+            offset = len(demo_record_id(columns[0].reference.comodel, ''))
+            lines = []
+            for targets in values[0]:
+                lines.extend(f"{record_id}\t{target[offset:]}\n" for target in targets or ())
+                record_id += 1
+            yield ''.join(lines)
+        yield '\\.\n'
+
+
+def validate_seed_selection(models: List[ModelConfig], model_names: List[str] = None,
+                            rows: int = None) -> None:
+    """Vérifie que les fichiers COPY des modèles sélectionnés se chargeront
+
+    Raises:
+        ValueError: Liste des champs dont les valeurs violeraient NOT NULL ou
+            une clé étrangère
+    """
+    errors = []
+    for model in models:
+        if model_names and model.name not in model_names:
+            continue
+        references = PgCopyContent(model, models, rows=rows).references
+        for field in model.fields:
+            if field.field_type not in (FieldType.MANY2ONE, FieldType.MANY2MANY) \
+                    or field.extra_attrs.get('compute') or field.extra_attrs.get('related'):
+                continue
+            comodel_name = field.extra_attrs.get('comodel_name')
+            reference = references.get(field.name)
+            target = reference.comodel if reference is not None else None
+            if field.field_type == FieldType.MANY2ONE and field.required and target in (None, model.name):
+                reason = "aucune cible pour le premier enregistrement" if target else "valeurs omises"
+                errors.append(f"{model.name}.{field.name}: many2one requis vers {comodel_name} ({reason})")
+            elif model_names and target not in (None, model.name) and target not in model_names:
+                errors.append(f"{model.name}.{field.name}: {target} non sélectionné (ajoutez --model {target})")
+    if errors:
+        raise ValueError("Chargement impossible :\n" + '\n'.join(f"  - {error}" for error in errors))
+
+
+def render_seed_files(models: List[ModelConfig], rows: int = None, seed: int = None,
+                      model_names: List[str] = None) -> Iterator[Tuple[str, DemoContent]]:
+    """Fichiers COPY des modèles puis de leurs tables de relation (contenus en flux)
+
+    Args:
+        models: Modèles du module (cibles des relations)
+        model_names: Modèles à produire (défaut: tous ; cf. ``validate_seed_selection``)
+    """
+    selected = [model for model in demo_load_order(models) if not model_names or model.name in model_names]
+    relations = []
+    for model in selected:
+        content = PgCopyContent(model, models, rows=rows, seed=seed)
+        yield f"{SEED_DIR}/{table_name(model)}.sql", content
+        for field in model.fields:
+            reference = content.references.get(field.name)
+            if field.field_type == FieldType.MANY2MANY and reference is not None and reference.comodel is not None:
+                relations.append((model, field))
+
+    written = set()
+    for model, field in relations:
+        relation_content = PgCopyRelationContent(model, field, models, rows=rows, seed=seed)
+        # Un many2many et son inverse partagent leur table
+        if relation_content.relation is None or relation_content.relation[0] in written:
+            continue
+        written.add(relation_content.relation[0])
+        yield f"{SEED_DIR}/{relation_content.relation[0]}.sql", relation_content
+
+
+def _file_table(content: DemoContent) -> str:
+    if isinstance(content, PgCopyRelationContent):
+        return content.relation[0]
+    return table_name(content.model)
+
+
+def render_seed_loader(files: List[Tuple[str, DemoContent]]) -> str:
+    """Script psql ``seed/load.sql`` : chargement transactionnel et séquences"""
+    lines = [
+        '-- Chargement des données de démo en volume (généré par omg seed)',
+        '-- Usage: psql -d <base> -f seed/load.sql (tables du module vides)',
+        '\\set ON_ERROR_STOP on',
+        'BEGIN;',
+    ]
+    # \ir : chemin relatif au script, quel que soit le répertoire courant de psql
+    lines.extend(f"\\ir {path[len(SEED_DIR) + 1:]}" for path, _ in files)
+    lines.append('-- Séquences des ids après le dernier enregistrement chargé')
+    for _, content in files:
+        if isinstance(content, PgCopyContent):
+            table = _quote(table_name(content.model))
+            lines.append(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                         f"COALESCE(MAX(id), 0) + 1, false) FROM {table};")
+    lines.append('COMMIT;')
+    lines.extend(f"ANALYZE {_quote(_file_table(content))};" for _, content in files)
+    return '\n'.join(lines) + '\n'
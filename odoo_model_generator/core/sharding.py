@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Génération distribuée d'un module volumineux : un shard de modèles par processus ou machine
+
+Chaque shard rend les fichiers propres à ses modèles (modèle, vues, menus,
+démo) et écrit un manifeste de shard. L'étape de fusion vérifie que tous les
+shards proviennent de la même configuration puis rend les fichiers communs
+(``__manifest__.py``, ``models/__init__.py``, ``ir.model.access.csv``,
+``menu_global.xml``...). Le résultat est identique à une génération directe.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARD_MANIFEST_PATTERN = '.omg-shard-*.json'
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """Analyse une spécification ``i/n`` (shards numérotés à partir de 1)"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard invalide: {spec} (format attendu: i/n, ex: 2/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard invalide: {spec} (1 <= i <= n)")
+    return index, count
+
+
+def shard_of(model_name: str, shard_count: int) -> int:
+    """Shard (à partir de 1) d'un modèle : hash stable, indépendant de l'ordre et du processus"""
+    digest = hashlib.sha256(model_name.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count + 1
+
+
+def config_fingerprint(config_data: Dict, module_name: str) -> str:
+    """Empreinte de la configuration partagée par tous les shards d'un module"""
+    payload = json.dumps({'module_name': module_name, 'config': config_data}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _manifest_name(shard_index: int, shard_count: int) -> str:
+    return f'.omg-shard-{shard_index}-of-{shard_count}.json'
+
+
+class ShardedModuleGenerator:
+    """Découpe la génération d'un module en shards puis fusionne les shards"""
+
+    def __init__(self, generator=None):
+        if generator is None:
+            from .generator import OdooModelGenerator
+            generator = OdooModelGenerator()
+        self.generator = generator
+
+    def generate_shard(self,
+                       config_data: Dict,
+                       output_path: str,
+                       module_name: str,
+                       shard_index: int,
+                       shard_count: int,
+                       options: Dict = None) -> str:
+        """
+        Rend les fichiers des modèles d'un shard
+
+        Args:
+            config_data: Configuration complète du module (identique pour tous les shards)
+            output_path: Dossier de sortie
+            module_name: Nom du module
+            shard_index: Numéro du shard (1..shard_count)
+            shard_count: Nombre total de shards
+
+        Returns:
+            Chemin du manifeste de shard
+        """
+        options = options or {}
+        generator = self.generator
+        models, module_config = generator._prepare_configuration(config_data, module_name)
+        shard_models = [m for m in models if shard_of(m.name, shard_count) == shard_index]
+
+        module_path = Path(output_path) / module_name
+        generator.module_builder._create_directory_structure(module_path)
+
+        files = []
+        for model in shard_models:
+            model_files = generator._render_model_files(model, options)
+            model_files.append(generator.module_builder._render_demo_file(model, models, module_config))
+            for relative_path, content in model_files:
+                generator.module_builder._write_file(module_path / relative_path, content)
+                files.append(relative_path)
+
+        manifest = {
+            'module_name': module_name,
+            'shard_index': shard_index,
+            'shard_count': shard_count,
+            'config_fingerprint': config_fingerprint(config_data, module_name),
+            'models': [m.name for m in shard_models],
+            'files': files,
+        }
+        manifest_path = module_path / _manifest_name(shard_index, shard_count)
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+        logger.info(f"Shard {shard_index}/{shard_count} de '{module_name}': "
+                    f"{len(shard_models)}/{len(models)} modèle(s)")
+        return str(manifest_path)
+
+    def merge_shards(self,
+                     config_data: Dict,
+                     output_path: str,
+                     module_name: str,
+                     shard_dirs: List[str] = None) -> str:
+        """
+        Rassemble les shards d'un module et rend ses fichiers communs
+
+        Args:
+            config_data: Configuration complète du module
+            output_path: Dossier de sortie du module fusionné
+            module_name: Nom du module
+            shard_dirs: Dossiers de sortie des shards (artefacts CI) à recopier ;
+                par défaut les shards sont déjà dans ``output_path``
+
+        Returns:
+            Chemin vers le module fusionné
+        """
+        generator = self.generator
+        models, module_config = generator._prepare_configuration(config_data, module_name)
+        module_path = Path(output_path) / module_name
+        generator.module_builder._create_directory_structure(module_path)
+
+        for shard_dir in shard_dirs or []:
+            source = Path(shard_dir) / module_name
+            if not source.is_dir():
+                raise FileNotFoundError(f"Shard introuvable: {source}")
+            if source.resolve() != module_path.resolve():
+                shutil.copytree(source, module_path, dirs_exist_ok=True)
+
+        manifests = self._check_manifests(module_path, config_data, module_name, [m.name for m in models])
+
+        for relative_path, content in generator.module_builder.render_module_files(
+                module_name, models, module_config, include_demo=False):
+            generator.module_builder._write_file(module_path / relative_path, content)
+
+        if len(models) > 1:
+            generator._generate_global_menu(models, str(module_path), config_data.get('global_menu', {}))
+
+        # Les manifestes de shard ne font pas partie du module publié
+        for manifest_path in manifests:
+            manifest_path.unlink()
+
+        logger.info(f"Module '{module_name}' fusionné depuis {len(manifests)} shard(s)")
+        return str(module_path)
+
+    @staticmethod
+    def _check_manifests(module_path: Path, config_data: Dict, module_name: str,
+                         model_names: List[str]) -> List[Path]:
+        """Vérifie que les shards sont complets et issus de la même configuration"""
+        manifest_paths = sorted(module_path.glob(SHARD_MANIFEST_PATTERN))
+        if not manifest_paths:
+            raise ValueError(f"Aucun manifeste de shard dans {module_path}")
+
+        manifests = [json.loads(path.read_text(encoding='utf-8')) for path in manifest_paths]
+        counts = {m['shard_count'] for m in manifests}
+        if len(counts) != 1:
+            raise ValueError(f"Shards de découpages différents: {sorted(counts)}")
+        shard_count = counts.pop()
+
+        missing = sorted(set(range(1, shard_count + 1)) - {m['shard_index'] for m in manifests})
+        if missing:
+            raise ValueError(f"Shard(s) manquant(s): {', '.join(f'{i}/{shard_count}' for i in missing)}")
+
+        fingerprint = config_fingerprint(config_data, module_name)
+        stale = [m['shard_index'] for m in manifests if m['config_fingerprint'] != fingerprint]
+        if stale:
+            raise ValueError(f"Shard(s) générés depuis une autre configuration: {stale}")
+
+        covered = [name for m in manifests for name in m['models']]
+        if sorted(covered) != sorted(model_names):
+            raise ValueError("Les shards ne couvrent pas exactement les modèles de la configuration")
+
+        return manifest_paths
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Mode surveillance : régénère les fichiers concernés à chaque modification de la configuration
+
+La configuration et ses fragments (``include``) sont surveillés via inotify
+(Linux) ou, à défaut, par scrutation. Après chaque sauvegarde (regroupées par
+un délai de stabilisation), seuls les documents modifiés sont relus, seuls les
+modèles dont la configuration a changé sont rendus, et seuls les fichiers dont
+le contenu a changé sont réécrits.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import logging
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .generator import OdooModelGenerator
+from ..utils.pipeline import StreamedContent
+from ..utils.render_cache import canonicalize
+
+logger = logging.getLogger(__name__)
+
+
+def _content_hash(content) -> str:
+    if isinstance(content, StreamedContent):
+        digest = hashlib.sha256()
+        for chunk in content.iter_chunks():
+            digest.update(chunk.encode('utf-8'))
+        return digest.hexdigest()
+    data = content if isinstance(content, bytes) else content.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fingerprint(*values) -> str:
+    payload = json.dumps(canonicalize(list(values)), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class WatchUpdate:
+    """Bilan d'une régénération"""
+
+    def __init__(self):
+        self.documents_parsed = 0
+        self.models_rendered = 0
+        self.models_total = 0
+        self.files_written: List[str] = []
+        self.files_removed: List[str] = []
+        self.duration = 0.0
+
+    def __repr__(self):
+        return (f"WatchUpdate(documents={self.documents_parsed}, models={self.models_rendered}/"
+                f"{self.models_total}, written={len(self.files_written)}, removed={len(self.files_removed)})")
+
+
+class IncrementalModuleGenerator:
+    """Régénère un module en ne refaisant que ce qui a changé depuis la dernière fois
+
+    État conservé entre deux régénérations :
+    - chaque document (configuration, fragments) parsé, avec sa date/taille
+    - l'empreinte de chaque modèle et la liste de ses fichiers
+    - le hash de chaque fichier écrit
+    """
+
+    def __init__(self, config_path: str, output_path: str, module_name: str,
+                 options: Dict = None, generator: OdooModelGenerator = None):
+        self.config_path = Path(config_path)
+        self.output_path = output_path
+        self.module_name = module_name
+        self.module_path = Path(output_path) / module_name
+        self.options = options or {}
+        self.generator = generator or OdooModelGenerator()
+        self._documents: Dict[Path, Tuple[Tuple[int, int], Dict]] = {}
+        self._include_paths: List[Path] = []
+        self._model_fingerprints: Dict[str, str] = {}
+        self._model_files: Dict[str, List[str]] = {}
+        self._module_fingerprint = None
+        self._module_files: List[str] = []
+        self._file_hashes: Dict[str, str] = {}
+
+    def watched_paths(self) -> List[Path]:
+        """Documents à surveiller : configuration et fragments inclus"""
+        return [self.config_path] + self._include_paths
+
+    def _load_document(self, path: Path, update: WatchUpdate) -> Dict:
+        """Retourne un document, relu seulement si le fichier a changé"""
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._documents.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        data = self.generator._read_config_document(path)
+        self._documents[path] = (stamp, data)
+        update.documents_parsed += 1
+        return data
+
+    def _load_config(self, update: WatchUpdate) -> Dict:
+        main_document = self._load_document(self.config_path, update)
+        self._include_paths = self.generator._resolve_include_paths(self.config_path, main_document)
+        # Documents retirés de la liste d'inclusion : oubliés
+        known = set(self.watched_paths())
+        for path in list(self._documents):
+            if path not in known:
+                del self._documents[path]
+        if not self._include_paths:
+            return main_document
+        fragments = [self._load_document(path, update) for path in self._include_paths]
+        return self.generator._merge_fragments(main_document, fragments)
+
+    def regenerate(self) -> WatchUpdate:
+        """Régénère les fichiers dont les entrées ont changé"""
+        started = time.perf_counter()
+        update = WatchUpdate()
+        generator = self.generator
+
+        config_data = self._load_config(update)
+        models, module_config = generator._prepare_configuration(config_data, self.module_name)
+        update.models_total = len(models)
+
+        if not self.module_path.is_dir():
+            # Premier passage ou dossier supprimé : tout est à réécrire
+            self._file_hashes.clear()
+            self._model_fingerprints.clear()
+            self._module_fingerprint = None
+        generator.module_builder._create_directory_structure(self.module_path)
+
+        menu_config = self.options.get('menu_config', {})
+        rendered: List[Tuple[str, object]] = []
+        model_fingerprints, model_files = {}, {}
+        for model in models:
+            demo_path, demo = generator.module_builder._render_demo_file(model, models, module_config)
+            # Les données de démo dépendent aussi du volume des modèles référencés et du format
+            fingerprint = _fingerprint(model, menu_config, demo.references, demo_path)
+            model_fingerprints[model.name] = fingerprint
+            if self._model_fingerprints.get(model.name) == fingerprint:
+                model_files[model.name] = self._model_files[model.name]
+                continue
+            files = generator._render_model_files(model, self.options)
+            files.append((demo_path, demo))
+            model_files[model.name] = [path for path, _ in files]
+            rendered.extend(files)
+            update.models_rendered += 1
+
+        # Fichiers communs : dépendent de la liste ordonnée des modèles
+        module_fingerprint = _fingerprint(config_data.get('module'), config_data.get('global_menu'),
+                                          [model_fingerprints[m.name] for m in models])
+        module_files = self._module_files
+        if module_fingerprint != self._module_fingerprint:
+            common = list(generator.module_builder.render_module_files(
+                self.module_name, models, module_config, include_demo=False))
+            if len(models) > 1:
+                common.append(('views/menu_global.xml', generator.menu_builder.create_menu_structure(
+                    models, config_data.get('global_menu', {}))))
+            module_files = [path for path, _ in common]
+            rendered.extend(common)
+
+        for relative_path, content in rendered:
+            digest = _content_hash(content)
+            if self._file_hashes.get(relative_path) == digest and (self.module_path / relative_path).exists():
+                continue
+            generator.module_builder._write_file(self.module_path / relative_path, content)
+            self._file_hashes[relative_path] = digest
+            update.files_written.append(relative_path)
+
+        # Fichiers qui ne sont plus produits (modèle supprimé ou renommé, menu global)
+        produced = set(module_files).union(*model_files.values()) if model_files else set(module_files)
+        for relative_path in sorted(set(self._file_hashes) - produced):
+            try:
+                (self.module_path / relative_path).unlink()
+            except FileNotFoundError:
+                pass
+            del self._file_hashes[relative_path]
+            update.files_removed.append(relative_path)
+
+        self._model_fingerprints = model_fingerprints
+        self._model_files = model_files
+        self._module_fingerprint = module_fingerprint
+        self._module_files = module_files
+        update.duration = time.perf_counter() - started
+        return update
+
+
+class PollingBackend:
+    """Détection des modifications par scrutation de la date et de la taille des fichiers"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._stamps: Dict[Path, Optional[Tuple[int, int]]] = {}
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def set_paths(self, paths: List[Path]):
+        """Définit les fichiers surveillés"""
+        self._stamps = {path: self._stamps.get(path, self._stamp(path)) for path in paths}
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Attend une modification (True) ou l'expiration du délai (False)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = False
+            for path, stamp in self._stamps.items():
+                current = self._stamp(path)
+                if current != stamp:
+                    self._stamps[path] = current
+                    changed = True
+            if changed:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifyBackend:
+    """Détection des modifications via inotify (Linux), sans dépendance externe
+
+    Les dossiers parents sont surveillés : les éditeurs sauvegardent souvent
+    en écrivant un fichier temporaire renommé ensuite.
+    """
+
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc introuvable")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError("inotify non disponible")
+        self._fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        self._watches: Dict[int, Path] = {}
+        self._directories: Dict[Path, int] = {}
+        self._names: Set[Tuple[Path, str]] = set()
+
+    def set_paths(self, paths: List[Path]):
+        """Définit les fichiers surveillés"""
+        mask = self._IN_CLOSE_WRITE | self._IN_MOVED_TO | self._IN_CREATE | self._IN_DELETE
+        self._names = set()
+        for path in paths:
+            path = Path(os.path.abspath(path))
+            directory = path.parent
+            self._names.add((directory, path.name))
+            if directory not in self._directories:
+                wd = self._libc.inotify_add_watch(self._fd, str(directory).encode(), mask)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch a échoué: {directory}")
+                self._directories[directory] = wd
+                self._watches[wd] = directory
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Attend une modification (True) ou l'expiration du délai (False)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        changed = False
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = self._EVENT_HEADER.unpack_from(data, offset)
+            offset += self._EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            if (self._watches.get(wd), name) in self._names:
+                changed = True
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_backend(polling: bool = False, poll_interval: float = 0.1):
+    """inotify si disponible (et non désactivé), sinon scrutation"""
+    if not polling:
+        try:
+            return InotifyBackend()
+        except (OSError, AttributeError):
+            logger.debug("inotify indisponible, scrutation des fichiers")
+    return PollingBackend(poll_interval)
+
+
+class ConfigWatcher:
+    """Boucle de surveillance : attend, regroupe les sauvegardes, régénère"""
+
+    def __init__(self, incremental: IncrementalModuleGenerator, debounce: float = 0.15,
+                 backend=None):
+        self.incremental = incremental
+        self.debounce = debounce
+        self.backend = backend or create_backend()
+        self._stopped = False
+
+    def stop(self):
+        """Demande l'arrêt de la boucle"""
+        self._stopped = True
+
+    def run(self, on_update: Callable[[WatchUpdate], None] = None,
+            on_error: Callable[[Exception], None] = None):
+        """Génère le module puis le régénère à chaque modification jusqu'à ``stop()``"""
+        try:
+            self._regenerate(on_update, on_error)
+            while not self._stopped:
+                self.backend.set_paths(self.incremental.watched_paths())
+                if not self.backend.wait_for_change(timeout=0.5):
+                    continue
+                # Stabilisation : une sauvegarde produit souvent plusieurs événements
+                while self.backend.wait_for_change(timeout=self.debounce):
+                    pass
+                self._regenerate(on_update, on_error)
+        finally:
+            self.backend.close()
+
+    def _regenerate(self, on_update, on_error):
+        try:
+            update = self.incremental.regenerate()
+        except Exception as e:
+            # Configuration en cours d'édition invalide : on attend la prochaine sauvegarde
+            if on_error:
+                on_error(e)
+            else:
+                logger.error(f"Régénération impossible: {e}")
+            return
+        if on_update:
+            on_update(update)
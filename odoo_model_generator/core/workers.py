@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Générateurs persistants des workers de rendu (processus ou threads)
+"""
+
+from .generator import OdooModelGenerator
+
+# Un générateur par processus worker, conservé d'une tâche à l'autre
+_worker_generator = None
+
+
+def get_worker_generator() -> OdooModelGenerator:
+    """Retourne le générateur du worker courant (créé au premier appel)"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = OdooModelGenerator()
+    return _worker_generator
+
+
+def warm_up_worker():
+    """Initialiseur de pool : compile tous les templates dès le démarrage du worker"""
+    generator = get_worker_generator()
+    for builder_name in ('model_builder', 'view_builder', 'menu_builder', 'module_builder'):
+        getattr(generator, builder_name)
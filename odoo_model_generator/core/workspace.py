@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+Espace de travail : génération de modules interdépendants ordonnancée sur leur graphe de dépendances
+
+Fichier d'espace de travail (YAML ou JSON), chemins relatifs au fichier :
+
+    modules:
+      - configs/sales_base.yaml
+      - config: configs/sales_extension.yaml
+        name: sales_extension      # nom technique (optionnel)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from .batch import BatchGenerator, BatchJob, BatchReport, BatchResult, _generate_job_in_worker
+from .journal import CheckpointJournal, output_options
+from .workers import get_worker_generator
+
+logger = logging.getLogger(__name__)
+
+# État de la dernière génération, écrit dans le dossier de sortie
+STATE_FILE_NAME = '.omg-workspace.json'
+
+RELATIONAL_TYPES = ('many2one', 'one2many', 'many2many')
+
+
+class WorkspaceModule:
+    """Un module de l'espace de travail et ce qu'il expose aux autres"""
+
+    def __init__(self, name: str, config_path: str, config_data: Dict = None, error: str = None):
+        self.name = name
+        self.config_path = config_path
+        self.config_data = config_data
+        # Erreur de chargement ou de validation inter-modules
+        self.error = error
+        self.depends: List[str] = []
+
+    @property
+    def declared_depends(self) -> List[str]:
+        """Dépendances du manifeste (internes et externes à l'espace de travail)"""
+        module_data = (self.config_data or {}).get('module') or {}
+        return list(module_data.get('depends', ['base', 'mail']))
+
+    @property
+    def models(self) -> Set[str]:
+        """Modèles définis par le module"""
+        return {m['name'] for m in (self.config_data or {}).get('models') or []
+                if isinstance(m, dict) and m.get('name')}
+
+    def referenced_models(self) -> Dict[str, str]:
+        """Modèles référencés (comodel_name, inherit) avec l'origine de la référence"""
+        references = {}
+        for model in (self.config_data or {}).get('models') or []:
+            if not isinstance(model, dict):
+                continue
+            for inherit in model.get('inherit') or []:
+                references.setdefault(inherit, f"{model.get('name')} (_inherit)")
+            for field in model.get('fields') or []:
+                if isinstance(field, dict) and field.get('type') in RELATIONAL_TYPES and field.get('comodel_name'):
+                    references.setdefault(field['comodel_name'], f"{model.get('name')}.{field.get('name')}")
+        return references
+
+    def __repr__(self):
+        return f"WorkspaceModule(name='{self.name}', depends={self.depends})"
+
+
+class Workspace:
+    """Graphe de dépendances des modules d'un espace de travail"""
+
+    def __init__(self, modules: List[WorkspaceModule]):
+        self.modules: Dict[str, WorkspaceModule] = {}
+        for module in modules:
+            if module.name in self.modules:
+                raise ValueError(f"Module dupliqué dans l'espace de travail: {module.name}")
+            self.modules[module.name] = module
+
+        for module in self.modules.values():
+            module.depends = [dep for dep in module.declared_depends if dep in self.modules]
+
+        self.order = self._topological_order()
+        self._validate_references()
+
+    @classmethod
+    def load(cls, workspace_file: str) -> 'Workspace':
+        """Charge un fichier d'espace de travail et les configurations de ses modules"""
+        from ..utils.formatters import CodeFormatter
+
+        loader = get_worker_generator()
+        workspace_path = Path(workspace_file)
+        workspace_data = loader._load_config_file(str(workspace_path))
+
+        entries = workspace_data.get('modules') if isinstance(workspace_data, dict) else None
+        if not entries:
+            raise ValueError(f"Aucun module déclaré dans l'espace de travail: {workspace_file}")
+
+        modules = []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {'config': entry}
+            config_path = workspace_path.parent / entry['config']
+
+            config_data, error = None, None
+            try:
+                config_data = loader._load_config_file(str(config_path))
+            except Exception as e:
+                error = f"{type(e).__name__}: {' '.join(str(e).split())}"
+
+            name = entry.get('name') or ((config_data or {}).get('module') or {}).get('name') or config_path.stem
+            modules.append(WorkspaceModule(
+                name=CodeFormatter.format_module_name(name),
+                config_path=str(config_path),
+                config_data=config_data,
+                error=error
+            ))
+        return cls(modules)
+
+    def _topological_order(self) -> List[str]:
+        """Ordre topologique (Kahn), stable selon l'ordre de déclaration"""
+        remaining = {name: set(module.depends) for name, module in self.modules.items()}
+        order = []
+        ready = [name for name, deps in remaining.items() if not deps]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other, deps in remaining.items():
+                if name in deps:
+                    deps.discard(name)
+                    if not deps:
+                        ready.append(other)
+
+        if len(order) != len(self.modules):
+            cycle = sorted(name for name in self.modules if name not in order)
+            raise ValueError(f"Dépendances circulaires entre les modules: {cycle}")
+        return order
+
+    def dependency_closure(self, name: str) -> Set[str]:
+        """Dépendances transitives d'un module dans l'espace de travail"""
+        closure, stack = set(), list(self.modules[name].depends)
+        while stack:
+            dep = stack.pop()
+            if dep not in closure:
+                closure.add(dep)
+                stack.extend(self.modules[dep].depends)
+        return closure
+
+    def _validate_references(self):
+        """Vérifie que les modèles d'autres modules ne sont référencés qu'à travers depends"""
+        owners = {}
+        for name in self.order:
+            for model in self.modules[name].models:
+                owners.setdefault(model, name)
+
+        for name in self.order:
+            module = self.modules[name]
+            if module.error:
+                continue
+            closure = self.dependency_closure(name)
+            errors = []
+            for model, origin in sorted(module.referenced_models().items()):
+                owner = owners.get(model)
+                if owner and owner != name and owner not in closure:
+                    errors.append(f"{origin} référence '{model}' du module '{owner}' absent de depends")
+            if errors:
+                module.error = 'Référence inter-modules invalide: ' + '; '.join(errors)
+
+    def fingerprint(self, name: str, options: Dict = None) -> str:
+        """Empreinte des entrées d'un module
+
+        Inclut sa configuration, les options qui changent les fichiers produits
+        (``output_options``) et les modèles exposés par ses dépendances (ce qui
+        sert à sa validation), mais pas le reste de leur configuration : un
+        module amont modifié sans changement de modèles ne déclenche pas la
+        régénération des modules aval.
+        """
+        from .. import __version__
+
+        upstream = {dep: sorted(self.modules[dep].models) for dep in sorted(self.dependency_closure(name))}
+        payload = json.dumps({
+            'version': __version__,
+            'name': name,
+            'config': self.modules[name].config_data,
+            'upstream': upstream,
+            'options': output_options(options),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def critical_path_costs(self) -> Dict[str, int]:
+        """Coût du plus long chemin partant de chaque module (priorité d'ordonnancement)"""
+        dependents = {name: [] for name in self.modules}
+        for name, module in self.modules.items():
+            for dep in module.depends:
+                dependents[dep].append(name)
+
+        costs = {}
+        for name in reversed(self.order):
+            own_cost = BatchGenerator.estimate_cost(self.modules[name].config_data)
+            costs[name] = own_cost + max((costs[d] for d in dependents[name]), default=0)
+        return costs
+
+
+class WorkspaceGenerator(BatchGenerator):
+    """Génère un espace de travail en respectant le graphe de dépendances
+
+    Un module est soumis dès que toutes ses dépendances internes sont
+    générées ; les modules indépendants s'exécutent en parallèle, par
+    priorité de chemin critique. Un module en échec bloque ses seuls modules
+    aval. Les modules dont l'empreinte n'a pas changé depuis la dernière
+    génération (état dans ``STATE_FILE_NAME``) sont ignorés.
+    """
+
+    @staticmethod
+    def _load_state(output_path: Path) -> Dict[str, str]:
+        state_file = output_path / STATE_FILE_NAME
+        try:
+            return json.loads(state_file.read_text(encoding='utf-8')).get('modules', {})
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_state(output_path: Path, fingerprints: Dict[str, str]):
+        state_file = output_path / STATE_FILE_NAME
+        tmp_file = state_file.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps({'modules': fingerprints}, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_file, state_file)
+
+    def run_workspace(self, workspace: Workspace, output_path: str, options: Dict = None,
+                      force: bool = False,
+                      on_result: Optional[Callable[[BatchResult], None]] = None,
+                      journal: CheckpointJournal = None) -> BatchReport:
+        """
+        Génère les modules d'un espace de travail
+
+        Args:
+            workspace: Espace de travail chargé
+            output_path: Dossier de sortie commun
+            options: Options de génération (sérialisables)
+            force: Régénère même les modules à jour
+            on_result: Rappel appelé à chaque module terminé
+            journal: Journal de reprise (modules terminés consignés au fil de
+                l'eau ; en reprise, ceux dont les fichiers sont intacts sont sautés)
+
+        Returns:
+            Rapport de génération
+        """
+        options = options or {}
+        started = time.perf_counter()
+        output = Path(output_path)
+        output.mkdir(parents=True, exist_ok=True)
+
+        previous_state = self._load_state(output)
+        fingerprints = {name: workspace.fingerprint(name, options) for name in workspace.order}
+        priorities = workspace.critical_path_costs()
+
+        waiting = {name: set(module.depends) for name, module in workspace.modules.items()}
+        failed_upstream = {name: [] for name in workspace.modules}
+        new_state = {}
+        results = []
+        ready = [name for name in workspace.order if not waiting[name]]
+
+        def finish(result: BatchResult):
+            name = result.job.module_name
+            results.append(result)
+            if result.success:
+                new_state[name] = fingerprints[name]
+                if journal is not None and result.files is not None:
+                    journal.record(name, fingerprints[name], result.files)
+            if on_result:
+                on_result(result)
+            for other, deps in waiting.items():
+                if name in deps:
+                    deps.discard(name)
+                    if not result.success:
+                        failed_upstream[other].append(name)
+                    if not deps:
+                        ready.append(other)
+
+        with self._create_executor() as executor:
+            running = {}
+            while ready or running:
+                ready.sort(key=lambda n: -priorities[n])
+                while ready:
+                    name = ready.pop(0)
+                    module = workspace.modules[name]
+                    job = BatchJob(name, module.config_path, module.config_data,
+                                   BatchGenerator.estimate_cost(module.config_data))
+                    if failed_upstream[name]:
+                        finish(BatchResult(job, False, 0.0,
+                                           error=f"Dépendance(s) en échec: {', '.join(failed_upstream[name])}"))
+                    elif module.error:
+                        finish(BatchResult(job, False, 0.0, error=module.error))
+                    elif (not force and previous_state.get(name) == fingerprints[name]
+                          and (output / name).is_dir()):
+                        finish(BatchResult(job, True, 0.0, module_path=str(output / name), skipped=True))
+                    elif journal is not None and journal.is_complete(name, fingerprints[name], str(output / name)):
+                        # Terminé avant l'interruption de l'exécution précédente
+                        finish(BatchResult(job, True, 0.0, module_path=str(output / name), skipped=True))
+                    else:
+                        future = executor.submit(_generate_job_in_worker, job, str(output), options,
+                                                 journal is not None)
+                        running[future] = job
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = BatchResult(job, False, 0.0, error=f"Worker interrompu: {e}")
+                    finish(result)
+
+        # Les modules en échec seront régénérés au prochain lancement
+        self._save_state(output, new_state)
+
+        for result in results:
+            if not result.success:
+                logger.warning(f"Échec du module {result.job.module_name}: {result.error}")
+
+        return BatchReport(results, time.perf_counter() - started)
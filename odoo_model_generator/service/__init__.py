@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Services longue durée pour Odoo Model Generator (démon local, service HTTP)
+"""
+
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'GenerationDaemon': '.daemon',
+    'DaemonClient': '.daemon',
+    'ParsedConfigCache': '.daemon',
+    'GenerationService': '.http_server',
+    'ServiceLimits': '.http_server',
+    'serve_http': '.http_server',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    'GenerationDaemon',
+    'DaemonClient',
+    'ParsedConfigCache',
+    'GenerationService',
+    'ServiceLimits',
+    'serve_http'
+]
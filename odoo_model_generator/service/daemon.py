@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Démon de génération : garde un OdooModelGenerator « chaud » derrière un socket Unix
+
+Le démon évite à chaque appel de `omg generate` / `omg validate` le coût de
+démarrage de Python, des imports, de la compilation des templates Jinja et du
+parsing des configurations. La CLI lui transmet les commandes de façon
+transparente lorsqu'il tourne et les exécute localement sinon.
+
+Protocole : une requête JSON par connexion (une ligne), une réponse JSON.
+La requête porte les variables d'environnement du client qui changent le
+résultat (``FORWARDED_ENV_VARS``) : le démon les applique le temps de la
+commande. Les logs de la commande sont renvoyés au client, pas au terminal du
+démon.
+"""
+
+import copy
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, Optional
+
+from .. import __version__
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV_VAR = 'OMG_DAEMON_SOCKET'
+DISABLE_ENV_VAR = 'OMG_NO_DAEMON'
+
+# Commandes CLI pouvant être exécutées par le démon
+FORWARDED_COMMANDS = ('generate', 'validate')
+
+# Environnement du client appliqué à chaque commande (cache de rendu)
+FORWARDED_ENV_VARS = ('OMG_CACHE_DIR', 'OMG_NO_CACHE', 'XDG_CACHE_HOME')
+
+
+def get_socket_path() -> str:
+    """Retourne le chemin du socket du démon"""
+    if os.environ.get(SOCKET_ENV_VAR):
+        return os.environ[SOCKET_ENV_VAR]
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f'omg-daemon-{os.getuid()}.sock')
+
+
+class ParsedConfigCache:
+    """Cache LRU des configurations chargées, invalidé sur mtime/taille du fichier"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _stamp(path: Path):
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: Path) -> Optional[Dict]:
+        """Retourne une copie de la configuration si le fichier n'a pas changé"""
+        key = str(Path(path).resolve())
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self._stamp(Path(key)):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Copie : la configuration retournée peut être modifiée par l'appelant
+        return copy.deepcopy(entry[1])
+
+    def put(self, path: Path, config_data: Dict):
+        """Enregistre une configuration fraîchement chargée"""
+        key = str(Path(path).resolve())
+        self._entries[key] = (self._stamp(Path(key)), copy.deepcopy(config_data))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Lit une requête JSON et renvoie la réponse du démon"""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode('utf-8'))
+            response = self.server.daemon.execute(request)
+        except Exception as e:
+            response = {'exit_code': 1, 'stdout': '', 'stderr': f"Requête invalide: {e}\n"}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    """Serveur séquentiel : les commandes modifient le cwd et sys.stdout du processus"""
+
+    def __init__(self, socket_path: str, daemon: 'GenerationDaemon'):
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class GenerationDaemon:
+    """Démon exécutant les commandes CLI avec un générateur chaud"""
+
+    def __init__(self, socket_path: str = None, max_cached_configs: int = 256):
+        self.socket_path = socket_path or get_socket_path()
+        self.config_cache = ParsedConfigCache(max_cached_configs)
+        self.generator = None
+        self.python_formatter = None
+        self.requests_served = 0
+        self._server = None
+
+    def warm_up(self):
+        """Instancie le générateur et compile tous les templates"""
+        from ..core.generator import OdooModelGenerator
+
+        self.generator = OdooModelGenerator()
+        self.generator.config_cache = self.config_cache
+        for builder_name in ('model_builder', 'view_builder', 'menu_builder', 'module_builder'):
+            getattr(self.generator, builder_name)
+        # Pool de black démarré à la première requête --format-python, gardé ensuite
+        from ..utils.python_formatter import PythonFormatter
+        self.python_formatter = PythonFormatter()
+
+    def execute(self, request: Dict) -> Dict:
+        """Exécute une requête et capture sa sortie"""
+        command_name = request.get('command')
+
+        if request.get('version') != __version__:
+            return {'error': 'version', 'version': __version__}
+        if command_name == 'ping':
+            return {'exit_code': 0, 'pid': os.getpid(), 'version': __version__,
+                    'requests_served': self.requests_served,
+                    'cached_configs': len(self.config_cache)}
+        if command_name == 'shutdown':
+            self.shutdown()
+            return {'exit_code': 0, 'stdout': '', 'stderr': ''}
+        if command_name not in FORWARDED_COMMANDS:
+            return {'exit_code': 2, 'stdout': '', 'stderr': f"Commande non supportée: {command_name}\n"}
+
+        return self._run_cli_command(command_name, request.get('params', {}), request.get('cwd'),
+                                     request.get('env') or {})
+
+    @staticmethod
+    @contextmanager
+    def _client_environment(env: Dict[str, str]):
+        """Applique les variables transmises par le client (absentes chez lui : retirées)"""
+        previous = {name: os.environ.get(name) for name in FORWARDED_ENV_VARS}
+        try:
+            for name in FORWARDED_ENV_VARS:
+                if env.get(name) is not None:
+                    os.environ[name] = env[name]
+                else:
+                    os.environ.pop(name, None)
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is not None:
+                    os.environ[name] = value
+                else:
+                    os.environ.pop(name, None)
+
+    def _run_cli_command(self, command_name: str, params: Dict, cwd: str = None, env: Dict = None) -> Dict:
+        """Exécute une commande click en capturant stdout, stderr et les logs"""
+        import click
+        from .. import cli as cli_module
+
+        command = cli_module.cli.commands[command_name]
+        stdout, stderr = io.StringIO(), io.StringIO()
+        log_handler = logging.StreamHandler(stderr)
+        log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        root_logger = logging.getLogger()
+
+        # Les logs de la commande vont au seul client (pas aussi au terminal du démon)
+        previous_handlers = root_logger.handlers[:]
+        previous_cwd = os.getcwd()
+        previous_generator = cli_module._warm_generator
+        previous_formatter = cli_module._warm_python_formatter
+        exit_code = 0
+        root_logger.handlers = [log_handler]
+        try:
+            if cwd:
+                os.chdir(cwd)
+            cli_module._warm_generator = self.generator
+            cli_module._warm_python_formatter = self.python_formatter
+            with self._client_environment(env or {}), redirect_stdout(stdout), redirect_stderr(stderr):
+                with click.Context(command, info_name=command_name) as ctx:
+                    ctx.invoke(command, **params)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            stderr.write(f"Erreur du démon: {e}\n")
+            exit_code = 1
+        finally:
+            root_logger.handlers = previous_handlers
+            cli_module._warm_generator = previous_generator
+            cli_module._warm_python_formatter = previous_formatter
+            os.chdir(previous_cwd)
+            self.requests_served += 1
+
+        return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+    def serve_forever(self):
+        """Écoute sur le socket jusqu'à l'arrêt du démon"""
+        if self.generator is None:
+            self.warm_up()
+
+        socket_path = Path(self.socket_path)
+        if socket_path.exists():
+            if DaemonClient(str(socket_path)).ping() is not None:
+                raise RuntimeError(f"Un démon écoute déjà sur {socket_path}")
+            socket_path.unlink()  # socket orphelin d'un démon précédent
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        old_umask = os.umask(0o177)  # socket accessible au seul utilisateur
+        try:
+            self._server = _UnixServer(str(socket_path), self)
+        finally:
+            os.umask(old_umask)
+
+        logger.info(f"Démon omg en écoute sur {socket_path} (pid {os.getpid()})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.python_formatter is not None:
+                self.python_formatter.close()
+            if socket_path.exists():
+                socket_path.unlink()
+
+    def shutdown(self):
+        """Demande l'arrêt du démon (après la réponse en cours)"""
+        if self._server is not None:
+            import threading
+            # shutdown() bloque jusqu'à la fin de serve_forever : autre thread
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+
+class DaemonClient:
+    """Client du démon de génération"""
+
+    def __init__(self, socket_path: str = None, connect_timeout: float = 0.5):
+        self.socket_path = socket_path or get_socket_path()
+        self.connect_timeout = connect_timeout
+
+    def request(self, command: str, params: Dict = None) -> Optional[Dict]:
+        """Envoie une requête ; retourne None si le démon est indisponible"""
+        if not hasattr(socket, 'AF_UNIX') or not os.path.exists(self.socket_path):
+            return None
+
+        payload = {
+            'command': command,
+            'params': params or {},
+            'cwd': os.getcwd(),
+            'env': {name: os.environ[name] for name in FORWARDED_ENV_VARS if name in os.environ},
+            'version': __version__,
+        }
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.connect_timeout)
+                sock.connect(self.socket_path)
+                sock.settimeout(None)  # une génération peut être longue
+                sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+                with sock.makefile('rb') as stream:
+                    line = stream.readline()
+        except OSError:
+            return None
+
+        if not line:
+            return None
+        response = json.loads(line.decode('utf-8'))
+        if response.get('error') == 'version':
+            return None  # démon d'une autre version : exécution locale
+        return response
+
+    def ping(self) -> Optional[Dict]:
+        """Retourne l'état du démon ou None s'il ne tourne pas"""
+        return self.request('ping')
+
+    def shutdown(self) -> bool:
+        """Arrête le démon"""
+        return self.request('shutdown') is not None
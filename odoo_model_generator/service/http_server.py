@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+Service HTTP de génération : reçoit une configuration et renvoie le module zippé
+
+Endpoints :
+- ``POST /generate[?module_name=...]`` : corps JSON ou YAML, réponse
+  ``application/zip`` construite et envoyée au fil du rendu (chunked)
+- ``GET /metrics`` : métriques au format texte Prometheus
+- ``GET /healthz`` : état du service
+
+Seule la bibliothèque standard est utilisée (``http.server``).
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import zipfile
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from ..core.budget import GenerationBudgetExceeded
+from ..utils.pipeline import StreamedContent
+
+logger = logging.getLogger(__name__)
+
+# Bornes (secondes) de l'histogramme de latence
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class ServiceLimits:
+    """Limites appliquées à chaque requête"""
+
+    def __init__(self,
+                 max_body_bytes: int = 10 * 1024 * 1024,
+                 max_models: int = 500,
+                 max_fields: int = 20000,
+                 queue_timeout: float = 30.0,
+                 socket_timeout: float = 60.0,
+                 max_output_bytes: int = 200 * 1024 * 1024,
+                 max_generation_time: float = 60.0):
+        self.max_body_bytes = max_body_bytes
+        self.max_models = max_models
+        self.max_fields = max_fields
+        self.queue_timeout = queue_timeout
+        self.socket_timeout = socket_timeout
+        # Bornes de la génération elle-même (vérifiées à chaque modèle)
+        self.max_output_bytes = max_output_bytes
+        self.max_generation_time = max_generation_time
+
+    def create_budget(self):
+        """Budget de génération d'une requête"""
+        from ..core.budget import GenerationBudget
+
+        return GenerationBudget(max_models=self.max_models, max_fields=self.max_fields,
+                                max_output_bytes=self.max_output_bytes,
+                                timeout=self.max_generation_time)
+
+
+class ServiceMetrics:
+    """Compteurs du service exposés au format texte Prometheus"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, int], int] = {}
+        self._bucket_counts = [0] * len(buckets)
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._bytes_out = 0
+        self._busy_workers = 0
+
+    def observe_request(self, path: str, status: int, duration: float, bytes_out: int):
+        """Enregistre une requête terminée"""
+        with self._lock:
+            key = (path, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._bytes_out += bytes_out
+            if path == '/generate':
+                self._latency_sum += duration
+                self._latency_count += 1
+                for i, bound in enumerate(self.buckets):
+                    if duration <= bound:
+                        self._bucket_counts[i] += 1
+
+    def worker_acquired(self):
+        with self._lock:
+            self._busy_workers += 1
+
+    def worker_released(self):
+        with self._lock:
+            self._busy_workers -= 1
+
+    def render(self) -> str:
+        """Formate les métriques (exposition texte Prometheus 0.0.4)"""
+        with self._lock:
+            lines = [
+                '# HELP omg_http_requests_total Requêtes HTTP traitées.',
+                '# TYPE omg_http_requests_total counter',
+            ]
+            for (path, status), count in sorted(self._requests.items()):
+                lines.append(f'omg_http_requests_total{{path="{path}",status="{status}"}} {count}')
+
+            lines += [
+                '# HELP omg_generation_duration_seconds Durée des requêtes de génération.',
+                '# TYPE omg_generation_duration_seconds histogram',
+            ]
+            for bound, count in zip(self.buckets, self._bucket_counts):
+                lines.append(f'omg_generation_duration_seconds_bucket{{le="{bound}"}} {count}')
+            lines.append(f'omg_generation_duration_seconds_bucket{{le="+Inf"}} {self._latency_count}')
+            lines.append(f'omg_generation_duration_seconds_sum {self._latency_sum:.6f}')
+            lines.append(f'omg_generation_duration_seconds_count {self._latency_count}')
+
+            lines += [
+                '# HELP omg_http_response_bytes_total Octets envoyés dans les réponses.',
+                '# TYPE omg_http_response_bytes_total counter',
+                f'omg_http_response_bytes_total {self._bytes_out}',
+                '# HELP omg_workers_busy Générateurs en cours d\'utilisation.',
+                '# TYPE omg_workers_busy gauge',
+                f'omg_workers_busy {self._busy_workers}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+class RequestRejected(Exception):
+    """Requête refusée avant génération (statut HTTP associé)"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _write_entry(archive: zipfile.ZipFile, name: str, content):
+    """Ajoute un fichier à l'archive ; un contenu en flux y est compressé morceau par morceau"""
+    if not isinstance(content, StreamedContent):
+        archive.writestr(name, content)
+        return
+    # Taille inconnue à l'avance : ZIP64 au cas où l'entrée dépasse 2 Go
+    with archive.open(name, 'w', force_zip64=True) as entry:
+        for chunk in content.iter_chunks():
+            entry.write(chunk.encode('utf-8'))
+
+
+class _ChunkedWriter:
+    """Flux en écriture encodant les données en Transfer-Encoding: chunked"""
+
+    def __init__(self, wfile, chunk_size: int = 64 * 1024):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self.bytes_written = 0
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            self.wfile.write(b'%x\r\n' % len(self._buffer) + bytes(self._buffer) + b'\r\n')
+            self.bytes_written += len(self._buffer)
+            self._buffer.clear()
+        self.wfile.flush()
+
+    def close(self):
+        """Envoie le dernier chunk (fin de réponse)"""
+        self.flush()
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+
+class GenerationService:
+    """Pool borné de générateurs chauds partagé par les requêtes HTTP"""
+
+    def __init__(self, workers: int = 4, limits: ServiceLimits = None):
+        from ..core.generator import OdooModelGenerator
+
+        self.limits = limits or ServiceLimits()
+        self.metrics = ServiceMetrics()
+        self._generators = queue.Queue(maxsize=workers)
+        for _ in range(workers):
+            generator = OdooModelGenerator()
+            # Compilation des templates au démarrage plutôt qu'à la première requête
+            for builder_name in ('model_builder', 'view_builder', 'menu_builder', 'module_builder'):
+                getattr(generator, builder_name)
+            self._generators.put(generator)
+
+    def parse_request(self, body: bytes, content_type: str, query: Dict) -> Tuple[Dict, str]:
+        """Parse et contrôle une requête de génération
+
+        Returns:
+            (configuration, nom du module)
+        """
+        try:
+            if 'yaml' in content_type:
+                import yaml
+                config_data = yaml.safe_load(body.decode('utf-8'))
+            else:
+                config_data = json.loads(body.decode('utf-8'))
+        except Exception as e:
+            raise RequestRejected(HTTPStatus.BAD_REQUEST, f"Configuration illisible: {e}")
+
+        if not isinstance(config_data, dict):
+            raise RequestRejected(HTTPStatus.BAD_REQUEST, "La configuration doit être un objet")
+
+        models = config_data.get('models') or []
+        if len(models) > self.limits.max_models:
+            raise RequestRejected(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Trop de modèles: {len(models)} (max {self.limits.max_models})")
+        field_count = sum(len(model.get('fields') or []) for model in models if isinstance(model, dict))
+        if field_count > self.limits.max_fields:
+            raise RequestRejected(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Trop de champs: {field_count} (max {self.limits.max_fields})")
+
+        from ..utils.formatters import CodeFormatter
+        module_name = (query.get('module_name') or [None])[0] \
+            or config_data.get('module', {}).get('name') or 'custom_module'
+        module_name = CodeFormatter.format_module_name(module_name)
+        if not module_name:
+            raise RequestRejected(HTTPStatus.BAD_REQUEST, "Nom de module invalide")
+
+        return config_data, module_name
+
+    def acquire_generator(self):
+        """Réserve un générateur du pool (503 si aucun ne se libère à temps)"""
+        try:
+            generator = self._generators.get(timeout=self.limits.queue_timeout)
+        except queue.Empty:
+            raise RequestRejected(HTTPStatus.SERVICE_UNAVAILABLE, "Tous les workers sont occupés")
+        self.metrics.worker_acquired()
+        return generator
+
+    def release_generator(self, generator):
+        self.metrics.worker_released()
+        self._generators.put(generator)
+
+
+class _GenerationRequestHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP du service de génération"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'omg-http'
+
+    @property
+    def service(self) -> GenerationService:
+        return self.server.service
+
+    def setup(self):
+        self.timeout = self.server.service.limits.socket_timeout
+        super().setup()
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        started = time.perf_counter()
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            body = self.service.metrics.render().encode('utf-8')
+            status = self._send_body(HTTPStatus.OK, body, 'text/plain; version=0.0.4; charset=utf-8')
+        elif path == '/healthz':
+            status = self._send_body(HTTPStatus.OK, b'ok\n', 'text/plain; charset=utf-8')
+        else:
+            body = b'Not found\n'
+            status = self._send_body(HTTPStatus.NOT_FOUND, body, 'text/plain; charset=utf-8')
+        self.service.metrics.observe_request(path, status, time.perf_counter() - started, self._bytes_out)
+
+    def do_POST(self):
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        self._bytes_out = 0
+
+        if url.path != '/generate':
+            status = self._send_error(RequestRejected(HTTPStatus.NOT_FOUND, "Endpoint inconnu"))
+        else:
+            status = self._handle_generate(parse_qs(url.query))
+
+        self.service.metrics.observe_request(url.path, status, time.perf_counter() - started, self._bytes_out)
+
+    def _handle_generate(self, query: Dict) -> int:
+        """Génère le module demandé et le renvoie zippé au fil du rendu"""
+        generator = None
+        try:
+            body = self._read_body()
+            config_data, module_name = self.service.parse_request(
+                body, self.headers.get('Content-Type', ''), query)
+            generator = self.service.acquire_generator()
+
+            budget = self.service.limits.create_budget()
+            files = generator.iter_module_files(config_data, module_name, {'budget': budget})
+            try:
+                # Le premier fichier déclenche parse + validation : les erreurs de
+                # configuration sont renvoyées avant l'envoi des en-têtes
+                first_file = next(files)
+            except StopIteration:
+                first_file = None
+            except GenerationBudgetExceeded as e:
+                raise RequestRejected(self._budget_status(e), str(e))
+            except Exception as e:
+                raise RequestRejected(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Disposition', f'attachment; filename="{module_name}.zip"')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            writer = _ChunkedWriter(self.wfile)
+            try:
+                with zipfile.ZipFile(writer, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    if first_file is not None:
+                        _write_entry(archive, f'{module_name}/{first_file[0]}', first_file[1])
+                    for relative_path, content in files:
+                        _write_entry(archive, f'{module_name}/{relative_path}', content)
+                writer.close()
+            except GenerationBudgetExceeded as e:
+                # En-têtes déjà envoyés : l'archive tronquée est invalide côté client
+                self.close_connection = True
+                logger.warning(f"Génération de {module_name} interrompue après {e.elapsed:.2f}s: {e}")
+                return self._budget_status(e)
+            except Exception:
+                # En-têtes déjà envoyés : on coupe la connexion sans chunk final
+                self.close_connection = True
+                logger.exception(f"Génération interrompue pour {module_name}")
+                return HTTPStatus.INTERNAL_SERVER_ERROR
+            finally:
+                self._bytes_out = writer.bytes_written
+            return HTTPStatus.OK
+
+        except RequestRejected as e:
+            return self._send_error(e)
+        finally:
+            if generator is not None:
+                self.service.release_generator(generator)
+
+    @staticmethod
+    def _budget_status(error: GenerationBudgetExceeded) -> HTTPStatus:
+        """Statut HTTP d'un dépassement de budget"""
+        if error.limit in ('deadline', 'cancelled'):
+            return HTTPStatus.SERVICE_UNAVAILABLE
+        return HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+    def _read_body(self) -> bytes:
+        """Lit le corps de la requête en respectant la taille maximale"""
+        length = self.headers.get('Content-Length')
+        if length is None:
+            raise RequestRejected(HTTPStatus.LENGTH_REQUIRED, "Content-Length requis")
+        try:
+            length = int(length)
+        except ValueError:
+            raise RequestRejected(HTTPStatus.BAD_REQUEST, "Content-Length invalide")
+        if length > self.service.limits.max_body_bytes:
+            self.close_connection = True  # corps non lu
+            raise RequestRejected(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Corps trop volumineux: {length} octets (max {self.service.limits.max_body_bytes})")
+        return self.rfile.read(length)
+
+    def _send_error(self, error: RequestRejected) -> int:
+        body = json.dumps({'error': str(error)}, ensure_ascii=False).encode('utf-8') + b'\n'
+        return self._send_body(error.status, body, 'application/json; charset=utf-8')
+
+    def _send_body(self, status: HTTPStatus, body: bytes, content_type: str) -> int:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self._bytes_out = len(body)
+        return int(status)
+
+
+class GenerationHTTPServer(ThreadingHTTPServer):
+    """Serveur HTTP multi-thread ; la génération est bornée par le pool du service"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: GenerationService):
+        self.service = service
+        super().__init__(address, _GenerationRequestHandler)
+
+
+def serve_http(host: str = '127.0.0.1', port: int = 8765, workers: int = 4,
+               limits: Optional[ServiceLimits] = None) -> None:
+    """Démarre le service HTTP (bloquant)"""
+    service = GenerationService(workers=workers, limits=limits)
+    with GenerationHTTPServer((host, port), service) as server:
+        logger.info(f"Service HTTP omg en écoute sur http://{host}:{server.server_address[1]}")
+        server.serve_forever()
@@ -3,12 +3,41 @@
 Utilitaires pour Odoo Model Generator
 """
 
-from .validators import ConfigValidator
-from .formatters import CodeFormatter
-from .file_manager import FileManager
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'ConfigValidator': '.validators',
+    'CodeFormatter': '.formatters',
+    'FileManager': '.file_manager',
+    'MemoryProfiler': '.profiling',
+    'GenerationTimings': '.timings',
+    'WriterPipeline': '.pipeline',
+    'RenderCache': '.render_cache',
+    'AssetStore': '.asset_store',
+    'ModulePublisher': '.publish',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     'ConfigValidator',
     'CodeFormatter',
-    'FileManager'
-]
\ No newline at end of file
+    'FileManager',
+    'MemoryProfiler',
+    'GenerationTimings',
+    'WriterPipeline',
+    'RenderCache',
+    'AssetStore',
+    'ModulePublisher'
+]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Archives des modules : reproductibles et compressées en parallèle
+
+Les archives classiques dépendent de l'ordre de parcours du système de
+fichiers, des dates de modification, des propriétaires et de la date inscrite
+dans l'en-tête gzip. En mode reproductible :
+
+- les entrées sont triées par chemin
+- les dates sont fixées (``SOURCE_DATE_EPOCH`` ou 1980-01-01)
+- les propriétaires sont 0/0 sans nom, les permissions 0644 (0755 pour les
+  dossiers et les fichiers exécutables)
+- l'en-tête gzip ne contient ni date ni nom de fichier
+
+La compression (gzip et deflate des zip) est répartie sur un pool de threads
+par blocs (cf. ``parallel_compress``), sans changer les octets produits.
+"""
+
+import os
+import stat
+import struct
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import List, Tuple
+
+from .parallel_compress import DEFAULT_BLOCK_SIZE, ParallelDeflater, ParallelGzipWriter
+
+SOURCE_DATE_EPOCH_ENV_VAR = 'SOURCE_DATE_EPOCH'
+
+# 1980-01-01 00:00:00 UTC : plus petite date représentable dans un zip
+DEFAULT_EPOCH = 315532800
+
+# Au-delà, les tailles et positions ne tiennent plus sur 32 bits (zip64) :
+# l'écriture passe par zipfile, sans compression parallèle
+_ZIP32_LIMIT = 0xF0000000
+_ZIP32_MAX_ENTRIES = 0xFFFF
+
+
+def reproducible_mtime(mtime: int = None) -> int:
+    """Date fixe des entrées : ``mtime``, sinon $SOURCE_DATE_EPOCH, sinon 1980-01-01"""
+    if mtime is None:
+        mtime = int(os.environ.get(SOURCE_DATE_EPOCH_ENV_VAR) or DEFAULT_EPOCH)
+    # Les zip ne représentent pas les dates antérieures à 1980
+    return max(int(mtime), DEFAULT_EPOCH)
+
+
+def _normalized_mode(path: Path, is_dir: bool) -> int:
+    if is_dir or path.stat().st_mode & stat.S_IXUSR:
+        return 0o755
+    return 0o644
+
+
+def iter_sorted_entries(source_dir: str) -> List[Tuple[str, Path, bool]]:
+    """Entrées d'un dossier triées par chemin : (nom relatif POSIX, chemin, dossier ?)
+
+    Les dossiers précèdent leur contenu. Les liens symboliques vers des
+    fichiers (magasin d'assets) sont suivis, ceux vers des dossiers ignorés.
+    """
+    root = Path(source_dir)
+    entries = []
+    for directory, dir_names, file_names in os.walk(root):
+        base = Path(directory)
+        for name in dir_names:
+            if not (base / name).is_symlink():
+                entries.append(((base / name).relative_to(root).as_posix(), base / name, True))
+        for name in file_names:
+            if (base / name).is_file():
+                entries.append(((base / name).relative_to(root).as_posix(), base / name, False))
+    # Tri sur les composants : 'a/b' avant 'a.b' quel que soit l'ordre des caractères
+    entries.sort(key=lambda entry: entry[0].split('/'))
+    return entries
+
+
+def write_tar(source_dir: str, archive_path: str, arcname: str = None, compress: bool = True,
+              reproducible: bool = False, mtime: int = None, compresslevel: int = 9,
+              workers: int = None, block_size: int = DEFAULT_BLOCK_SIZE) -> str:
+    """Crée un tar (gzip par défaut) de ``source_dir``
+
+    Args:
+        source_dir: Dossier à archiver
+        archive_path: Archive à créer
+        arcname: Nom du dossier racine dans l'archive (défaut: nom de ``source_dir``)
+        compress: Compression gzip (parallèle)
+        reproducible: Métadonnées normalisées (cf. module)
+        mtime: Date des entrées en mode reproductible (défaut: ``reproducible_mtime()``)
+        compresslevel: Niveau de compression gzip
+        workers: Threads de compression (défaut: nombre de CPU)
+        block_size: Taille des blocs compressés indépendamment
+
+    Returns:
+        Chemin de l'archive
+    """
+    source_path = Path(source_dir)
+    arcname = arcname or source_path.name
+    mtime = reproducible_mtime(mtime)
+
+    def tar_info(tar: tarfile.TarFile, name: str, path: Path, is_dir: bool) -> tarfile.TarInfo:
+        info = tar.gettarinfo(str(path), name)
+        if reproducible:
+            info.mode = _normalized_mode(path, is_dir)
+            info.mtime = mtime
+            info.uid = info.gid = 0
+            info.uname = info.gname = ''
+        return info
+
+    def write_entries(fileobj):
+        # dereference : contenu des liens (magasin d'assets), jamais d'entrée lien
+        with tarfile.open(fileobj=fileobj, mode='w', format=tarfile.PAX_FORMAT, dereference=True) as tar:
+            tar.addfile(tar_info(tar, arcname, source_path, True))
+            for name, path, is_dir in iter_sorted_entries(source_path):
+                info = tar_info(tar, f'{arcname}/{name}', path, is_dir)
+                if is_dir:
+                    tar.addfile(info)
+                else:
+                    with open(path, 'rb') as f:
+                        tar.addfile(info, f)
+
+    with open(archive_path, 'wb') as raw:
+        if compress:
+            with ParallelGzipWriter(raw, compresslevel=compresslevel, block_size=block_size,
+                                    workers=workers) as gzip_file:
+                write_entries(gzip_file)
+        else:
+            write_entries(raw)
+    return str(archive_path)
+
+
+def _dos_date_time(date_time: Tuple[int, ...]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time[:6]
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def write_zip(source_dir: str, archive_path: str, arcname: str = None, reproducible: bool = False,
+              mtime: int = None, compresslevel: int = 6, workers: int = None,
+              block_size: int = DEFAULT_BLOCK_SIZE) -> str:
+    """Crée un zip (deflate parallèle) de ``source_dir``, fichiers uniquement comme ``FileManager``
+
+    Args:
+        source_dir: Dossier à archiver
+        archive_path: Archive à créer
+        arcname: Nom du dossier racine dans l'archive (défaut: nom de ``source_dir``)
+        reproducible: Métadonnées normalisées (cf. module)
+        mtime: Date des entrées en mode reproductible (défaut: ``reproducible_mtime()``)
+        compresslevel: Niveau de compression deflate
+        workers: Threads de compression (défaut: nombre de CPU)
+        block_size: Taille des blocs compressés indépendamment
+
+    Returns:
+        Chemin de l'archive
+    """
+    source_path = Path(source_dir)
+    arcname = arcname or source_path.name
+    fixed_date_time = time.gmtime(reproducible_mtime(mtime))[:6] if reproducible else None
+
+    entries = []
+    for name, path, is_dir in iter_sorted_entries(source_path):
+        if is_dir:
+            continue
+        file_stat = path.stat()
+        if reproducible:
+            date_time, mode = fixed_date_time, _normalized_mode(path, False)
+        else:
+            date_time = time.localtime(max(file_stat.st_mtime, DEFAULT_EPOCH))[:6]
+            mode = stat.S_IMODE(file_stat.st_mode)
+        entries.append((f'{arcname}/{name}', path, file_stat.st_size, date_time, mode))
+
+    if len(entries) >= _ZIP32_MAX_ENTRIES or sum(entry[2] for entry in entries) >= _ZIP32_LIMIT:
+        return _write_zip64(archive_path, entries, compresslevel)
+
+    central_directory = []
+    with open(archive_path, 'wb') as archive, \
+            ParallelDeflater(compresslevel, block_size, workers) as deflater:
+        for name, path, _, date_time, mode in entries:
+            encoded_name = name.encode('utf-8')
+            # Bit 11 : nom encodé en UTF-8
+            flags = 0x800 if not name.isascii() else 0
+            dos_time, dos_date = _dos_date_time(date_time)
+            record = {'name': encoded_name, 'flags': flags, 'time': dos_time, 'date': dos_date,
+                      'external_attr': (stat.S_IFREG | mode) << 16}
+
+            def write_local_header(record=record):
+                record['offset'] = archive.tell()
+                # Signature, version 2.0, drapeaux, deflate, date, CRC et tailles complétés ensuite
+                archive.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, record['flags'], 8,
+                                          record['time'], record['date'], 0, 0, 0,
+                                          len(record['name']), 0))
+                archive.write(record['name'])
+
+            deflater.then(write_local_header)
+            stream = deflater.open_stream(archive.write)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(block_size), b''):
+                    deflater.write(stream, chunk)
+            deflater.end(stream)
+
+            def complete_local_header(record=record, stream=stream):
+                record.update(crc=stream.crc & 0xffffffff, compressed_size=stream.compressed_size,
+                              size=stream.size)
+                end = archive.tell()
+                archive.seek(record['offset'] + 14)
+                archive.write(struct.pack('<III', record['crc'], record['compressed_size'], record['size']))
+                archive.seek(end)
+                central_directory.append(record)
+
+            deflater.then(complete_local_header)
+
+        deflater.flush()
+        directory_offset = archive.tell()
+        for record in central_directory:
+            archive.write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | 20, 20,
+                                      record['flags'], 8, record['time'], record['date'],
+                                      record['crc'], record['compressed_size'], record['size'],
+                                      len(record['name']), 0, 0, 0, 0, record['external_attr'],
+                                      record['offset']))
+            archive.write(record['name'])
+        directory_size = archive.tell() - directory_offset
+        archive.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(central_directory),
+                                  len(central_directory), directory_size, directory_offset, 0))
+    return str(archive_path)
+
+
+def _write_zip64(archive_path: str, entries: list, compresslevel: int) -> str:
+    """Archives volumineuses (zip64) : écriture séquentielle par zipfile"""
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zipf:
+        for name, path, _, date_time, mode in entries:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 3  # Unix : permissions dans external_attr
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            with open(path, 'rb') as f, zipf.open(info, 'w', force_zip64=True) as dest:
+                for chunk in iter(lambda: f.read(DEFAULT_BLOCK_SIZE), b''):
+                    dest.write(chunk)
+    return str(archive_path)
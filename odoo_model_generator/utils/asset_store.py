@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Magasin d'assets statiques partagé entre les modules générés
+
+Les fichiers ``static/`` (icône, CSS, JS, description HTML) sont identiques
+d'un module à l'autre : ils sont stockés une seule fois, adressés par leur
+hash, puis liés dans chaque module (lien physique ou symbolique). Si le lien
+est impossible (autre système de fichiers, liens non supportés), le fichier
+est copié.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Union
+
+LINK_MODES = ('hardlink', 'symlink', 'copy')
+
+
+def ensure_private_file(path: Union[str, Path]):
+    """Supprime ``path`` s'il est partagé (lien symbolique ou physique)
+
+    À appeler avant d'écrire un fichier sur place : écrire dans un lien vers
+    le magasin modifierait l'asset de tous les modules.
+    """
+    try:
+        file_stat = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if stat.S_ISLNK(file_stat.st_mode) or file_stat.st_nlink > 1:
+        os.unlink(path)
+
+
+class AssetStoreStats:
+    """Statistiques du magasin pour une génération"""
+
+    def __init__(self):
+        self.blobs_written = 0
+        self.hardlinks = 0
+        self.symlinks = 0
+        self.copies = 0
+        self.bytes_deduplicated = 0
+
+    def format_report(self) -> str:
+        """Formate les statistiques du magasin"""
+        from .file_manager import FileManager
+
+        rows = [
+            ('Assets stockés', str(self.blobs_written)),
+            ('Liens physiques / symboliques', f"{self.hardlinks} / {self.symlinks}"),
+            ('Copies (repli)', str(self.copies)),
+            ('Écritures évitées', FileManager.format_file_size(self.bytes_deduplicated)),
+        ]
+        return '\n'.join(f"  {label:<28} {value}" for label, value in rows)
+
+
+class AssetStore:
+    """Blobs adressés par contenu, liés dans les modules
+
+    Chaque contenu est écrit une seule fois par exécution (puis seulement
+    vérifié) ; l'objet est sérialisable et peut être passé aux workers d'un
+    lot, les écritures concurrentes étant atomiques.
+
+    Usage:
+        store = AssetStore('addons/.omg-assets', link_mode='hardlink')
+        store.materialize(content, module_path / 'static/description/icon.svg')
+    """
+
+    def __init__(self, store_dir: Union[str, Path], link_mode: str = 'hardlink'):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Mode de lien inconnu: {link_mode} (attendu: {', '.join(LINK_MODES)})")
+        self.store_dir = Path(store_dir)
+        self.link_mode = link_mode
+        self.stats = AssetStoreStats()
+        self._known_blobs = set()
+        # Passe à False au premier lien physique refusé (autre système de fichiers)
+        self._hardlinks_supported = True
+
+    def blob_path(self, digest: str) -> Path:
+        return self.store_dir / 'objects' / digest[:2] / digest
+
+    def put(self, content: Union[str, bytes]) -> Path:
+        """Stocke un contenu (si absent) et retourne le chemin de son blob"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if digest in self._known_blobs:
+            self.stats.bytes_deduplicated += len(data)
+            return path
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                # Lecture seule : protège le blob partagé des écritures sur place
+                os.chmod(tmp_path, 0o444)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self.stats.blobs_written += 1
+        else:
+            self.stats.bytes_deduplicated += len(data)
+        self._known_blobs.add(digest)
+        return path
+
+    def materialize(self, content: Union[str, bytes], destination: Union[str, Path]) -> str:
+        """Place un contenu à ``destination`` via le magasin
+
+        Returns:
+            Mode effectivement utilisé ('hardlink', 'symlink' ou 'copy')
+        """
+        blob = self.put(content)
+        destination = Path(destination)
+        tmp_path = destination.with_name(f'.{destination.name}.omg-tmp')
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+
+        mode = self._link(blob, tmp_path)
+        # Remplacement atomique d'un éventuel fichier existant
+        os.replace(tmp_path, destination)
+        if mode == 'hardlink':
+            self.stats.hardlinks += 1
+        elif mode == 'symlink':
+            self.stats.symlinks += 1
+        else:
+            self.stats.copies += 1
+        return mode
+
+    def _link(self, blob: Path, target: Path) -> str:
+        if self.link_mode == 'hardlink' and self._hardlinks_supported:
+            try:
+                os.link(blob, target)
+                return 'hardlink'
+            except OSError as e:
+                if e.errno == errno.EMLINK:
+                    # Trop de liens vers ce blob : copie pour ce fichier seulement
+                    pass
+                elif e.errno in (errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP):
+                    self._hardlinks_supported = False
+                else:
+                    raise
+        elif self.link_mode == 'symlink':
+            try:
+                os.symlink(os.path.abspath(blob), target)
+                return 'symlink'
+            except OSError as e:
+                if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP):
+                    raise
+        shutil.copyfile(blob, target)
+        return 'copy'
@@ -102,16 +102,20 @@ class FileManager:
         return Path(dir_path).is_dir()
     
     @staticmethod
-    def list_files(directory: str, pattern: str = '*', recursive: bool = False) -> List[str]:
-        """Liste les fichiers dans un dossier"""
-        dir_path = Path(directory)
+    def list_files(directory: str, pattern: str = '*', recursive: bool = False,
+                   max_depth: int = None, workers: int = 1) -> List[str]:
+        """Liste les fichiers dans un dossier
         
-        if recursive:
-            files = list(dir_path.rglob(pattern))
-        else:
-            files = list(dir_path.glob(pattern))
+        Args:
+            pattern: Motif glob sur le nom des fichiers
+            recursive: Parcourt les sous-dossiers (jusqu'à ``max_depth``)
+            workers: Threads parcourant les sous-dossiers en parallèle
+        """
+        from .tree_walker import iter_files
         
-        return [str(f) for f in files if f.is_file()]
+        # Sans récursion, un motif 'models/*.py' porte sur les niveaux qu'il nomme
+        depth = max_depth if recursive else pattern.count('/') + 1
+        return [entry.path for entry in iter_files(directory, pattern, max_depth=depth, workers=workers)]
     
     @staticmethod
     def list_directories(directory: str, pattern: str = '*') -> List[str]:
@@ -138,23 +142,27 @@ class FileManager:
     
     @staticmethod
     def create_archive(source_dir: str, archive_path: str, 
-                      format_type: str = 'zip') -> bool:
-        """Crée une archive d'un dossier"""
+                      format_type: str = 'zip', reproducible: bool = False,
+                      workers: int = None) -> bool:
+        """Crée une archive d'un dossier
+        
+        La compression est répartie par blocs sur ``workers`` threads (défaut:
+        nombre de CPU). Avec ``reproducible``, l'archive ne dépend que du
+        contenu des fichiers (entrées triées, dates fixes ou $SOURCE_DATE_EPOCH,
+        propriétaires et permissions normalisés, en-tête gzip sans date).
+        """
+        from .archives import write_tar, write_zip
+        
         try:
             source_path = Path(source_dir)
             archive_path = Path(archive_path)
             
             if format_type.lower() == 'zip':
-                with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in source_path.rglob('*'):
-                        if file_path.is_file():
-                            arcname = file_path.relative_to(source_path.parent)
-                            zipf.write(file_path, arcname)
+                write_zip(source_path, archive_path, reproducible=reproducible, workers=workers)
             
             elif format_type.lower() in ['tar', 'tar.gz', 'tgz']:
-                mode = 'w:gz' if format_type.lower() in ['tar.gz', 'tgz'] else 'w'
-                with tarfile.open(archive_path, mode) as tar:
-                    tar.add(source_path, arcname=source_path.name)
+                write_tar(source_path, archive_path, compress=format_type.lower() != 'tar',
+                          reproducible=reproducible, workers=workers)
             
             else:
                 raise ValueError(f"Format d'archive non supporté: {format_type}")
@@ -251,16 +259,15 @@ class FileManager:
         return cleaned
     
     @staticmethod
-    def get_directory_size(directory: str) -> int:
-        """Calcule la taille totale d'un dossier"""
-        total_size = 0
-        dir_path = Path(directory)
+    def get_directory_size(directory: str, workers: int = 1) -> int:
+        """Calcule la taille totale d'un dossier
         
-        for file_path in dir_path.rglob('*'):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
+        Args:
+            workers: Threads parcourant les sous-dossiers de premier niveau en parallèle
+        """
+        from .tree_walker import directory_size
         
-        return total_size
+        return directory_size(directory, workers=workers)
     
     @staticmethod
     def format_file_size(size_bytes: int) -> str:
@@ -39,31 +39,15 @@ class CodeFormatter:
     
     @staticmethod
     def format_xml_code(xml_code: str) -> str:
-        """Formate le code XML avec indentation correcte"""
-        lines = xml_code.split('\n')
-        formatted_lines = []
-        indent_level = 0
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Diminuer l'indentation pour les balises fermantes
-            if line.startswith('</') or line.startswith('<!--') and '-->' in line:
-                indent_level = max(0, indent_level - 1)
-            
-            # Ajouter l'indentation
-            formatted_lines.append('    ' * indent_level + line)
-            
-            # Augmenter l'indentation pour les balises ouvrantes
-            if line.startswith('<') and not line.startswith('</') and not line.endswith('/>') and not line.startswith('<!--'):
-                indent_level += 1
-            # Diminuer pour les balises auto-fermantes
-            elif line.endswith('/>'):
-                pass  # Pas de changement d'indentation
-        
-        return '\n'.join(formatted_lines)
+        """Formate le code XML avec indentation correcte (cf. ``xml_formatter``)"""
+        from .xml_formatter import format_xml
+        return format_xml(xml_code)
+    
+    @staticmethod
+    def format_xml_file(source: str, destination: str = None) -> str:
+        """Formate un fichier XML en flux, sans le charger en entier"""
+        from .xml_formatter import format_xml_file
+        return format_xml_file(source, destination)
     
     @staticmethod
     def format_field_name(name: str) -> str:
@@ -91,6 +75,17 @@ class CodeFormatter:
         
         return name
     
+    @staticmethod
+    def format_module_name(name: str) -> str:
+        """Formate un nom de module (dossier technique) pour Odoo"""
+        # Remplace les espaces et caractères spéciaux par des underscores
+        cleaned = ''.join(c if c.isalnum() else '_' for c in name.lower())
+        # Supprime les underscores multiples
+        while '__' in cleaned:
+            cleaned = cleaned.replace('__', '_')
+        # Supprime les underscores en début et fin
+        return cleaned.strip('_')
+    
     @staticmethod
     def format_class_name(model_name: str) -> str:
         """Génère un nom de classe Python à partir du nom du modèle"""
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Compression deflate parallèle par blocs (à la pigz)
+
+Le flux est découpé en blocs compressés indépendamment par un pool de threads
+(zlib libère le GIL). Chaque bloc est amorcé avec les 32 Ko qui le précèdent
+(dictionnaire, pour conserver le taux de compression) et terminé par un vidage
+synchrone : la concaténation des blocs, suivie d'un bloc final vide, est un
+flux deflate standard, lisible par gzip/unzip/zlib.
+
+Le résultat ne dépend que du niveau et de la taille de bloc, pas du nombre de
+threads : une archive reproductible le reste sur toutes les machines.
+"""
+
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Optional
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# Fenêtre deflate : taille du dictionnaire transmis au bloc suivant
+_WINDOW_SIZE = 32 * 1024
+
+# Bloc final vide (bloc fixe avec BFINAL=1) qui termine le flux
+_FINAL_BLOCK = b'\x03\x00'
+
+
+def _deflate_block(data: bytes, level: int, zdict: bytes) -> bytes:
+    """Compresse un bloc en deflate brut, sans le terminer (vidage synchrone)"""
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL,
+                                      zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class DeflateStream:
+    """Un flux deflate (membre gzip, entrée zip) : CRC et tailles"""
+
+    def __init__(self, sink: Callable[[bytes], None]):
+        self.sink = sink
+        self.crc = 0
+        self.size = 0
+        self.compressed_size = 0
+        self._buffer = bytearray()
+        self._previous = b''
+
+
+class ParallelDeflater:
+    """Pool de compression partagé par un ou plusieurs flux deflate
+
+    Les blocs compressés et les actions (``then``) sont restitués dans l'ordre
+    de soumission, depuis le thread appelant : ``sink`` n'a pas besoin d'être
+    thread-safe.
+
+    Usage:
+        with ParallelDeflater(level=6) as deflater:
+            stream = deflater.open_stream(output.write)
+            deflater.write(stream, data)
+            deflater.end(stream)
+    """
+
+    def __init__(self, level: int = 6, block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None):
+        self.level = level
+        self.block_size = max(_WINDOW_SIZE, block_size)
+        self.workers = workers or os.cpu_count() or 1
+        # Borne la mémoire : blocs en vol par thread
+        self.max_pending = self.workers * 4
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque = deque()
+        self._in_flight = 0
+
+    def __enter__(self) -> 'ParallelDeflater':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        self.close()
+
+    def open_stream(self, sink: Callable[[bytes], None]) -> DeflateStream:
+        """Démarre un flux dont les octets compressés seront passés à ``sink``"""
+        return DeflateStream(sink)
+
+    def write(self, stream: DeflateStream, data: bytes):
+        """Ajoute des données au flux"""
+        stream.crc = zlib.crc32(data, stream.crc)
+        stream.size += len(data)
+        stream._buffer += data
+        while len(stream._buffer) >= self.block_size:
+            block = bytes(stream._buffer[:self.block_size])
+            del stream._buffer[:self.block_size]
+            self._submit_block(stream, block)
+
+    def end(self, stream: DeflateStream):
+        """Termine le flux (dernier bloc et bloc final)"""
+        if stream._buffer:
+            self._submit_block(stream, bytes(stream._buffer))
+            stream._buffer = bytearray()
+        self._pending.append((None, stream, _FINAL_BLOCK))
+        self._drain(blocking=False)
+
+    def then(self, action: Callable[[], None]):
+        """Exécute ``action`` une fois tout ce qui précède restitué"""
+        self._pending.append((None, None, action))
+        self._drain(blocking=False)
+
+    def flush(self):
+        """Attend et restitue tous les blocs soumis"""
+        while self._pending:
+            self._emit(self._pending.popleft())
+
+    def close(self):
+        """Arrête le pool de threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _submit_block(self, stream: DeflateStream, block: bytes):
+        zdict = stream._previous[-_WINDOW_SIZE:]
+        stream._previous = block
+        if self.workers == 1:
+            self._pending.append((None, stream, _deflate_block(block, self.level, zdict)))
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='omg-deflate')
+            future = self._executor.submit(_deflate_block, block, self.level, zdict)
+            self._pending.append((future, stream, None))
+            self._in_flight += 1
+        self._drain(blocking=self._in_flight > self.max_pending)
+
+    def _drain(self, blocking: bool):
+        """Restitue les éléments en tête de file déjà prêts (ou le premier bloc, en bloquant)"""
+        while self._pending:
+            future = self._pending[0][0]
+            if future is not None and not future.done() and not blocking:
+                return
+            self._emit(self._pending.popleft())
+            if future is not None:
+                blocking = False
+
+    def _emit(self, item):
+        future, stream, payload = item
+        if future is not None:
+            payload = future.result()
+            self._in_flight -= 1
+        if stream is None:
+            payload()
+        else:
+            stream.compressed_size += len(payload)
+            stream.sink(payload)
+
+
+class ParallelGzipWriter:
+    """Fichier gzip en écriture dont la compression est répartie sur un pool de threads
+
+    L'en-tête ne contient pas de nom de fichier et la date vaut ``mtime``
+    (0 par défaut) : même contenu, mêmes octets. Utilisable comme ``fileobj``
+    de ``tarfile.open(..., mode='w')``.
+    """
+
+    def __init__(self, fileobj, compresslevel: int = 9, mtime: int = 0,
+                 block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None):
+        self.fileobj = fileobj
+        self.closed = False
+        self._deflater = ParallelDeflater(compresslevel, block_size, workers)
+        self._stream = self._deflater.open_stream(fileobj.write)
+        extra_flags = 2 if compresslevel == 9 else (4 if compresslevel == 1 else 0)
+        # ID1 ID2 CM FLG MTIME XFL OS (255 : inconnu, comme le module gzip)
+        fileobj.write(struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, 0, int(mtime), extra_flags, 255))
+
+    def __enter__(self) -> 'ParallelGzipWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._deflater.close()
+
+    def write(self, data) -> int:
+        self._deflater.write(self._stream, bytes(data))
+        return len(data)
+
+    def tell(self) -> int:
+        """Position dans le flux non compressé (comme ``gzip.GzipFile``)"""
+        return self._stream.size
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Termine le flux gzip (le fichier sous-jacent reste ouvert)"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._deflater.end(self._stream)
+            self._deflater.flush()
+            self.fileobj.write(struct.pack('<II', self._stream.crc & 0xffffffff,
+                                           self._stream.size & 0xffffffff))
+        finally:
+            self._deflater.close()
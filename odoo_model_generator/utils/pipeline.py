@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline rendu/écriture : les écritures disque se recouvrent avec le rendu Jinja
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Union
+
+from .asset_store import ensure_private_file
+
+# Marqueur de fin pour les threads d'écriture
+_STOP = object()
+
+
+class StreamedContent:
+    """Contenu texte produit morceau par morceau (données de démo volumineuses)
+
+    Passe partout où un contenu ``str`` est accepté par les écritures
+    (pipeline, archives) sans jamais être assemblé en mémoire. Chaque
+    itération reproduit le contenu depuis le début ; les sous-classes
+    implémentent ``iter_chunks`` et restent sérialisables (workers).
+    """
+
+    def iter_chunks(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_chunks()
+
+    def read(self) -> str:
+        """Contenu complet (petits volumes, tests)"""
+        return ''.join(self.iter_chunks())
+
+    def __eq__(self, other):
+        if isinstance(other, (StreamedContent, str)):
+            return self.read() == (other if isinstance(other, str) else other.read())
+        return NotImplemented
+
+    __hash__ = None
+
+
+class MappedContent(StreamedContent):
+    """Contenu en flux transformé au fil des morceaux (mise en forme, décompte)"""
+
+    def __init__(self, source: StreamedContent, transform: Callable[[Iterable[str]], Iterable[str]]):
+        self.source = source
+        self.transform = transform
+
+    def iter_chunks(self) -> Iterator[str]:
+        return iter(self.transform(self.source.iter_chunks()))
+
+
+def write_content(file_path: Union[str, Path], content: Union[str, bytes, StreamedContent]) -> int:
+    """Écrit un contenu texte (UTF-8), binaire ou en flux
+
+    Returns:
+        Nombre d'octets écrits
+    """
+    if isinstance(content, bytes):
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        return len(content)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        if not isinstance(content, StreamedContent):
+            f.write(content)
+            return len(content.encode('utf-8'))
+        size = 0
+        for chunk in content.iter_chunks():
+            f.write(chunk)
+            size += len(chunk.encode('utf-8'))
+        return size
+
+
+class PipelineStats:
+    """Mesures du pipeline, pour savoir qui du rendu ou du stockage limite la génération
+
+    - ``producer_wait`` : temps passé par le rendu bloqué sur une file pleine
+      (le stockage ne suit pas)
+    - ``consumer_idle`` : temps cumulé des écrivains en attente d'un fichier
+      (le rendu ne suit pas)
+    """
+
+    def __init__(self, workers: int, queue_depth: int):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.files = 0
+        self.bytes_written = 0
+        self.producer_wait = 0.0
+        self.producer_stalls = 0
+        self.consumer_idle = 0.0
+        self.write_time = 0.0
+        self.max_depth = 0
+        self.wall_time = 0.0
+
+    @property
+    def bottleneck(self) -> str:
+        """Étape limitante estimée"""
+        if self.workers == 0:
+            return 'écriture synchrone'
+        if self.producer_wait > self.consumer_idle / self.workers:
+            return 'stockage'
+        return 'rendu'
+
+    def format_report(self) -> str:
+        """Formate les mesures du pipeline"""
+        from .file_manager import FileManager
+
+        rows = [
+            ('Écrivains / profondeur', f"{self.workers} / {self.queue_depth} (max atteint: {self.max_depth})"),
+            ('Fichiers écrits', f"{self.files} ({FileManager.format_file_size(self.bytes_written)})"),
+            ("Temps d'écriture", f"{self.write_time:.3f}s"),
+            ('Rendu bloqué (file pleine)', f"{self.producer_wait:.3f}s en {self.producer_stalls} attente(s)"),
+            ('Écrivains inactifs', f"{self.consumer_idle:.3f}s"),
+            ('Étape limitante', self.bottleneck),
+        ]
+        return '\n'.join(f"  {label:<28} {value}" for label, value in rows)
+
+
+class WriterPipeline:
+    """Écrit les fichiers rendus depuis une file bornée consommée par un pool de threads
+
+    La profondeur de la file borne la mémoire occupée par les contenus rendus
+    mais pas encore écrits. Avec ``workers=0`` les écritures sont synchrones.
+
+    Usage:
+        with WriterPipeline(module_path, workers=2) as writer:
+            for relative_path, content in files:
+                writer.submit(relative_path, content)
+    """
+
+    def __init__(self, root: Union[str, Path], workers: int = 2, queue_depth: int = 32):
+        self.root = Path(root)
+        self.workers = max(0, workers)
+        self.stats = PipelineStats(self.workers, queue_depth)
+        self._queue = queue.Queue(maxsize=max(1, queue_depth))
+        self._lock = threading.Lock()
+        self._errors: List[BaseException] = []
+        self._aborted = False
+        self._closed = False
+        self._started = time.perf_counter()
+        self._threads = [
+            threading.Thread(target=self._run_writer, name=f'omg-writer-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> 'WriterPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def submit(self, relative_path: str, content: Union[str, bytes, StreamedContent]):
+        """Met un fichier en file d'écriture (bloque si la file est pleine)"""
+        self._raise_if_failed()
+        if not self.workers:
+            self._write(relative_path, content)
+            return
+
+        item = (relative_path, content)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            waited_from = time.perf_counter()
+            self._queue.put(item)
+            self.stats.producer_wait += time.perf_counter() - waited_from
+            self.stats.producer_stalls += 1
+        self.stats.max_depth = max(self.stats.max_depth, self._queue.qsize())
+
+    def close(self):
+        """Attend la fin des écritures et propage la première erreur"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self.stats.wall_time = time.perf_counter() - self._started
+        self._raise_if_failed()
+
+    def abort(self):
+        """Abandonne les écritures en attente (erreur côté rendu)"""
+        self._aborted = True
+        # Vide la file pour débloquer les écrivains puis les arrête
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._closed = True
+        # Un _STOP tant qu'un écrivain tourne : après ``close`` (erreur d'écriture),
+        # les écrivains sont déjà arrêtés et plus personne ne lit la file
+        for thread in self._threads:
+            while thread.is_alive():
+                try:
+                    self._queue.put_nowait(_STOP)
+                except queue.Full:
+                    pass
+                thread.join(timeout=0.05)
+
+    def _run_writer(self):
+        while True:
+            waited_from = time.perf_counter()
+            item = self._queue.get()
+            idle = time.perf_counter() - waited_from
+            if item is _STOP:
+                return
+            with self._lock:
+                self.stats.consumer_idle += idle
+            if self._aborted or self._errors:
+                continue
+            try:
+                self._write(*item)
+            except BaseException as e:
+                with self._lock:
+                    self._errors.append(e)
+
+    def _write(self, relative_path: str, content: Union[str, bytes, StreamedContent]):
+        started = time.perf_counter()
+        file_path = self.root / relative_path
+        # Un lien vers le magasin d'assets ne doit pas être écrit sur place
+        ensure_private_file(file_path)
+        size = write_content(file_path, content)
+        with self._lock:
+            self.stats.files += 1
+            self.stats.bytes_written += size
+            self.stats.write_time += time.perf_counter() - started
+
+    def _raise_if_failed(self):
+        if self._errors:
+            raise self._errors[0]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Profilage mémoire de la génération basé sur tracemalloc
+"""
+
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+# Traces internes à ignorer dans les rapports
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class StageMemoryStats:
+    """Mesures mémoire d'une étape de génération"""
+
+    def __init__(self, name: str, peak: int, retained: int,
+                 top_allocations: List[tracemalloc.StatisticDiff],
+                 snapshot_file: Optional[str] = None):
+        self.name = name
+        self.peak = peak
+        self.retained = retained
+        self.top_allocations = top_allocations
+        self.snapshot_file = snapshot_file
+
+    def __repr__(self):
+        return f"StageMemoryStats(name='{self.name}', peak={self.peak}, retained={self.retained})"
+
+
+class MemoryProfiler:
+    """Prend des snapshots tracemalloc à chaque frontière d'étape
+
+    Pour chaque étape sont mesurés :
+    - le pic mémoire atteint pendant l'étape (relatif au début de l'étape)
+    - la mémoire conservée à la fin de l'étape
+    - les principaux sites d'allocation (diff avec le snapshot de début)
+
+    Les snapshots peuvent être écrits sur disque (``snapshot_dir``) pour être
+    comparés hors ligne avec ``tracemalloc.Snapshot.load``.
+    """
+
+    def __init__(self, top_n: int = 10, snapshot_dir: str = None, frames: int = 1):
+        self.top_n = top_n
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.frames = frames
+        self.stages: List[StageMemoryStats] = []
+        self._owns_tracing = False
+        self._stage_start_memory = 0
+        self._stage_start_snapshot = None
+
+    def start(self):
+        """Démarre le traçage des allocations"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        if self.snapshot_dir:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    def stop(self):
+        """Arrête le traçage s'il a été démarré par ce profileur"""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def start_stage(self, name: str):
+        """Marque le début d'une étape"""
+        if not tracemalloc.is_tracing():
+            self.start()
+        self._stage_start_snapshot = self._take_snapshot()
+        self._stage_start_memory = tracemalloc.get_traced_memory()[0]
+        # reset_peak n'existe qu'à partir de Python 3.9 : le pic est alors cumulatif
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    def end_stage(self, name: str) -> StageMemoryStats:
+        """Marque la fin d'une étape et enregistre ses mesures"""
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self._take_snapshot()
+        top_allocations = snapshot.compare_to(self._stage_start_snapshot, 'lineno')[:self.top_n]
+
+        snapshot_file = None
+        if self.snapshot_dir:
+            snapshot_file = str(self.snapshot_dir / f'{len(self.stages) + 1:02d}_{name}.tracemalloc')
+            snapshot.dump(snapshot_file)
+
+        stats = StageMemoryStats(
+            name=name,
+            peak=max(0, peak - self._stage_start_memory),
+            retained=current - self._stage_start_memory,
+            top_allocations=top_allocations,
+            snapshot_file=snapshot_file
+        )
+        self.stages.append(stats)
+        self._stage_start_snapshot = None
+        return stats
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager délimitant une étape"""
+        self.start_stage(name)
+        try:
+            yield
+        finally:
+            self.end_stage(name)
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """Prend un snapshot en ignorant les allocations internes"""
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+
+    def format_report(self) -> str:
+        """Formate le rapport mémoire par étape"""
+        from .file_manager import FileManager
+
+        lines = [f"{'Étape':<14} {'Pic':>12} {'Conservé':>12}"]
+        for stats in self.stages:
+            retained = FileManager.format_file_size(abs(stats.retained))
+            if stats.retained < 0:
+                retained = f"-{retained}"
+            lines.append(
+                f"{stats.name:<14} {FileManager.format_file_size(stats.peak):>12} {retained:>12}"
+            )
+
+        for stats in self.stages:
+            if not stats.top_allocations:
+                continue
+            lines.append(f"\nPrincipales allocations - {stats.name}:")
+            for diff in stats.top_allocations:
+                frame = diff.traceback[0]
+                size = FileManager.format_file_size(abs(diff.size_diff))
+                sign = '-' if diff.size_diff < 0 else '+'
+                lines.append(f"  {sign}{size:>10} {diff.count_diff:+7d} blocs  {frame.filename}:{frame.lineno}")
+            if stats.snapshot_file:
+                lines.append(f"  snapshot: {stats.snapshot_file}")
+
+        return '\n'.join(lines)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Publication atomique des modules générés
+
+Le module est généré dans un dossier de préparation voisin (même système de
+fichiers), puis échangé avec le module publié en un seul renommage
+(``renameat2(RENAME_EXCHANGE)`` sous Linux, ``renamex_np(RENAME_SWAP)`` sous
+macOS). Un lecteur (Odoo, rsync) voit l'ancienne ou la nouvelle génération,
+jamais un module à moitié écrit.
+
+Sans échange atomique, l'ancien module est d'abord déplacé puis le nouveau
+renommé à sa place : le module est brièvement absent, jamais incomplet.
+
+Les générations remplacées sont conservées pour un retour arrière immédiat::
+
+    output/
+        product_management/              module publié
+        .omg-staging/                    générations en cours
+        .omg-generations/product_management/<horodatage>/
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Union
+
+STAGING_DIR_NAME = '.omg-staging'
+GENERATIONS_DIR_NAME = '.omg-generations'
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2  # Linux : renameat2(..., RENAME_EXCHANGE)
+_RENAME_SWAP = 2      # macOS : renamex_np(..., RENAME_SWAP)
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        except OSError:
+            _libc = False
+    return _libc
+
+
+def exchange_paths(first: Union[str, Path], second: Union[str, Path]) -> bool:
+    """Échange atomiquement deux chemins existants
+
+    Returns:
+        False si le système (ou le système de fichiers) ne le permet pas ;
+        rien n'a alors été modifié
+    """
+    libc = _load_libc()
+    first, second = os.fsencode(first), os.fsencode(second)
+    if libc and sys.platform.startswith('linux') and hasattr(libc, 'renameat2'):
+        result = libc.renameat2(_AT_FDCWD, first, _AT_FDCWD, second, _RENAME_EXCHANGE)
+    elif libc and sys.platform == 'darwin' and hasattr(libc, 'renamex_np'):
+        result = libc.renamex_np(first, second, _RENAME_SWAP)
+    else:
+        return False
+    if result == 0:
+        return True
+
+    error = ctypes.get_errno()
+    if error in (errno.EINVAL, errno.ENOSYS, errno.ENOTSUP, errno.EOPNOTSUPP):
+        return False
+    raise OSError(error, os.strerror(error), os.fsdecode(first), None, os.fsdecode(second))
+
+
+class ModulePublisher:
+    """Prépare, publie et restaure les générations d'un module
+
+    Usage:
+        publisher = ModulePublisher('addons', 'product_management', keep_generations=2)
+        staging = publisher.create_staging()
+        ...  # génération dans staging
+        publisher.publish(staging)
+        publisher.rollback()  # génération précédente
+    """
+
+    def __init__(self, output_path: Union[str, Path], module_name: str, keep_generations: int = 1):
+        if keep_generations < 0:
+            raise ValueError("keep_generations doit être positif ou nul")
+        self.output_path = Path(output_path)
+        self.module_name = module_name
+        self.keep_generations = keep_generations
+
+    @property
+    def module_path(self) -> Path:
+        return self.output_path / self.module_name
+
+    @property
+    def generations_dir(self) -> Path:
+        return self.output_path / GENERATIONS_DIR_NAME / self.module_name
+
+    def create_staging(self) -> Path:
+        """Crée un dossier de préparation vide, propre à cette génération"""
+        staging = self.output_path / STAGING_DIR_NAME / f'{self.module_name}-{uuid.uuid4().hex[:12]}'
+        staging.mkdir(parents=True)
+        return staging
+
+    def discard(self, staging: Union[str, Path]):
+        """Supprime une préparation abandonnée (erreur, budget dépassé)"""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def publish(self, staging: Union[str, Path]) -> Optional[Path]:
+        """Remplace le module publié par ``staging``
+
+        Returns:
+            Chemin de la génération remplacée conservée, ou None
+        """
+        staging = Path(staging)
+        if not self.module_path.exists():
+            os.rename(staging, self.module_path)
+            return None
+
+        archived = self._new_generation_path()
+        if exchange_paths(staging, self.module_path):
+            # staging contient maintenant l'ancienne génération
+            os.rename(staging, archived)
+        else:
+            os.rename(self.module_path, archived)
+            os.rename(staging, self.module_path)
+
+        self._prune()
+        return archived if archived.exists() else None
+
+    def generations(self) -> List[Path]:
+        """Générations conservées, de la plus récente à la plus ancienne"""
+        if not self.generations_dir.is_dir():
+            return []
+        return sorted((path for path in self.generations_dir.iterdir() if path.is_dir()),
+                      key=lambda path: path.name, reverse=True)
+
+    def rollback(self, steps: int = 1) -> Path:
+        """Republie la ``steps``-ième génération précédente
+
+        La génération remplacée devient la plus récente : un second retour
+        arrière annule le premier.
+
+        Returns:
+            Chemin du module publié
+        """
+        generations = self.generations()
+        if steps < 1 or steps > len(generations):
+            raise ValueError(f"Génération introuvable: {steps} (conservées: {len(generations)})")
+        previous = generations[steps - 1]
+        if not self.module_path.exists():
+            os.rename(previous, self.module_path)
+            return self.module_path
+
+        archived = self._new_generation_path()
+        if exchange_paths(previous, self.module_path):
+            os.rename(previous, archived)
+        else:
+            os.rename(self.module_path, archived)
+            os.rename(previous, self.module_path)
+        return self.module_path
+
+    def _new_generation_path(self) -> Path:
+        self.generations_dir.mkdir(parents=True, exist_ok=True)
+        # Horodatage en nanosecondes : l'ordre des noms est l'ordre des publications
+        return self.generations_dir / f'{time.time_ns():020d}'
+
+    def _prune(self):
+        for path in self.generations()[self.keep_generations:]:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Formatage du code Python généré par black (API Python, sans sous-processus)
+
+- les résultats sont mis en cache par hash du contenu (et version/options de
+  black) : un fichier inchangé n'est jamais reformaté, d'une exécution à
+  l'autre avec le cache de rendu
+- les fichiers à formater sont répartis sur un pool de processus, le rendu
+  continuant pendant le formatage
+- sans black, repli sur ``CodeFormatter.format_python_code`` (nettoyage des
+  espaces)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_black = None
+
+
+def _import_black():
+    """Module black, ou None s'il n'est pas installé"""
+    global _black
+    if _black is None:
+        try:
+            import black
+        except ImportError:
+            _black = False
+        else:
+            _black = black
+    return _black or None
+
+
+def black_available() -> bool:
+    return _import_black() is not None
+
+
+def _warm_up_worker():
+    """Initialisation des processus du pool : import de black une fois pour toutes"""
+    _import_black()
+
+
+def format_python_source(source: str, line_length: int = 88) -> Tuple[str, Optional[str]]:
+    """Formate un source Python
+
+    Returns:
+        (source formaté, erreur) ; en cas d'erreur le source est rendu inchangé
+    """
+    black = _import_black()
+    if black is None:
+        from .formatters import CodeFormatter
+        return CodeFormatter.format_python_code(source), None
+    try:
+        return black.format_str(source, mode=black.Mode(line_length=line_length)), None
+    except Exception as e:  # black.InvalidInput, erreurs internes de black
+        return source, f"{type(e).__name__}: {e}"
+
+
+class PythonFormatterStats:
+    """Statistiques du formatage Python pour une génération"""
+
+    def __init__(self):
+        self.files = 0
+        self.cache_hits = 0
+        self.formatted = 0
+        self.failures = 0
+
+    def format_report(self) -> str:
+        """Formate les statistiques du formatage"""
+        rows = [
+            ('Fichiers', str(self.files)),
+            ('Cache / formatés', f"{self.cache_hits} / {self.formatted}"),
+        ]
+        if self.failures:
+            rows.append(('Échecs (non formatés)', str(self.failures)))
+        return '\n'.join(f"  {label:<28} {value}" for label, value in rows)
+
+
+class PythonFormatter:
+    """Passe de formatage Python, mise en cache et parallèle
+
+    Le pool de processus et le cache sont partagés ; chaque génération
+    soumet ses fichiers dans sa propre session.
+
+    Usage:
+        with PythonFormatter(cache=RenderCache(), workers=4) as formatter:
+            session = formatter.session()
+            session.submit('models/product.py', source)
+            for relative_path, content in session.drain():
+                ...
+    """
+
+    def __init__(self, cache=None, workers: int = None, line_length: int = 88):
+        """
+        Args:
+            cache: RenderCache où conserver les résultats entre exécutions
+                (sinon cache en mémoire pour l'exécution)
+            workers: Processus de formatage (défaut: nombre de CPU, 1 = dans ce processus)
+            line_length: Longueur de ligne de black
+        """
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.line_length = line_length
+        self.stats = PythonFormatterStats()
+        self._memory_cache: Dict[str, str] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._engine: Optional[str] = None
+
+    def __enter__(self) -> 'PythonFormatter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __getstate__(self):
+        # Copie envoyée aux workers d'un lot : formatage dans le worker (déjà parallèle)
+        state = self.__dict__.copy()
+        state.update(workers=1, stats=PythonFormatterStats(), _executor=None, _lock=None)
+        if self.cache is not None:
+            state['cache'] = (str(self.cache.cache_dir), self.cache.max_bytes, self.cache.compress)
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state.get('cache'), tuple):
+            from .render_cache import RenderCache
+            state['cache'] = RenderCache(*state['cache'])
+        state['_lock'] = threading.Lock()
+        self.__dict__.update(state)
+
+    @property
+    def engine(self) -> str:
+        """Moteur et options : partie de la clé de cache"""
+        if self._engine is None:
+            black = _import_black()
+            name = f"black-{black.__version__}" if black is not None else 'omg-basic'
+            self._engine = f"{name}-{self.line_length}"
+        return self._engine
+
+    def cache_key(self, source: str) -> str:
+        digest = hashlib.sha256(self.engine.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source.encode('utf-8'))
+        return 'py-' + digest.hexdigest()
+
+    def format(self, source: str) -> str:
+        """Formate un source dans ce processus (avec le cache)"""
+        key = self.cache_key(source)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        formatted, error = format_python_source(source, self.line_length)
+        self._store(key, formatted, error)
+        return formatted
+
+    def begin_run(self, cache=None):
+        """Réutilise le formateur pour une nouvelle génération (démon)
+
+        Le pool de processus et le cache en mémoire sont gardés ; le cache
+        persistant et les statistiques sont ceux de la génération.
+        """
+        self.cache = cache
+        self.stats = PythonFormatterStats()
+
+    def session(self) -> 'FormattingSession':
+        """Nouvelle session de soumission (une par génération)"""
+        return FormattingSession(self)
+
+    def close(self):
+        """Arrête le pool de processus"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _submit_to_pool(self, source: str) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up_worker)
+        return self._executor.submit(format_python_source, source, self.line_length)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        cached = self._memory_cache.get(key)
+        if cached is None and self.cache is not None:
+            cached = self.cache.get(key)
+        self._count(files=1, cache_hits=int(cached is not None))
+        return cached
+
+    def _store(self, key: str, formatted: str, error: Optional[str], relative_path: str = None):
+        if error is not None:
+            # Source invalide pour black : écrit tel quel, pas mis en cache
+            self._count(failures=1)
+            logger.warning(f"Formatage Python impossible{f' ({relative_path})' if relative_path else ''}: {error}")
+            return
+        self._count(formatted=1)
+        self._memory_cache[key] = formatted
+        if self.cache is not None:
+            self.cache.put(key, formatted)
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+
+class FormattingSession:
+    """Fichiers soumis par une génération, restitués une fois formatés"""
+
+    def __init__(self, formatter: PythonFormatter):
+        self.formatter = formatter
+        self._pending: List[Tuple[str, str, Future]] = []
+        self._completed: List[Tuple[str, str]] = []
+
+    def submit(self, relative_path: str, source: str):
+        """Confie un fichier au formatage (résultat via ``completed`` ou ``drain``)"""
+        formatter = self.formatter
+        key = formatter.cache_key(source)
+        cached = formatter._lookup(key)
+        if cached is not None:
+            self._completed.append((relative_path, cached))
+        elif formatter.workers <= 1:
+            formatted, error = format_python_source(source, formatter.line_length)
+            formatter._store(key, formatted, error, relative_path)
+            self._completed.append((relative_path, formatted))
+        else:
+            self._pending.append((relative_path, key, formatter._submit_to_pool(source)))
+
+    def completed(self) -> List[Tuple[str, str]]:
+        """Fichiers déjà formatés (sans attendre)"""
+        still_pending = []
+        for item in self._pending:
+            if item[2].done():
+                self._collect(*item)
+            else:
+                still_pending.append(item)
+        self._pending = still_pending
+        return self._take_completed()
+
+    def drain(self) -> List[Tuple[str, str]]:
+        """Attend et retourne tous les fichiers soumis"""
+        pending, self._pending = self._pending, []
+        for item in pending:
+            self._collect(*item)
+        return self._take_completed()
+
+    def discard(self):
+        """Abandonne les fichiers en cours (génération interrompue)"""
+        for _, _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        self._completed = []
+
+    def _take_completed(self) -> List[Tuple[str, str]]:
+        completed, self._completed = self._completed, []
+        return completed
+
+    def _collect(self, relative_path: str, key: str, future: Future):
+        formatted, error = future.result()
+        self.formatter._store(key, formatted, error, relative_path)
+        self._completed.append((relative_path, formatted))
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Cache persistant du rendu des modèles, adressé par contenu et partagé entre exécutions et projets
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import zlib
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+CACHE_DIR_ENV_VAR = 'OMG_CACHE_DIR'
+DISABLE_ENV_VAR = 'OMG_NO_CACHE'
+
+# En-têtes des entrées : contenu brut ou compressé zlib
+_RAW_HEADER = b'omg0'
+_ZLIB_HEADER = b'omgz'
+
+
+def cache_requested(enabled: bool = False, cache_dir: str = None, disabled: bool = False) -> bool:
+    """Cache persistant à utiliser ?
+
+    Opt-in : ``enabled`` (``--cache``), un dossier explicite ou $OMG_CACHE_DIR ;
+    ``disabled`` (``--no-cache``) et $OMG_NO_CACHE l'emportent.
+    """
+    if disabled or os.environ.get(DISABLE_ENV_VAR):
+        return False
+    return bool(enabled or cache_dir or os.environ.get(CACHE_DIR_ENV_VAR))
+
+
+def default_cache_dir() -> Path:
+    """Dossier du cache : $OMG_CACHE_DIR, sinon $XDG_CACHE_HOME/omg, sinon ~/.cache/omg"""
+    if os.environ.get(CACHE_DIR_ENV_VAR):
+        return Path(os.environ[CACHE_DIR_ENV_VAR])
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / 'omg'
+
+
+def canonicalize(value):
+    """Forme canonique sérialisable (configurations, enums, objets simples)"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(k): canonicalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(v) for v in value]
+    if hasattr(value, '__dict__'):
+        return {'__type__': type(value).__name__, **canonicalize(vars(value))}
+    return value
+
+
+class RenderCacheStats:
+    """Statistiques d'utilisation du cache pour une génération"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.errors = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def format_report(self) -> str:
+        """Formate les statistiques du cache"""
+        from .file_manager import FileManager
+
+        rows = [
+            ('Hits / misses', f"{self.hits} / {self.misses} ({self.hit_rate:.0%})"),
+            ('Lu depuis le cache', FileManager.format_file_size(self.bytes_read)),
+            ('Écrit dans le cache', f"{self.writes} entrée(s), {FileManager.format_file_size(self.bytes_written)}"),
+            ('Évictions', str(self.evictions)),
+        ]
+        if self.errors:
+            rows.append(('Erreurs ignorées', str(self.errors)))
+        return '\n'.join(f"  {label:<28} {value}" for label, value in rows)
+
+
+class RenderCache:
+    """Cache disque adressé par contenu des fichiers rendus par les constructeurs
+
+    La clé est le hash canonique de (constructeur, version du template,
+    configuration normalisée). La version du template est l'empreinte du
+    fichier source du constructeur : toute modification des templates
+    invalide ses entrées.
+
+    - écritures atomiques (fichier temporaire + ``os.replace``) : plusieurs
+      jobs CI peuvent partager le même dossier
+    - éviction LRU (date d'accès mise à jour à chaque hit) au-delà de ``max_bytes``
+    - compression zlib optionnelle
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 512 * 1024 * 1024,
+                 compress: bool = True):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.entries_dir = self.cache_dir / 'render'
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.stats = RenderCacheStats()
+        self._builder_versions: Dict[type, str] = {}
+        self._lock = threading.Lock()
+        self._writes_at_last_check = 0
+
+    def builder_version(self, builder) -> str:
+        """Version des templates d'un constructeur (empreinte de son fichier source)"""
+        builder_type = type(builder)
+        version = self._builder_versions.get(builder_type)
+        if version is None:
+            from .. import __version__
+
+            digest = hashlib.sha256(__version__.encode('utf-8'))
+            source_file = getattr(sys.modules.get(builder_type.__module__), '__file__', None)
+            if source_file and os.path.exists(source_file):
+                with open(source_file, 'rb') as f:
+                    digest.update(f.read())
+            version = digest.hexdigest()[:16]
+            self._builder_versions[builder_type] = version
+        return version
+
+    def make_key(self, builder, method: str, *inputs) -> str:
+        """Clé canonique d'un rendu"""
+        payload = json.dumps({
+            'builder': f"{type(builder).__module__}.{type(builder).__qualname__}.{method}",
+            'template_version': self.builder_version(builder),
+            'inputs': canonicalize(list(inputs)),
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def render(self, builder, method: str, *inputs) -> str:
+        """Retourne le rendu de ``builder.method(*inputs)`` depuis le cache ou le calcule"""
+        key = self.make_key(builder, method, *inputs)
+        content = self.get(key)
+        if content is None:
+            content = getattr(builder, method)(*inputs)
+            self.put(key, content)
+        return content
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[str]:
+        """Lit une entrée (None si absente ou illisible)"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            header, payload = data[:4], data[4:]
+            if header == _ZLIB_HEADER:
+                payload = zlib.decompress(payload)
+            elif header != _RAW_HEADER:
+                raise ValueError(f"Entrée de cache corrompue: {path}")
+            content = payload.decode('utf-8')
+            # Date d'accès pour l'éviction LRU (atime n'est pas fiable: noatime/relatime)
+            os.utime(path)
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+        except (OSError, ValueError, zlib.error):
+            self._count(misses=1, errors=1)
+            return None
+        self._count(hits=1, bytes_read=len(data))
+        return content
+
+    def put(self, key: str, content: str):
+        """Écrit une entrée de façon atomique ; les erreurs d'écriture sont ignorées"""
+        payload = content.encode('utf-8')
+        data = _ZLIB_HEADER + zlib.compress(payload) if self.compress else _RAW_HEADER + payload
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # Cache en lecture seule ou disque plein : la génération continue
+            self._count(errors=1)
+            return
+        self._count(writes=1, bytes_written=len(data))
+
+    def _iter_entries(self):
+        """Parcourt les entrées : (date d'accès, taille, chemin)"""
+        if not self.entries_dir.is_dir():
+            return
+        for shard in os.scandir(self.entries_dir):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue  # évincée par un autre processus
+                yield stat.st_mtime, stat.st_size, entry.path
+
+    def usage(self) -> Tuple[int, int]:
+        """Nombre d'entrées et taille totale du cache"""
+        entries = list(self._iter_entries())
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def enforce_limit(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de ``max_bytes``"""
+        # Le cache ne grossit que par nos écritures : rien à faire sans écriture nouvelle
+        if self.stats.writes == self._writes_at_last_check:
+            return
+        self._writes_at_last_check = self.stats.writes
+
+        entries = sorted(self._iter_entries())
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        # Marge de 10% pour ne pas évincer à chaque génération
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                self._count(evictions=1)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> int:
+        """Vide le cache et retourne le nombre d'entrées supprimées"""
+        removed = 0
+        for _, _, path in list(self._iter_entries()):
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Mesure des temps de génération par étape (`omg generate --timings`)
+"""
+
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+
+class GenerationTimings:
+    """Chronomètre les étapes de generate_module
+
+    Même interface d'étapes que MemoryProfiler (``start_stage``/``end_stage``).
+    Les composants de la génération (pipeline d'écriture, caches...) peuvent
+    y attacher leurs statistiques avec ``attach``.
+    """
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self.details = OrderedDict()
+        self._stage_started = None
+
+    def start_stage(self, name: str):
+        """Marque le début d'une étape"""
+        self._stage_started = time.perf_counter()
+
+    def end_stage(self, name: str) -> float:
+        """Marque la fin d'une étape et retourne sa durée"""
+        duration = time.perf_counter() - self._stage_started
+        self.stages.append((name, duration))
+        self._stage_started = None
+        return duration
+
+    def attach(self, title: str, stats):
+        """Attache des statistiques (objet avec ``format_report()``) au rapport"""
+        self.details[title] = stats
+
+    @property
+    def total(self) -> float:
+        return sum(duration for _, duration in self.stages)
+
+    def format_report(self) -> str:
+        """Formate le rapport des temps par étape"""
+        lines = [f"{'Étape':<14} {'Temps':>10}"]
+        for name, duration in self.stages:
+            lines.append(f"{name:<14} {duration:>9.3f}s")
+        lines.append(f"{'total':<14} {self.total:>9.3f}s")
+
+        for title, stats in self.details.items():
+            lines.append(f"\n{title}:")
+            lines.append(stats.format_report())
+
+        return '\n'.join(lines)
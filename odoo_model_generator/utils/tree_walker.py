@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Parcours d'arborescence basé sur ``os.scandir``
+
+Parcours itératif (pas de récursion) qui réutilise les informations des
+``DirEntry`` : type lu dans le dossier, ``stat()`` mis en cache par l'entrée.
+Utilisé par ``FileManager.get_directory_size``, ``FileManager.list_files`` et
+l'affichage de l'arborescence de la CLI, sur des dossiers d'addons de
+centaines de milliers de fichiers.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Callable, Iterator, List, Optional, Tuple
+
+EntryFilter = Callable[[os.DirEntry], bool]
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    """Dossier réel (les liens vers des dossiers ne sont pas parcourus)"""
+    try:
+        return entry.is_dir(follow_symlinks=False)
+    except OSError:
+        return False
+
+
+def _is_file(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _list_dir(path: str, skip_hidden: bool, sort_key) -> List[os.DirEntry]:
+    try:
+        with os.scandir(path) as iterator:
+            entries = [entry for entry in iterator if not (skip_hidden and entry.name.startswith('.'))]
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+    if sort_key is not None:
+        entries.sort(key=sort_key)
+    return entries
+
+
+def scan_tree(root: str, max_depth: int = None, skip_hidden: bool = False,
+              sort_key: Callable[[os.DirEntry], object] = None,
+              descend: EntryFilter = None) -> Iterator[Tuple[os.DirEntry, int, bool]]:
+    """Parcourt une arborescence en profondeur (ordre préfixe)
+
+    Args:
+        root: Dossier racine (non produit lui-même)
+        max_depth: Profondeur maximale (1 = contenu direct de ``root``)
+        skip_hidden: Ignore les entrées commençant par '.'
+        sort_key: Tri des entrées de chaque dossier (défaut: ordre du système)
+        descend: Filtre des dossiers à parcourir (ils sont produits dans tous les cas)
+
+    Returns:
+        Itérateur de (entrée, profondeur, dernière entrée de son dossier ?)
+    """
+    # Pile de (entrées d'un dossier, index de la prochaine, profondeur)
+    stack = [(_list_dir(os.fspath(root), skip_hidden, sort_key), 0, 1)]
+    while stack:
+        entries, index, depth = stack[-1]
+        if index >= len(entries):
+            stack.pop()
+            continue
+        stack[-1] = (entries, index + 1, depth)
+        entry = entries[index]
+        yield entry, depth, index == len(entries) - 1
+
+        if (max_depth is None or depth < max_depth) and _is_dir(entry) \
+                and (descend is None or descend(entry)):
+            stack.append((_list_dir(entry.path, skip_hidden, sort_key), 0, depth + 1))
+
+
+def iter_files(root: str, pattern: str = None, max_depth: int = None, skip_hidden: bool = False,
+               workers: int = 1) -> Iterator[os.DirEntry]:
+    """Fichiers d'une arborescence, filtrés par motif glob
+
+    Args:
+        root: Dossier racine
+        pattern: Motif sur le nom (``*.py``) ou, s'il contient '/', sur le
+            chemin relatif à n'importe quelle profondeur (``models/*.py``)
+        max_depth: Profondeur maximale (1 = contenu direct de ``root``)
+        skip_hidden: Ignore les entrées commençant par '.'
+        workers: Threads parcourant les sous-dossiers de premier niveau en
+            parallèle (l'ordre des fichiers n'est alors pas garanti)
+
+    Returns:
+        Itérateur de ``os.DirEntry`` (``stat()`` mis en cache)
+    """
+    root = os.fspath(root)
+    matches = _pattern_matcher(root, pattern)
+
+    if workers <= 1 or max_depth == 1:
+        for entry, _, _ in scan_tree(root, max_depth, skip_hidden):
+            if _is_file(entry) and matches(entry):
+                yield entry
+        return
+
+    subdirectories = []
+    for entry in _list_dir(root, skip_hidden, None):
+        if _is_dir(entry):
+            subdirectories.append(entry.path)
+        elif _is_file(entry) and matches(entry):
+            yield entry
+
+    sub_depth = None if max_depth is None else max_depth - 1
+
+    def scan_subdirectory(path: str) -> List[os.DirEntry]:
+        return [entry for entry, _, _ in scan_tree(path, sub_depth, skip_hidden)
+                if _is_file(entry) and matches(entry)]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='omg-walk') as executor:
+        for files in executor.map(scan_subdirectory, subdirectories):
+            yield from files
+
+
+def _pattern_matcher(root: str, pattern: Optional[str]) -> EntryFilter:
+    if not pattern or pattern == '*':
+        return lambda entry: True
+    if '/' not in pattern:
+        return lambda entry: fnmatchcase(entry.name, pattern)
+
+    prefix_length = len(root.rstrip(os.sep)) + 1
+
+    def matches(entry: os.DirEntry) -> bool:
+        relative_path = entry.path[prefix_length:].replace(os.sep, '/')
+        return fnmatchcase(relative_path, pattern) or fnmatchcase(relative_path, f'*/{pattern}')
+    return matches
+
+
+def _total_size(entries) -> int:
+    total = 0
+    for entry in entries:
+        try:
+            total += entry.stat().st_size
+        except OSError:
+            pass  # supprimé pendant le parcours
+    return total
+
+
+def directory_size(root: str, workers: int = 1) -> int:
+    """Taille cumulée des fichiers d'une arborescence (liens suivis pour les fichiers)
+
+    Avec ``workers`` > 1, chaque sous-dossier de premier niveau est parcouru
+    et mesuré (``stat``) dans son propre thread.
+    """
+    root = os.fspath(root)
+    if workers <= 1:
+        return _total_size(iter_files(root))
+
+    top_level_files, subdirectories = [], []
+    for entry in _list_dir(root, False, None):
+        if _is_dir(entry):
+            subdirectories.append(entry.path)
+        elif _is_file(entry):
+            top_level_files.append(entry)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='omg-walk') as executor:
+        subtree_sizes = executor.map(lambda path: _total_size(iter_files(path)), subdirectories)
+        return _total_size(top_level_files) + sum(subtree_sizes)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Mise en forme XML en flux, en une seule passe
+
+Le texte est découpé en jetons (balises, texte, commentaires, CDATA,
+instructions de traitement, DOCTYPE) au fil des morceaux lus : un fichier de
+plusieurs centaines de Mo (données de démonstration) est reformaté sans être
+chargé en entier.
+
+Règles de mise en forme :
+
+- chaque balise commence une ligne, indentée selon sa profondeur ; les
+  attributs répartis sur plusieurs lignes gardent leur alignement relatif
+- un élément vide ouvert puis fermé reste sur une ligne
+- dès qu'un élément contient du texte (ou un CDATA), son contenu est recopié
+  tel quel jusqu'à sa fermeture : ``<field name="name">Produit</field>`` reste
+  sur une ligne et le code Python d'un ``<field name="code">`` est préservé
+"""
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Jetons formatés regroupés par morceau produit
+_OUTPUT_BATCH = 4096
+
+# Un jeton par alternative ; une balise n'est pas terminée par un '>' entre guillemets
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<text>[^<]+)
+  | (?P<comment><!--.*?-->)
+  | (?P<cdata><!\[CDATA\[.*?\]\]>)
+  | (?P<pi><\?.*?\?>)
+  | (?P<doctype><!(?!--|\[CDATA\[)(?:[^>\[]|\[[^\]]*\])*>)
+  | (?P<tag><(?![!?])(?:[^>"']|"[^"]*"|'[^']*')*>)
+""", re.DOTALL | re.VERBOSE)
+
+
+def iter_xml_tokens(chunks: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Découpe un flux XML en jetons
+
+    Args:
+        chunks: Morceaux de texte successifs (découpage quelconque)
+
+    Returns:
+        Itérateur de (type, texte) ; type parmi 'text', 'open', 'close',
+        'empty', 'comment', 'cdata', 'pi', 'doctype'. La concaténation des
+        textes redonne exactement l'entrée.
+    """
+    chunks = iter(chunks)
+    buffer, position, eof = '', 0, False
+    match_token = _TOKEN_PATTERN.match
+
+    while True:
+        length = len(buffer)
+        while position < length:
+            match = match_token(buffer, position)
+            # Un jeton qui atteint la fin du tampon peut se poursuivre dans le morceau suivant
+            if match is None or (match.end() == length and not eof):
+                if not eof:
+                    break
+                # Balise mal formée en fin de flux : rendue comme du texte
+                yield 'text', buffer[position:]
+                return
+            kind = match.lastgroup
+            token = match.group()
+            if kind == 'tag':
+                kind = 'close' if token[1] == '/' else ('empty' if token[-2] == '/' else 'open')
+            yield kind, token
+            position = match.end()
+        else:
+            if eof:
+                return
+
+        # Jeton incomplet : lecture d'au moins autant que le reste du tampon,
+        # pour que les recherches répétées restent linéaires au total
+        remainder = buffer[position:]
+        parts, wanted = [remainder], max(len(remainder), 1)
+        while wanted > 0:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                break
+            parts.append(chunk)
+            wanted -= len(chunk)
+        buffer, position = ''.join(parts), 0
+
+
+class XmlPrettyPrinter:
+    """Réindente un flux XML (cf. règles du module)
+
+    Usage:
+        printer = XmlPrettyPrinter(indent='    ')
+        formatted = ''.join(printer.format_chunks([xml_code]))
+    """
+
+    def __init__(self, indent: str = '    '):
+        self.indent = indent
+
+    def format_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Met en forme un flux XML morceau par morceau
+
+        Returns:
+            Itérateur de morceaux de texte formaté (se terminant par un saut de ligne)
+        """
+        # Pour chaque élément ouvert : contenu recopié tel quel ?
+        verbatim_stack: List[bool] = []
+        pending_whitespace = ''
+        source_column = 0
+        just_opened = False
+        newline = ''  # '\n' dès que quelque chose a été produit
+        # Morceaux produits par paquets : un appel par jeton coûterait plus que le jeton
+        output: List[str] = []
+        emit = output.append
+
+        for kind, token in iter_xml_tokens(chunks):
+            token_column = source_column
+            last_newline = token.rfind('\n')
+            source_column = len(token) - last_newline - 1 if last_newline != -1 else source_column + len(token)
+            if len(output) >= _OUTPUT_BATCH:
+                yield ''.join(output)
+                output.clear()
+
+            if verbatim_stack and verbatim_stack[-1]:
+                emit(pending_whitespace)
+                emit(token)
+                pending_whitespace = ''
+                if kind == 'open':
+                    verbatim_stack.append(True)
+                elif kind == 'close':
+                    verbatim_stack.pop()
+                    just_opened = False
+                continue
+
+            if kind == 'text' and token.isspace():
+                pending_whitespace = token
+                continue
+
+            if kind == 'text' or kind == 'cdata':
+                if verbatim_stack:
+                    # Contenu textuel : l'élément est recopié tel quel jusqu'à sa fermeture
+                    verbatim_stack[-1] = True
+                    emit(pending_whitespace)
+                    emit(token)
+                else:
+                    emit(newline)
+                    emit(token.strip())
+                pending_whitespace = ''
+                newline = '\n'
+                continue
+
+            pending_whitespace = ''
+            if kind == 'close':
+                if verbatim_stack:
+                    verbatim_stack.pop()
+                if just_opened:
+                    emit(token)
+                    just_opened = False
+                    continue
+
+            prefix = self.indent * len(verbatim_stack)
+            if last_newline != -1:
+                token = self._reindent(token, token_column, len(prefix))
+            emit(newline)
+            emit(prefix)
+            emit(token)
+            newline = '\n'
+            just_opened = kind == 'open'
+            if just_opened:
+                verbatim_stack.append(False)
+
+        emit(newline)
+        yield ''.join(output)
+
+    @staticmethod
+    def _reindent(token: str, source_column: int, column: int) -> str:
+        """Décale les lignes de continuation d'un jeton multi-ligne comme sa première ligne"""
+        if source_column == column:
+            return token
+        lines = token.split('\n')
+        shift = column - source_column
+        for i in range(1, len(lines)):
+            line = lines[i]
+            if shift > 0:
+                lines[i] = ' ' * shift + line if line.strip() else line
+            else:
+                removable = len(line) - len(line.lstrip(' '))
+                lines[i] = line[min(removable, -shift):]
+        return '\n'.join(lines)
+
+
+def format_xml(xml_code: str, indent: str = '    ') -> str:
+    """Met en forme un document XML en mémoire"""
+    return ''.join(XmlPrettyPrinter(indent).format_chunks([xml_code]))
+
+
+def format_xml_file(source: Union[str, Path], destination: Union[str, Path] = None,
+                    indent: str = '    ', chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Met en forme un fichier XML en flux (mémoire bornée quelle que soit sa taille)
+
+    Args:
+        source: Fichier à formater
+        destination: Fichier produit (défaut: ``source``, remplacé atomiquement)
+        chunk_size: Taille des morceaux lus
+
+    Returns:
+        Chemin du fichier formaté
+    """
+    source = Path(source)
+    destination = Path(destination) if destination else source
+    fd, tmp_path = tempfile.mkstemp(dir=destination.parent, prefix=f'.{destination.name}.', suffix='.tmp')
+    try:
+        if source.exists():
+            os.chmod(tmp_path, source.stat().st_mode & 0o7777)
+        with open(source, 'r', encoding='utf-8') as reader, \
+                os.fdopen(fd, 'w', encoding='utf-8') as writer:
+            chunks = iter(lambda: reader.read(chunk_size), '')
+            for formatted in XmlPrettyPrinter(indent).format_chunks(chunks):
+                writer.write(formatted)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return str(destination)
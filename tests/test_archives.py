@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Archives reproductibles : deux générations d'un module inchangé donnent les mêmes octets
+"""
+
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from odoo_model_generator.core.generator import OdooModelGenerator
+from odoo_model_generator.utils.archives import DEFAULT_EPOCH, reproducible_mtime
+from odoo_model_generator.utils.file_manager import FileManager
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_FILE = PROJECT_ROOT / 'examples' / 'config_examples' / 'product_config.yaml'
+
+
+def _generate(output_dir: Path, mtime: int) -> Path:
+    generator = OdooModelGenerator()
+    module_path = Path(generator.generate_module(
+        generator._load_config_file(str(CONFIG_FILE)), str(output_dir), 'product_module'))
+    for directory, _, file_names in os.walk(module_path):
+        for name in file_names:
+            os.utime(Path(directory) / name, (mtime, mtime))
+    return module_path
+
+
+@pytest.mark.parametrize('format_type', ['tar.gz', 'zip'])
+def test_identical_bytes_across_runs(tmp_path, format_type):
+    first = _generate(tmp_path / 'run1', 1_600_000_000)
+    second = _generate(tmp_path / 'run2', 1_700_000_000)
+    os.chmod(second / '__manifest__.py', 0o664)
+
+    assert FileManager.create_archive(str(first), str(tmp_path / f'a.{format_type}'), format_type, reproducible=True)
+    assert FileManager.create_archive(str(second), str(tmp_path / f'b.{format_type}'), format_type, reproducible=True)
+
+    assert (tmp_path / f'a.{format_type}').read_bytes() == (tmp_path / f'b.{format_type}').read_bytes()
+
+
+def test_module_package_normalizes_metadata(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    module_path = _generate(tmp_path, 1_600_000_000)
+
+    package = OdooModelGenerator().module_builder.create_module_package(str(module_path), reproducible=True)
+
+    with tarfile.open(package) as tar:
+        members = tar.getmembers()
+    names = [member.name for member in members]
+    assert names[0] == 'product_module'
+    assert names == sorted(names, key=lambda name: name.split('/'))
+    assert {member.mtime for member in members} == {1_700_000_000}
+    assert {(member.uid, member.gid, member.uname, member.gname) for member in members} == {(0, 0, '', '')}
+    assert {member.mode for member in members if member.isfile()} == {0o644}
+    # En-tête gzip : date (octets 4-7) à zéro
+    assert Path(package).read_bytes()[4:8] == b'\0\0\0\0'
+
+
+def test_zip_dates_clamped_to_1980(tmp_path, monkeypatch):
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+    assert reproducible_mtime(0) == DEFAULT_EPOCH
+    module_path = _generate(tmp_path, 1_600_000_000)
+    archive = tmp_path / 'module.zip'
+    FileManager.create_archive(str(module_path), str(archive), 'zip', reproducible=True)
+
+    with zipfile.ZipFile(archive) as zipf:
+        assert {info.date_time for info in zipf.infolist()} == {(1980, 1, 1, 0, 0, 0)}
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Magasin d'assets : fichiers static/ stockés une fois et liés dans chaque module
+"""
+
+import errno
+import os
+from pathlib import Path
+
+from odoo_model_generator.core.generator import OdooModelGenerator
+from odoo_model_generator.utils.archives import write_tar
+from odoo_model_generator.utils.asset_store import AssetStore
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_FILE = PROJECT_ROOT / 'examples' / 'config_examples' / 'product_config.yaml'
+
+
+def _generate(output, module_name, store=None):
+    generator = OdooModelGenerator()
+    config_data = generator._load_config_file(str(CONFIG_FILE))
+    return Path(generator.generate_module(config_data, str(output), module_name, {'asset_store': store}))
+
+
+def test_hardlinked_assets_written_once(tmp_path):
+    store = AssetStore(tmp_path / 'store')
+    first = _generate(tmp_path / 'out', 'module_a', store)
+    second = _generate(tmp_path / 'out', 'module_b', store)
+
+    icon_a = first / 'static' / 'description' / 'icon.svg'
+    icon_b = second / 'static' / 'description' / 'icon.svg'
+    assert os.path.samefile(icon_a, icon_b)
+    assert icon_a.stat().st_nlink == 3
+    # Même configuration : les 4 fichiers static/ (icône, description, CSS, JS) sont communs
+    assert store.stats.blobs_written == 4
+    assert store.stats.hardlinks == 8
+    assert (first / '__manifest__.py').stat().st_nlink == 1
+
+
+def test_symlink_mode(tmp_path):
+    store = AssetStore(tmp_path / 'store', link_mode='symlink')
+    module = _generate(tmp_path / 'out', 'module_a', store)
+
+    css = module / 'static' / 'src' / 'css' / 'module.css'
+    assert css.is_symlink()
+    assert Path(os.readlink(css)).parent.parent == (tmp_path / 'store' / 'objects').resolve()
+
+
+def test_copy_fallback_across_filesystems(tmp_path, monkeypatch):
+    def cross_device_link(source, target):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    monkeypatch.setattr(os, 'link', cross_device_link)
+    store = AssetStore(tmp_path / 'store')
+    module = _generate(tmp_path / 'out', 'module_a', store)
+
+    icon = module / 'static' / 'description' / 'icon.svg'
+    assert icon.stat().st_nlink == 1
+    assert store.stats.copies == 4 and store.stats.hardlinks == 0
+
+
+def test_regeneration_does_not_write_through_links(tmp_path):
+    store = AssetStore(tmp_path / 'store')
+    module = _generate(tmp_path / 'out', 'module_a', store)
+    icon = module / 'static' / 'description' / 'icon.svg'
+    blob = store.put(icon.read_bytes())
+
+    OdooModelGenerator().module_builder._write_file(icon, '<svg/>')
+
+    assert icon.read_text(encoding='utf-8') == '<svg/>'
+    assert blob.read_bytes() != b'<svg/>'
+
+
+def test_archives_identical_with_and_without_store(tmp_path):
+    linked = _generate(tmp_path / 'linked', 'module_a', AssetStore(tmp_path / 'store', link_mode='symlink'))
+    plain = _generate(tmp_path / 'plain', 'module_a')
+
+    write_tar(linked, tmp_path / 'linked.tar.gz', reproducible=True)
+    write_tar(plain, tmp_path / 'plain.tar.gz', reproducible=True)
+
+    assert (tmp_path / 'linked.tar.gz').read_bytes() == (tmp_path / 'plain.tar.gz').read_bytes()
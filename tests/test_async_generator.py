@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Équivalence de sortie entre AsyncOdooModelGenerator et OdooModelGenerator
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from odoo_model_generator import AsyncOdooModelGenerator, OdooModelGenerator
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CRM_CONFIG = PROJECT_ROOT / 'examples' / 'config_examples' / 'crm_config.json'
+
+
+def _read_tree(root: Path):
+    return {str(path.relative_to(root)): path.read_bytes()
+            for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_async_output_matches_sync(tmp_path, use_processes):
+    config_data = json.loads(CRM_CONFIG.read_text(encoding='utf-8'))
+
+    sync_path = OdooModelGenerator().generate_module(config_data, str(tmp_path / 'sync'), 'crm_module')
+
+    async def generate():
+        async with AsyncOdooModelGenerator(max_workers=2, use_processes=use_processes) as generator:
+            return await generator.generate_module_async(config_data, str(tmp_path / 'async'), 'crm_module')
+
+    async_path = asyncio.run(generate())
+
+    assert _read_tree(Path(async_path)) == _read_tree(Path(sync_path))
+
+
+def test_iter_module_files_async_order_matches_sync():
+    config_data = json.loads(CRM_CONFIG.read_text(encoding='utf-8'))
+    expected = list(OdooModelGenerator().iter_module_files(config_data, 'crm_module'))
+
+    async def collect():
+        async with AsyncOdooModelGenerator(use_processes=False, max_pending=2) as generator:
+            return [entry async for entry in generator.iter_module_files_async(config_data, 'crm_module')]
+
+    assert asyncio.run(collect()) == expected
+
+
+def test_cancellation_propagates(tmp_path):
+    config_data = json.loads(CRM_CONFIG.read_text(encoding='utf-8'))
+
+    async def generate_and_cancel():
+        async with AsyncOdooModelGenerator(use_processes=False) as generator:
+            task = asyncio.ensure_future(
+                generator.generate_module_async(config_data, str(tmp_path), 'crm_module'))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(generate_and_cancel())
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Génération par lots : ordonnancement et isolation des échecs
+"""
+
+import shutil
+from pathlib import Path
+
+from odoo_model_generator.core.batch import BatchGenerator, BatchJob
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_EXAMPLES = PROJECT_ROOT / 'examples' / 'config_examples'
+
+
+def test_jobs_sorted_longest_first():
+    jobs = [BatchJob('small', estimated_cost=2), BatchJob('large', estimated_cost=40),
+            BatchJob('medium', estimated_cost=10)]
+    assert [job.module_name for job in BatchGenerator.sort_jobs(jobs)] == ['large', 'medium', 'small']
+
+
+def test_bad_config_does_not_abort_batch(tmp_path):
+    configs = tmp_path / 'configs'
+    configs.mkdir()
+    for config in CONFIG_EXAMPLES.iterdir():
+        shutil.copy(config, configs)
+    (configs / 'broken.yaml').write_text('models: [\n', encoding='utf-8')
+    (configs / 'notes.txt').write_text('ignoré', encoding='utf-8')
+
+    batch = BatchGenerator(jobs=2, use_processes=False)
+    config_paths = batch.discover_configs(str(configs))
+    assert [path.name for path in config_paths] == ['broken.yaml', 'crm_config.json', 'product_config.yaml']
+
+    report = batch.run(batch.plan(config_paths), str(tmp_path / 'out'))
+
+    assert [result.job.module_name for result in report.failed] == ['broken']
+    assert len(report.succeeded) == 2
+    for result in report.succeeded:
+        assert (Path(result.module_path) / '__manifest__.py').is_file()
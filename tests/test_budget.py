@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Budgets de génération : limites vérifiées entre les étapes et annulation coopérative
+"""
+
+import pytest
+
+from odoo_model_generator.core.budget import (CancellationToken, GenerationBudget,
+                                              GenerationBudgetExceeded, GenerationCancelled)
+from odoo_model_generator.core.generator import OdooModelGenerator
+
+
+def _config(model_count, field_count=3):
+    return {
+        'module': {'name': 'budget_test'},
+        'models': [{
+            'name': f'budget.model{i}',
+            'description': f'Modèle {i}',
+            'fields': [{'name': f'field_{j}', 'type': 'char', 'string': f'Champ {j}'}
+                       for j in range(field_count)],
+        } for i in range(model_count)],
+    }
+
+
+def test_too_many_fields_rejected_after_parse(tmp_path):
+    budget = GenerationBudget(max_fields=50)
+    with pytest.raises(GenerationBudgetExceeded) as info:
+        OdooModelGenerator().generate_module(_config(5, 20), str(tmp_path), 'budget_test', {'budget': budget})
+
+    assert info.value.limit == 'fields'
+    assert info.value.maximum == 50
+    assert info.value.stage == 'parse'
+    assert not (tmp_path / 'budget_test').exists()
+
+
+def test_output_limit_stops_rendering(tmp_path):
+    budget = GenerationBudget(max_output_bytes=20000)
+    with pytest.raises(GenerationBudgetExceeded) as info:
+        OdooModelGenerator().generate_module(_config(30), str(tmp_path), 'budget_test', {'budget': budget})
+
+    assert info.value.limit == 'output_bytes'
+    assert info.value.value > 20000
+    # Temps partiels : étapes terminées puis étape interrompue
+    assert [name for name, _ in info.value.timings][:3] == ['parse', 'validate', 'structure']
+    assert info.value.timings[-1][0] == info.value.stage
+
+
+def test_cancelled_token_checked_per_model(tmp_path):
+    token = CancellationToken()
+    generator = OdooModelGenerator()
+    rendered = []
+
+    def render_and_cancel(model, options):
+        rendered.append(model.name)
+        token.cancel('client déconnecté')
+        return OdooModelGenerator._render_model_files(generator, model, options)
+
+    generator._render_model_files = render_and_cancel
+    budget = GenerationBudget(token=token)
+    with pytest.raises(GenerationCancelled) as info:
+        generator.generate_module(_config(5), str(tmp_path), 'budget_test', {'budget': budget})
+
+    assert rendered == ['budget.model0']
+    assert info.value.limit == 'cancelled'
+    assert 'client déconnecté' in str(info.value)
+
+
+def test_streaming_render_respects_deadline():
+    budget = GenerationBudget(timeout=0)
+    files = OdooModelGenerator().iter_module_files(_config(3), 'budget_test', {'budget': budget})
+    with pytest.raises(GenerationBudgetExceeded) as info:
+        list(files)
+    assert info.value.limit == 'deadline'
+
+
+def test_generation_within_budget(tmp_path):
+    budget = GenerationBudget(max_models=10, max_fields=100, max_output_bytes=10 * 1024 * 1024, timeout=60)
+    module_path = OdooModelGenerator().generate_module(
+        _config(3), str(tmp_path), 'budget_test', {'budget': budget})
+
+    assert (tmp_path / 'budget_test' / '__manifest__.py').is_file()
+    assert module_path.endswith('budget_test')
+    assert 0 < budget.output_bytes
+    assert [name for name, _ in budget.stages][-1] == 'check'
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Démon de génération (omg daemon) : transmission des commandes par la CLI, variables
+d'environnement du client, logs, exécution locale sans démon, refus d'une autre version
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from odoo_model_generator.cli import cli
+from odoo_model_generator.service.daemon import DaemonClient, SOCKET_ENV_VAR
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='sockets Unix indisponibles')
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CRM_CONFIG = PROJECT_ROOT / 'examples' / 'config_examples' / 'crm_config.json'
+
+# Variables qui feraient exécuter la CLI localement ou changeraient le cache
+_CLEARED_ENV_VARS = ('OMG_NO_DAEMON', 'OMG_CACHE_DIR', 'OMG_NO_CACHE', SOCKET_ENV_VAR)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Démon lancé dans un sous-processus sur un socket temporaire"""
+    socket_path = str(tmp_path / 'omg.sock')
+    env = {name: value for name, value in os.environ.items() if name not in _CLEARED_ENV_VARS}
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get('PYTHONPATH')]))
+    log_path = tmp_path / 'daemon.log'
+    with open(log_path, 'wb') as log_file:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'odoo_model_generator.cli', 'daemon', '--socket', socket_path],
+            cwd=str(tmp_path), env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    client = DaemonClient(socket_path)
+    try:
+        deadline = time.monotonic() + 30
+        while client.ping() is None:
+            assert process.poll() is None, log_path.read_text(encoding='utf-8')
+            assert time.monotonic() < deadline, 'démon non démarré'
+            time.sleep(0.1)
+        yield socket_path, client, log_path
+    finally:
+        client.shutdown()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _generate(tmp_path, socket_path, **env):
+    result = CliRunner().invoke(cli, [
+        'generate', '-c', str(CRM_CONFIG), '-o', str(tmp_path / 'out'), '-n', 'crm_module',
+    ], env={SOCKET_ENV_VAR: socket_path, 'OMG_NO_DAEMON': None, 'OMG_CACHE_DIR': None,
+            'OMG_NO_CACHE': None, **env})
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_generate_forwarded_to_daemon(tmp_path, daemon):
+    socket_path, client, log_path = daemon
+    served = client.ping()['requests_served']
+
+    result = _generate(tmp_path, socket_path)
+
+    assert (tmp_path / 'out' / 'crm_module' / '__manifest__.py').is_file()
+    assert client.ping()['requests_served'] == served + 1
+    # Logs de la commande : une fois dans la réponse, pas sur le terminal du démon
+    assert result.output.count("Démarrage de la génération du module 'crm_module'") == 1
+    assert 'Démarrage de la génération' not in log_path.read_text(encoding='utf-8')
+
+
+def test_client_environment_forwarded(tmp_path, daemon):
+    socket_path, _, _ = daemon
+    cache_dir = tmp_path / 'cache'
+
+    _generate(tmp_path, socket_path, OMG_CACHE_DIR=str(cache_dir))
+
+    assert cache_dir.is_dir() and any(path.is_file() for path in cache_dir.rglob('*'))
+
+
+def test_local_fallback_without_daemon(tmp_path):
+    socket_path = str(tmp_path / 'absent.sock')
+    assert DaemonClient(socket_path).request('ping') is None
+
+    _generate(tmp_path, socket_path)
+    assert (tmp_path / 'out' / 'crm_module' / '__manifest__.py').is_file()
+
+
+def test_other_version_rejected(tmp_path, daemon):
+    socket_path, _, _ = daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({'command': 'ping', 'version': '0.0.0'}).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as stream:
+            response = json.loads(stream.readline().decode('utf-8'))
+    assert response['error'] == 'version'
+
+    from odoo_model_generator.service import daemon as daemon_module
+    original_version = daemon_module.__version__
+    daemon_module.__version__ = '0.0.0'
+    try:
+        assert DaemonClient(socket_path).request('ping') is None
+    finally:
+        daemon_module.__version__ = original_version
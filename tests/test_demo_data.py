@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Données de démo en volume : déterminisme, production par morceaux, couverture des types, format CSV,
+générateurs de colonnes, cohérence des relations
+"""
+
+import ast
+import csv
+import io
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import pytest
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.config.field_types import FieldConfig, FieldType, ModelConfig
+from odoo_model_generator.core.demo_data import DemoCsvContent, DemoXmlContent, demo_load_order
+from odoo_model_generator.core.demo_values import register_value_generator, resolve_value_generator
+from odoo_model_generator.core.module_builder import ModuleBuilder
+
+
+def _models(demo=None):
+    config = {
+        'models': [
+            {
+                'name': 'load.customer',
+                'description': 'Client',
+                'demo': demo or {},
+                'fields': [
+                    {'name': 'name', 'type': 'char', 'required': True},
+                    {'name': 'birth_date', 'type': 'date'},
+                    {'name': 'last_seen', 'type': 'datetime'},
+                    {'name': 'balance', 'type': 'monetary'},
+                    {'name': 'currency_id', 'type': 'many2one', 'comodel_name': 'res.currency'},
+                    {'name': 'state', 'type': 'selection', 'selection': [['draft', 'Brouillon'], ['done', 'Fait']]},
+                ],
+            },
+            {
+                'name': 'load.order',
+                'demo': demo or {},
+                'fields': [
+                    {'name': 'customer_id', 'type': 'many2one', 'comodel_name': 'load.customer'},
+                    {'name': 'customer_ids', 'type': 'many2many', 'comodel_name': 'load.customer'},
+                    {'name': 'line_ids', 'type': 'one2many', 'comodel_name': 'load.line'},
+                ],
+            },
+        ],
+    }
+    return OdooModelGenerator()._parse_models_config(config['models'])
+
+
+def test_demo_records_deterministic_per_seed():
+    models = _models({'records': 20, 'seed': 3})
+    first = DemoXmlContent(models[0], models).read()
+    assert first == DemoXmlContent(models[0], models).read()
+    assert first != DemoXmlContent(models[0], models, seed=4).read()
+
+
+def test_large_volume_streamed_in_chunks():
+    models = _models()
+    content = DemoXmlContent(models[1], models, rows=25000, chunk_records=1000)
+    chunk_sizes = [len(chunk) for chunk in content]
+    # En-tête, 25 paquets, fin de document : aucun morceau ne contient tout le fichier
+    assert len(chunk_sizes) == 27
+    assert max(chunk_sizes) < sum(chunk_sizes) / 10
+
+
+def test_all_field_types_rendered():
+    models = _models({'records': 5})
+    customers = ET.fromstring(DemoXmlContent(models[0], models).read().encode('utf-8'))
+    records = customers.findall('./data/record')
+    assert len(records) == 5
+    values = {field.get('name'): field for field in records[0]}
+    assert len(values['birth_date'].text) == 10
+    assert len(values['last_seen'].text) == 19
+    assert float(values['balance'].text) > 0
+    assert values['currency_id'].get('ref').startswith('base.')
+    assert values['state'].text in ('draft', 'done')
+
+    orders = ET.fromstring(DemoXmlContent(models[1], models).read().encode('utf-8'))
+    for record in orders.findall('./data/record'):
+        fields = {field.get('name'): field for field in record}
+        assert fields['customer_id'].get('ref').startswith('load_customer_demo_')
+        assert fields['customer_ids'].get('eval').startswith('[(6, 0, [ref(')
+        assert 'line_ids' not in fields
+
+
+def test_generated_module_writes_configured_volume(tmp_path):
+    config = {'models': [{'name': 'load.customer', 'demo': {'records': 1500},
+                          'fields': [{'name': 'name', 'type': 'char'}]}]}
+    module_path = OdooModelGenerator().generate_module(config, str(tmp_path), 'load_test')
+    root = ET.parse(f'{module_path}/demo/load_customer_demo.xml').getroot()
+    assert len(root.findall('./data/record')) == 1500
+
+
+def test_csv_format_uses_id_columns_for_relations():
+    models = _models({'records': 4})
+    models[1].data_format = 'csv'
+    path, content = ModuleBuilder()._render_demo_file(models[1], models)
+    assert path == 'demo/load.order.csv'
+    rows = list(csv.reader(io.StringIO(content.read())))
+    assert rows[0] == ['id', 'customer_id/id', 'customer_ids/id', 'active']
+    assert len(rows) == 5
+    for row in rows[1:]:
+        assert row[0].startswith('load_order_demo_')
+        assert all(target.startswith('load_customer_demo_') for target in row[2].split(','))
+
+
+def test_manifest_lists_demo_files_in_configured_format(tmp_path):
+    config = {
+        'module': {'data_format': 'csv'},
+        'models': [
+            {'name': 'load.customer', 'fields': [{'name': 'name', 'type': 'char'}]},
+            {'name': 'load.order', 'data_format': 'xml', 'fields': [{'name': 'name', 'type': 'char'}]},
+        ],
+    }
+    OdooModelGenerator().generate_module(config, str(tmp_path), 'load_test')
+    manifest = ast.literal_eval((tmp_path / 'load_test' / '__manifest__.py').read_text(encoding='utf-8'))
+    assert manifest['demo'] == ['demo/load.customer.csv', 'demo/load_order_demo.xml']
+    for relative_path in manifest['demo']:
+        assert (tmp_path / 'load_test' / relative_path).is_file()
+
+
+def test_values_independent_of_chunk_size():
+    models = _models({'records': 50, 'seed': 9})
+    reference = DemoXmlContent(models[0], models, chunk_records=1000).read()
+    assert DemoXmlContent(models[0], models, chunk_records=7).read() == reference
+
+
+def test_registered_generator_matches_field_name_pattern():
+    @register_value_generator(FieldType.CHAR, r'^test_siret$')
+    def siret_column(column, start, count):
+        return [f"{index:014d}" for index in range(start, start + count)]
+
+    field = FieldConfig('test_siret', FieldType.CHAR)
+    assert resolve_value_generator(field) is siret_column
+    assert resolve_value_generator(FieldConfig('test_label', FieldType.CHAR)) is not siret_column
+    model = ModelConfig('load.company', fields=[field], demo={'records': 3})
+    rows = list(csv.reader(io.StringIO(DemoCsvContent(model).read())))
+    assert [row[1] for row in rows[1:]] == ['00000000000001', '00000000000002', '00000000000003']
+
+
+def _order_models(relations=None, records=200):
+    config = [
+        {'name': 'load.order', 'demo': {'records': records, 'relations': relations or {}},
+         'fields': [{'name': 'customer_id', 'type': 'many2one', 'comodel_name': 'load.customer'},
+                    {'name': 'tag_ids', 'type': 'many2many', 'comodel_name': 'load.tag'}]},
+        {'name': 'load.customer', 'demo': {'records': 50},
+         'fields': [{'name': 'parent_id', 'type': 'many2one', 'comodel_name': 'load.customer'}]},
+        {'name': 'load.tag', 'demo': {'records': 10}, 'fields': [{'name': 'name', 'type': 'char'}]},
+    ]
+    return OdooModelGenerator()._parse_models_config(config)
+
+
+def _field_values(content, field_name, attribute):
+    root = ET.fromstring(content.read().encode('utf-8'))
+    return [field.get(attribute) for field in root.iter('field') if field.get('name') == field_name]
+
+
+def test_demo_files_loaded_after_referenced_models(tmp_path):
+    models = _order_models()
+    assert [model.name for model in demo_load_order(models)] == ['load.customer', 'load.tag', 'load.order']
+    # Les commandes, listées avant les clients, les référencent tout de même
+    assert all(ref.startswith('load_customer_demo_')
+               for ref in _field_values(DemoXmlContent(models[0], models), 'customer_id', 'ref'))
+
+    config = {'models': [{'name': model.name, 'fields': [{'name': 'name', 'type': 'char'}]} for model in models]}
+    config['models'][0]['fields'].append({'name': 'customer_id', 'type': 'many2one', 'comodel_name': 'load.customer'})
+    OdooModelGenerator().generate_module(config, str(tmp_path), 'load_test')
+    manifest = ast.literal_eval((tmp_path / 'load_test' / '__manifest__.py').read_text(encoding='utf-8'))
+    demo_files = manifest['demo']
+    assert demo_files.index('demo/load_customer_demo.xml') < demo_files.index('demo/load_order_demo.xml')
+
+
+def test_zipf_distribution_concentrates_references():
+    uniform = Counter(_field_values(DemoXmlContent(_order_models()[0], _order_models(), rows=2000), 'customer_id', 'ref'))
+    models = _order_models({'customer_id': {'distribution': 'zipf', 'skew': 1.2}})
+    skewed = Counter(_field_values(DemoXmlContent(models[0], models, rows=2000), 'customer_id', 'ref'))
+    assert skewed.most_common(1)[0][0] == 'load_customer_demo_1'
+    assert skewed['load_customer_demo_1'] > 5 * uniform['load_customer_demo_1']
+    assert set(skewed) <= {f'load_customer_demo_{index}' for index in range(1, 2001)}
+
+
+def test_many2many_fan_out_bounds():
+    models = _order_models({'tag_ids': {'fan_out': [2, 4]}})
+    for value in _field_values(DemoXmlContent(models[0], models), 'tag_ids', 'eval'):
+        targets = re.findall(r"ref\('([^']+)'\)", value)
+        assert 2 <= len(targets) <= 4
+        assert len(set(targets)) == len(targets)
+
+
+def test_invalid_relation_options_rejected(tmp_path):
+    config = {'models': [{'name': 'load.order', 'demo': {'relations': {'customer_id': {'distribution': 'pareto'}}},
+                          'fields': [{'name': 'customer_id', 'type': 'many2one', 'comodel_name': 'res.partner'}]}]}
+    with pytest.raises(ValueError, match='Distribution invalide'):
+        OdooModelGenerator().generate_module(config, str(tmp_path), 'load_test')
+
+    config['models'][0]['demo']['relations'] = {'customer_id': 'zipf'}
+    with pytest.raises(ValueError, match='demo.relations.customer_id invalide pour load.order: dictionnaire attendu'):
+        OdooModelGenerator().generate_module(config, str(tmp_path), 'load_test')
+
+
+@pytest.mark.parametrize('records', ['5', -1])
+def test_invalid_record_count_rejected(tmp_path, records):
+    config = {'models': [{'name': 'load.order', 'demo': {'records': records},
+                          'fields': [{'name': 'name', 'type': 'char'}]}]}
+    with pytest.raises(ValueError, match='demo.records invalide'):
+        OdooModelGenerator().generate_module(config, str(tmp_path), 'load_test')
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Service HTTP (omg serve --http) sur un port éphémère : archive renvoyée en flux,
+limites de taille et de concurrence, compteurs de /metrics
+"""
+
+import http.client
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.service.http_server import GenerationHTTPServer, GenerationService, ServiceLimits
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CRM_CONFIG = PROJECT_ROOT / 'examples' / 'config_examples' / 'crm_config.json'
+
+
+@pytest.fixture
+def server():
+    service = GenerationService(workers=1, limits=ServiceLimits(max_body_bytes=64 * 1024, max_models=5,
+                                                                queue_timeout=0.1))
+    http_server = GenerationHTTPServer(('127.0.0.1', 0), service)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield http_server
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+        thread.join(timeout=10)
+
+
+def _request(server, method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=30)
+    try:
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def _metric(metrics, name, labels=''):
+    match = re.search(rf'^{re.escape(name + labels)} (\S+)$', metrics, re.MULTILINE)
+    return float(match.group(1)) if match else 0
+
+
+def test_zip_matches_generate_module(server, tmp_path):
+    body = CRM_CONFIG.read_bytes()
+    status, payload = _request(server, 'POST', '/generate?module_name=crm_module', body)
+    assert status == 200
+
+    OdooModelGenerator().generate_module(json.loads(body), str(tmp_path), 'crm_module')
+    expected = {path.relative_to(tmp_path).as_posix(): path.read_bytes()
+                for path in (tmp_path / 'crm_module').rglob('*') if path.is_file()}
+    with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+        assert archive.testzip() is None
+        received = {name: archive.read(name) for name in archive.namelist()}
+    assert received == expected
+
+
+def test_size_and_config_errors(server):
+    status, payload = _request(server, 'POST', '/generate', b' ' * (64 * 1024 + 1))
+    assert status == 413 and 'Corps trop volumineux' in json.loads(payload)['error']
+
+    too_many = {'module': {'name': 'big'},
+                'models': [{'name': f'big.model{i}', 'fields': []} for i in range(6)]}
+    status, payload = _request(server, 'POST', '/generate', json.dumps(too_many))
+    assert status == 413 and 'Trop de modèles' in json.loads(payload)['error']
+
+    invalid = {'module': {'name': 'bad'},
+               'models': [{'name': 'bad.model', 'fields': [{'name': 'f', 'type': 'nope'}]}]}
+    status, payload = _request(server, 'POST', '/generate', json.dumps(invalid))
+    assert status == 422 and 'nope' in json.loads(payload)['error']
+
+
+def test_busy_pool_rejected(server):
+    generator = server.service.acquire_generator()
+    try:
+        status, payload = _request(server, 'POST', '/generate', CRM_CONFIG.read_bytes())
+    finally:
+        server.service.release_generator(generator)
+    assert status == 503 and 'occupés' in json.loads(payload)['error']
+
+    status, _ = _request(server, 'POST', '/generate', CRM_CONFIG.read_bytes())
+    assert status == 200
+
+
+def test_metrics_counters(server):
+    _, zipped = _request(server, 'POST', '/generate', CRM_CONFIG.read_bytes())
+    _, rejected = _request(server, 'POST', '/generate', b'[]')
+    assert _request(server, 'GET', '/healthz') == (200, b'ok\n')
+
+    # Une requête est comptée après l'envoi de sa réponse
+    deadline, polled_bytes = time.monotonic() + 10, 0
+    while True:
+        status, payload = _request(server, 'GET', '/metrics')
+        assert status == 200
+        metrics = payload.decode('utf-8')
+        counted = _metric(metrics, 'omg_http_requests_total', '{path="/healthz",status="200"}') \
+            + _metric(metrics, 'omg_generation_duration_seconds_count')
+        if counted == 3 or time.monotonic() > deadline:
+            break
+        polled_bytes += len(payload)
+        time.sleep(0.05)
+    assert _metric(metrics, 'omg_http_requests_total', '{path="/generate",status="200"}') == 1
+    assert _metric(metrics, 'omg_http_requests_total', '{path="/generate",status="400"}') == 1
+    assert _metric(metrics, 'omg_http_requests_total', '{path="/healthz",status="200"}') == 1
+    assert _metric(metrics, 'omg_generation_duration_seconds_count') == 2
+    assert _metric(metrics, 'omg_generation_duration_seconds_bucket', '{le="+Inf"}') == 2
+    sent = len(zipped) + len(rejected) + len(b'ok\n')
+    assert sent <= _metric(metrics, 'omg_http_response_bytes_total') <= sent + polled_bytes
+    assert _metric(metrics, 'omg_workers_busy') == 0
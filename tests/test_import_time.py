@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Budget de temps d'import pour les commandes légères de la CLI
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Budget (cumulé, en millisecondes) des imports déclenchés par `omg --help`
+HELP_IMPORT_BUDGET_MS = 150
+
+# Modules qui ne doivent pas être chargés par les commandes légères
+HEAVY_MODULES = ('jinja2', 'yaml', 'odoo_model_generator.core.model_builder')
+
+
+def _run_with_importtime(*args):
+    """Exécute la CLI avec -X importtime et retourne {module: cumulé_us}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         'from odoo_model_generator.cli import cli; cli()', *args],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue  # ligne d'en-tête
+        indent = len(name) - len(name.lstrip())
+        entries.append((indent, name.strip(), int(cumulative)))
+
+    # Seuls les imports de premier niveau portent le temps cumulé complet
+    top_level = min(indent for indent, _, _ in entries)
+    return {name: (cumulative if indent == top_level else 0)
+            for indent, name, cumulative in entries}
+
+
+def _package_import_ms(imports):
+    return sum(us for name, us in imports.items()
+               if name.split('.')[0] == 'odoo_model_generator') / 1000
+
+
+@pytest.mark.parametrize('command', [('--help',), ('list-fields',), ('list-templates',)])
+def test_light_commands_do_not_import_heavy_modules(command):
+    imports = _run_with_importtime(*command)
+    loaded = [name for name in HEAVY_MODULES if name in imports]
+    assert not loaded, f"Modules chargés inutilement par omg {command[0]}: {loaded}"
+
+
+@pytest.mark.slow
+def test_help_import_time_budget():
+    # Meilleur de plusieurs essais pour absorber le bruit de la machine
+    best_ms = min(_package_import_ms(_run_with_importtime('--help')) for _ in range(3))
+    assert best_ms < HELP_IMPORT_BUDGET_MS, (
+        f"omg --help importe en {best_ms:.1f} ms (budget: {HELP_IMPORT_BUDGET_MS} ms)"
+    )
+
+
+def test_import_has_no_logging_side_effects():
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import logging, odoo_model_generator; '
+         'odoo_model_generator.OdooModelGenerator; '
+         'print(len(logging.getLogger().handlers))'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '0'
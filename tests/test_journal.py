@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Journal de reprise : un lot interrompu ne refait que les modules non terminés
+"""
+
+import shutil
+from pathlib import Path
+
+from odoo_model_generator.core.batch import BatchGenerator
+from odoo_model_generator.core.journal import JOURNAL_FILE_NAME, CheckpointJournal
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_EXAMPLES = PROJECT_ROOT / 'examples' / 'config_examples'
+
+
+def _plan(tmp_path):
+    configs = tmp_path / 'configs'
+    shutil.copytree(CONFIG_EXAMPLES, configs)
+    batch = BatchGenerator(jobs=2, use_processes=False)
+    return batch, batch.plan(batch.discover_configs(str(configs)))
+
+
+def test_resume_skips_verified_modules(tmp_path):
+    batch, jobs = _plan(tmp_path)
+    output = tmp_path / 'out'
+    journal_path = output / JOURNAL_FILE_NAME
+
+    # Exécution interrompue après le premier module
+    with CheckpointJournal(journal_path) as journal:
+        batch.run(jobs[:1], str(output), journal=journal)
+    with open(journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "done", "unit": "tronq')
+
+    with CheckpointJournal(journal_path, resume=True) as journal:
+        report = batch.run(jobs, str(output), journal=journal)
+
+    assert [result.job.module_name for result in report.skipped] == [jobs[0].module_name]
+    assert len(report.succeeded) == len(jobs)
+
+    # Tous les modules sont désormais journalisés
+    with CheckpointJournal(journal_path, resume=True) as journal:
+        report = batch.run(jobs, str(output), journal=journal)
+    assert len(report.skipped) == len(jobs)
+
+
+def test_modified_output_is_regenerated(tmp_path):
+    batch, jobs = _plan(tmp_path)
+    output = tmp_path / 'out'
+    journal_path = output / JOURNAL_FILE_NAME
+
+    with CheckpointJournal(journal_path) as journal:
+        batch.run(jobs, str(output), journal=journal)
+
+    manifest = output / jobs[0].module_name / '__manifest__.py'
+    manifest.write_text('# altéré\n', encoding='utf-8')
+
+    with CheckpointJournal(journal_path, resume=True) as journal:
+        report = batch.run(jobs, str(output), journal=journal)
+
+    assert jobs[0].module_name not in [result.job.module_name for result in report.skipped]
+    assert manifest.read_text(encoding='utf-8') != '# altéré\n'
+
+
+def test_without_resume_journal_is_restarted(tmp_path):
+    batch, jobs = _plan(tmp_path)
+    output = tmp_path / 'out'
+    journal_path = output / JOURNAL_FILE_NAME
+
+    with CheckpointJournal(journal_path) as journal:
+        batch.run(jobs, str(output), journal=journal)
+    with CheckpointJournal(journal_path) as journal:
+        report = batch.run(jobs, str(output), journal=journal)
+
+    assert not report.skipped
+
+
+def test_changed_output_options_are_regenerated(tmp_path):
+    batch, jobs = _plan(tmp_path)
+    output = tmp_path / 'out'
+    journal_path = output / JOURNAL_FILE_NAME
+
+    with CheckpointJournal(journal_path) as journal:
+        batch.run(jobs, str(output), journal=journal)
+
+    # Même configuration, XML reformaté : les fichiers produits diffèrent
+    with CheckpointJournal(journal_path, resume=True) as journal:
+        report = batch.run(jobs, str(output), journal=journal, options={'format_xml': True})
+    assert report.skipped == []
+
+    with CheckpointJournal(journal_path, resume=True) as journal:
+        report = batch.run(jobs, str(output), journal=journal, options={'format_xml': True, 'write_workers': 4})
+    assert len(report.skipped) == len(jobs)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Compression parallèle par blocs : flux standards, octets indépendants du nombre de threads
+"""
+
+import gzip
+import io
+import os
+import random
+import tarfile
+import zipfile
+
+from odoo_model_generator.utils.archives import write_tar, write_zip
+from odoo_model_generator.utils.parallel_compress import ParallelGzipWriter
+
+
+def _payload(size: int) -> bytes:
+    # Mélange compressible / aléatoire pour produire des blocs de tailles variées
+    rng = random.Random(42)
+    parts = []
+    while sum(map(len, parts)) < size:
+        parts.append(b'<record id="demo_%d">valeur</record>\n' % len(parts))
+        parts.append(bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 200))))  # randbytes: Python 3.9+
+    return b''.join(parts)[:size]
+
+
+def _gzip(data: bytes, workers: int, block_size: int = 64 * 1024) -> bytes:
+    output = io.BytesIO()
+    with ParallelGzipWriter(output, compresslevel=6, block_size=block_size, workers=workers) as writer:
+        for offset in range(0, len(data), 10_000):
+            writer.write(data[offset:offset + 10_000])
+    return output.getvalue()
+
+
+def test_gzip_stream_is_standard_and_independent_of_workers():
+    data = _payload(600_000)
+    single, parallel = _gzip(data, workers=1), _gzip(data, workers=4)
+
+    assert single == parallel
+    assert gzip.decompress(parallel) == data
+    assert len(parallel) < len(data)
+
+
+def test_empty_gzip_stream():
+    assert gzip.decompress(_gzip(b'', workers=2)) == b''
+
+
+def _make_tree(root):
+    (root / 'data').mkdir(parents=True)
+    (root / 'data' / 'big_demo.xml').write_bytes(_payload(300_000))
+    (root / 'data' / 'empty.csv').write_bytes(b'')
+    (root / 'modèle.py').write_text('# données\n', encoding='utf-8')
+    os.chmod(root / 'modèle.py', 0o755)
+
+
+def test_parallel_zip_round_trip(tmp_path):
+    source = tmp_path / 'my_module'
+    _make_tree(source)
+
+    write_zip(source, tmp_path / 'one.zip', workers=1, block_size=64 * 1024, reproducible=True)
+    write_zip(source, tmp_path / 'many.zip', workers=4, block_size=64 * 1024, reproducible=True)
+    assert (tmp_path / 'one.zip').read_bytes() == (tmp_path / 'many.zip').read_bytes()
+
+    with zipfile.ZipFile(tmp_path / 'many.zip') as zipf:
+        assert zipf.testzip() is None
+        assert zipf.namelist() == ['my_module/data/big_demo.xml', 'my_module/data/empty.csv',
+                                   'my_module/modèle.py']
+        assert zipf.read('my_module/data/big_demo.xml') == (source / 'data' / 'big_demo.xml').read_bytes()
+        assert zipf.getinfo('my_module/modèle.py').external_attr >> 16 & 0o777 == 0o755
+
+
+def test_parallel_tar_gz_round_trip(tmp_path):
+    source = tmp_path / 'my_module'
+    _make_tree(source)
+
+    write_tar(source, tmp_path / 'module.tar.gz', workers=3, block_size=64 * 1024)
+
+    with tarfile.open(tmp_path / 'module.tar.gz') as tar:
+        assert tar.extractfile('my_module/data/big_demo.xml').read() == \
+            (source / 'data' / 'big_demo.xml').read_bytes()
+        assert tar.getmember('my_module/modèle.py').mode == 0o755
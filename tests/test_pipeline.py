@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline rendu/écriture : file bornée, mesures d'attente et propagation des erreurs
+"""
+
+import threading
+import time
+
+import pytest
+
+from odoo_model_generator.utils.pipeline import WriterPipeline
+
+
+class _SlowStorageWriter(WriterPipeline):
+    """Simule un stockage lent"""
+
+    def _write(self, relative_path, content):
+        time.sleep(0.01)
+        super()._write(relative_path, content)
+
+
+def test_writes_all_files(tmp_path):
+    with WriterPipeline(tmp_path, workers=3, queue_depth=4) as writer:
+        for i in range(20):
+            writer.submit(f'file_{i}.txt', f'contenu {i} é')
+        writer.submit('binary.bin', b'\x00\x01')
+
+    assert writer.stats.files == 21
+    assert (tmp_path / 'file_7.txt').read_text(encoding='utf-8') == 'contenu 7 é'
+    assert (tmp_path / 'binary.bin').read_bytes() == b'\x00\x01'
+    assert writer.stats.max_depth <= 4
+
+
+def test_slow_storage_stalls_producer(tmp_path):
+    with _SlowStorageWriter(tmp_path, workers=1, queue_depth=2) as writer:
+        for i in range(10):
+            writer.submit(f'file_{i}.txt', 'x')
+
+    assert writer.stats.producer_stalls > 0
+    assert writer.stats.producer_wait > 0
+    assert writer.stats.bottleneck == 'stockage'
+
+
+def test_write_error_is_raised(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        with WriterPipeline(tmp_path, workers=2) as writer:
+            writer.submit('missing_dir/file.txt', 'x')
+
+
+def test_write_error_with_more_writers_than_queue_slots(tmp_path):
+    # close() lève après l'arrêt des écrivains : abort() ne doit pas attendre une file sans lecteur
+    (tmp_path / 'directory').mkdir()
+    outcome = []
+
+    def generate():
+        try:
+            with WriterPipeline(tmp_path, workers=3, queue_depth=1) as writer:
+                writer.submit('directory', 'x')
+                writer.close()
+        except OSError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=generate, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert len(outcome) == 1
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Profil mémoire par étape : noms des étapes, snapshots écrits, troncature des principales allocations
+"""
+
+import json
+import re
+import tracemalloc
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.cli import cli
+from odoo_model_generator.utils.profiling import MemoryProfiler
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CRM_CONFIG = PROJECT_ROOT / 'examples' / 'config_examples' / 'crm_config.json'
+
+STAGES = ['parse', 'validate', 'structure', 'models', 'global_menu', 'flush', 'check']
+
+
+def test_generation_profiled_per_stage(tmp_path):
+    config_data = json.loads(CRM_CONFIG.read_text(encoding='utf-8'))
+    profiler = MemoryProfiler(top_n=2, snapshot_dir=str(tmp_path / 'snapshots'))
+    profiler.start()
+    try:
+        OdooModelGenerator().generate_module(config_data, str(tmp_path / 'out'), 'crm_module',
+                                             {'memory_profiler': profiler})
+    finally:
+        profiler.stop()
+
+    assert [stats.name for stats in profiler.stages] == STAGES
+    assert not tracemalloc.is_tracing()
+    for index, stats in enumerate(profiler.stages, start=1):
+        assert stats.peak >= 0
+        assert len(stats.top_allocations) <= 2
+        assert Path(stats.snapshot_file).name == f'{index:02d}_{stats.name}.tracemalloc'
+        assert tracemalloc.Snapshot.load(stats.snapshot_file).traces
+
+    report = profiler.format_report()
+    for stats in profiler.stages:
+        assert re.search(rf'^{stats.name}\s', report, re.MULTILINE)
+        assert f'snapshot: {stats.snapshot_file}' in report
+
+
+def test_memprofile_top_truncates_report(tmp_path):
+    snapshot_dir = tmp_path / 'snapshots'
+    result = CliRunner().invoke(cli, [
+        'generate', '-c', str(CRM_CONFIG), '-o', str(tmp_path / 'out'), '-n', 'crm_module',
+        '--memprofile-dir', str(snapshot_dir), '--memprofile-top', '1',
+    ], env={'OMG_NO_DAEMON': '1'})
+    assert result.exit_code == 0, result.output
+
+    assert sorted(path.name for path in snapshot_dir.iterdir()) == [
+        f'{index:02d}_{name}.tracemalloc' for index, name in enumerate(['load'] + STAGES, start=1)]
+    sections = result.output.split('Principales allocations - ')[1:]
+    assert sections
+    for section in sections:
+        allocations = [line for line in section.splitlines()[1:] if re.match(r'\s+[+-]\s*\d', line)]
+        assert len(allocations) <= 1
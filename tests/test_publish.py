@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Publication atomique : préparation, échange avec le module publié, retour arrière
+"""
+
+from pathlib import Path
+
+import pytest
+
+from odoo_model_generator.core.budget import GenerationBudget, GenerationBudgetExceeded
+from odoo_model_generator.core.generator import OdooModelGenerator
+from odoo_model_generator.utils import publish
+from odoo_model_generator.utils.publish import STAGING_DIR_NAME, ModulePublisher
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_FILE = PROJECT_ROOT / 'examples' / 'config_examples' / 'product_config.yaml'
+
+
+def _generate(output, version, **options):
+    generator = OdooModelGenerator()
+    config_data = generator._load_config_file(str(CONFIG_FILE))
+    config_data.setdefault('module', {})['version'] = version
+    return Path(generator.generate_module(config_data, str(output), 'product_management',
+                                          {'atomic_publish': True, **options}))
+
+
+def _version(module_path: Path) -> str:
+    return (module_path / '__manifest__.py').read_text(encoding='utf-8')
+
+
+def test_publish_keeps_previous_generations(tmp_path):
+    first = _generate(tmp_path, '1.0', keep_generations=2)
+    _generate(tmp_path, '2.0', keep_generations=2)
+    _generate(tmp_path, '3.0', keep_generations=2)
+
+    assert first == tmp_path / 'product_management'
+    assert "'3.0'" in _version(first)
+    generations = ModulePublisher(tmp_path, 'product_management').generations()
+    assert ["'2.0'" in _version(g) for g in generations] == [True, False]
+    assert not any((tmp_path / STAGING_DIR_NAME).iterdir())
+
+
+def test_rollback_and_undo(tmp_path):
+    module = _generate(tmp_path, '1.0')
+    _generate(tmp_path, '2.0')
+    publisher = ModulePublisher(tmp_path, 'product_management')
+
+    publisher.rollback()
+    assert "'1.0'" in _version(module)
+    publisher.rollback()
+    assert "'2.0'" in _version(module)
+
+
+def test_failed_generation_leaves_published_module(tmp_path):
+    module = _generate(tmp_path, '1.0')
+    with pytest.raises(GenerationBudgetExceeded):
+        _generate(tmp_path, '2.0', budget=GenerationBudget(max_output_bytes=100))
+
+    assert "'1.0'" in _version(module)
+    assert not any((tmp_path / STAGING_DIR_NAME).iterdir())
+
+
+def test_rename_fallback_without_exchange(tmp_path, monkeypatch):
+    monkeypatch.setattr(publish, 'exchange_paths', lambda first, second: False)
+    module = _generate(tmp_path, '1.0')
+    _generate(tmp_path, '2.0')
+
+    assert "'2.0'" in _version(module)
+    assert len(ModulePublisher(tmp_path, 'product_management').generations()) == 1
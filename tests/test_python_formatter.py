@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Formatage Python par black : cache par contenu, pool de processus, repli
+"""
+
+from pathlib import Path
+
+import pytest
+
+from odoo_model_generator.core.budget import GenerationBudget
+from odoo_model_generator.core.generator import OdooModelGenerator
+from odoo_model_generator.utils.python_formatter import PythonFormatter
+from odoo_model_generator.utils.render_cache import RenderCache
+
+black = pytest.importorskip('black')
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_FILE = PROJECT_ROOT / 'examples' / 'config_examples' / 'product_config.yaml'
+
+SOURCES = {
+    'models/a.py': "x = {'a':1,\n\n\n\n     'b':2}\n",
+    'models/b.py': "def f( a ):\n        return a\n",
+}
+
+
+def test_results_cached_by_content(tmp_path):
+    first = PythonFormatter(cache=RenderCache(str(tmp_path)), workers=1)
+    formatted = first.format(SOURCES['models/a.py'])
+    assert formatted == 'x = {"a": 1, "b": 2}\n'
+
+    second = PythonFormatter(cache=RenderCache(str(tmp_path)), workers=1)
+    assert second.format(SOURCES['models/a.py']) == formatted
+    assert (second.stats.cache_hits, second.stats.formatted) == (1, 0)
+
+
+def test_process_pool_matches_in_process():
+    with PythonFormatter(workers=2) as pooled:
+        session = pooled.session()
+        for relative_path, source in SOURCES.items():
+            session.submit(relative_path, source)
+        results = dict(session.drain())
+
+    local = PythonFormatter(workers=1)
+    assert results == {path: local.format(source) for path, source in SOURCES.items()}
+
+
+def test_invalid_source_written_unchanged():
+    formatter = PythonFormatter(workers=1)
+    source = "name = fields.Char(help='d'un produit')\n"
+
+    assert formatter.format(source) == source
+    assert formatter.stats.failures == 1
+
+
+def test_generated_module_formatted(tmp_path):
+    generator = OdooModelGenerator()
+    config_data = generator._load_config_file(str(CONFIG_FILE))
+    formatter = PythonFormatter(workers=1)
+    module_path = Path(generator.generate_module(config_data, str(tmp_path), 'product_management',
+                                                 {'python_formatter': formatter}))
+
+    manifest = (module_path / '__manifest__.py').read_text(encoding='utf-8')
+    assert manifest == black.format_str(manifest, mode=black.Mode())
+    assert formatter.stats.files == len(list(module_path.rglob('*.py')))
+
+
+def test_budget_counts_formatted_output(tmp_path):
+    # Python et XML décomptés après formatage : le budget mesure ce qui est écrit
+    generator = OdooModelGenerator()
+    config_data = generator._load_config_file(str(CONFIG_FILE))
+    budget = GenerationBudget()
+    with PythonFormatter(workers=2) as formatter:
+        module_path = Path(generator.generate_module(config_data, str(tmp_path), 'product_management', {
+            'python_formatter': formatter, 'format_xml': True, 'budget': budget}))
+
+    assert budget.output_bytes == sum(path.stat().st_size for path in module_path.rglob('*') if path.is_file())
+
+
+def test_daemon_keeps_one_formatter_pool(tmp_path):
+    from odoo_model_generator import __version__
+    from odoo_model_generator.service.daemon import GenerationDaemon
+
+    daemon = GenerationDaemon(str(tmp_path / 'omg.sock'))
+    daemon.warm_up()
+    daemon.python_formatter.workers = 2
+    request = {'command': 'generate', 'version': __version__,
+               'params': {'config': str(CONFIG_FILE), 'output': str(tmp_path / 'out'), 'format_python': True}}
+    try:
+        assert daemon.execute(request)['exit_code'] == 0
+        executor = daemon.python_formatter._executor
+        assert executor is not None
+        assert daemon.execute(request)['exit_code'] == 0
+        assert daemon.python_formatter._executor is executor
+        # Deuxième requête : sources déjà formatées par le pool
+        assert daemon.python_formatter.stats.formatted == 0
+    finally:
+        daemon.python_formatter.close()
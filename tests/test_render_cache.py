@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Cache persistant des rendus : réutilisation, sortie identique, éviction LRU, activation explicite
+"""
+
+import json
+import os
+from pathlib import Path
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.utils.render_cache import RenderCache, cache_requested
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CRM_CONFIG = PROJECT_ROOT / 'examples' / 'config_examples' / 'crm_config.json'
+
+
+def _read_tree(root: Path):
+    return {str(path.relative_to(root)): path.read_bytes()
+            for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def test_cached_generation_is_identical(tmp_path):
+    config_data = json.loads(CRM_CONFIG.read_text(encoding='utf-8'))
+    generator = OdooModelGenerator()
+    uncached = generator.generate_module(config_data, str(tmp_path / 'uncached'), 'crm_module')
+
+    first_cache = RenderCache(tmp_path / 'cache')
+    generator.generate_module(config_data, str(tmp_path / 'first'), 'crm_module', {'render_cache': first_cache})
+    assert first_cache.stats.hits == 0 and first_cache.stats.writes > 0
+
+    # Nouvelle instance (nouvelle exécution) sur le même dossier
+    second_cache = RenderCache(tmp_path / 'cache', compress=False)
+    cached = generator.generate_module(config_data, str(tmp_path / 'second'), 'crm_module',
+                                       {'render_cache': second_cache})
+    assert second_cache.stats.misses == 0
+    assert second_cache.stats.hits == first_cache.stats.writes
+
+    assert _read_tree(Path(cached)) == _read_tree(Path(uncached))
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = RenderCache(tmp_path)
+    key = 'ab' * 32
+    cache.put(key, 'contenu')
+    entry = tmp_path / 'render' / key[:2] / key
+    entry.write_bytes(b'garbage')
+
+    assert cache.get(key) is None
+    assert cache.stats.errors == 1
+    assert not [p for p in entry.parent.iterdir() if p.name.startswith('.tmp-')]
+
+
+def test_lru_eviction(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=3000, compress=False)
+    keys = [f'{i:02x}' * 32 for i in range(5)]
+    for age, key in enumerate(keys):
+        cache.put(key, 'x' * 996)
+        path = tmp_path / 'render' / key[:2] / key
+        os.utime(path, (1000 + age, 1000 + age))
+
+    # Lecture récente : la première entrée devient la plus récemment utilisée
+    assert cache.get(keys[0]) is not None
+    cache.enforce_limit()
+
+    remaining = {key for key in keys if (tmp_path / 'render' / key[:2] / key).exists()}
+    assert keys[0] in remaining
+    assert keys[1] not in remaining and keys[2] not in remaining
+    assert cache.usage()[1] <= 3000
+
+
+def test_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv('OMG_CACHE_DIR', raising=False)
+    monkeypatch.delenv('OMG_NO_CACHE', raising=False)
+    assert not cache_requested()
+    assert cache_requested(enabled=True)
+    assert cache_requested(cache_dir=str(tmp_path))
+    monkeypatch.setenv('OMG_CACHE_DIR', str(tmp_path))
+    assert cache_requested()
+    assert not cache_requested(enabled=True, disabled=True)
+    monkeypatch.setenv('OMG_NO_CACHE', '1')
+    assert not cache_requested(enabled=True)
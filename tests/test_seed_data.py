@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Export COPY de PostgreSQL (omg seed) : format des fichiers, tables de relation, script de chargement ;
+chargement réel dans un PostgreSQL jetable s'il est installé
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.cli import cli
+from odoo_model_generator.core.seed_data import render_seed_files, render_seed_loader, validate_seed_selection
+
+CONFIG = {
+    'module': {'name': 'perf'},
+    'models': [
+        {'name': 'perf.order', 'demo': {'records': 40, 'relations': {'tag_ids': {'fan_out': [1, 2]}}},
+         'fields': [{'name': 'name', 'type': 'char'},
+                    {'name': 'note', 'type': 'text'},
+                    {'name': 'customer_id', 'type': 'many2one', 'comodel_name': 'perf.customer'},
+                    {'name': 'partner_id', 'type': 'many2one', 'comodel_name': 'res.partner'},
+                    {'name': 'tag_ids', 'type': 'many2many', 'comodel_name': 'perf.tag'},
+                    {'name': 'done', 'type': 'boolean'}]},
+        {'name': 'perf.customer', 'table_name': 'perf_client', 'demo': {'records': 10},
+         'fields': [{'name': 'name', 'type': 'char'},
+                    {'name': 'parent_id', 'type': 'many2one', 'comodel_name': 'perf.customer'}]},
+        {'name': 'perf.tag', 'demo': {'records': 5}, 'fields': [{'name': 'name', 'type': 'char'}]},
+    ],
+}
+
+# Tables créées par Odoo à l'installation du module (sans données de démo)
+SCHEMA = '''
+CREATE TABLE perf_tag (id serial PRIMARY KEY, name varchar, active boolean);
+CREATE TABLE perf_client (id serial PRIMARY KEY, name varchar, parent_id int REFERENCES perf_client, active boolean);
+CREATE TABLE perf_order (id serial PRIMARY KEY, name varchar, note text, customer_id int REFERENCES perf_client,
+                         done boolean, active boolean);
+CREATE TABLE perf_order_perf_tag_rel (perf_order_id int REFERENCES perf_order, perf_tag_id int REFERENCES perf_tag,
+                                      PRIMARY KEY (perf_order_id, perf_tag_id));
+'''
+
+
+def _seed_files():
+    models, _ = OdooModelGenerator()._prepare_configuration(CONFIG, 'perf')
+    files = list(render_seed_files(models))
+    return {path: content.read() for path, content in files}, files
+
+
+def _copy_rows(text):
+    lines = text.split('\n')
+    assert lines[0].endswith(' FROM stdin;')
+    assert lines[-2:] == ['\\.', '']
+    return lines[0], [line.split('\t') for line in lines[1:-2]]
+
+
+def test_copy_files_use_table_names_and_record_ids():
+    files, _ = _seed_files()
+    assert list(files) == ['seed/perf_client.sql', 'seed/perf_tag.sql', 'seed/perf_order.sql',
+                           'seed/perf_order_perf_tag_rel.sql']
+
+    header, rows = _copy_rows(files['seed/perf_order.sql'])
+    assert header == 'COPY "perf_order" ("id", "name", "note", "customer_id", "done", "active") FROM stdin;'
+    assert [row[0] for row in rows] == [str(index) for index in range(1, 41)]
+    for row in rows:
+        assert len(row) == 6
+        assert 1 <= int(row[3]) <= 10
+        assert row[4] in ('t', 'f')
+
+    _, customers = _copy_rows(files['seed/perf_client.sql'])
+    assert customers[0][2] == '\\N'
+    assert all(int(row[2]) < int(row[0]) for row in customers[1:])
+
+
+def test_relation_table_and_loader():
+    files, contents = _seed_files()
+    header, pairs = _copy_rows(files['seed/perf_order_perf_tag_rel.sql'])
+    assert header == 'COPY "perf_order_perf_tag_rel" ("perf_order_id", "perf_tag_id") FROM stdin;'
+    per_order = {}
+    for order_id, tag_id in pairs:
+        assert 1 <= int(tag_id) <= 5
+        per_order.setdefault(order_id, set()).add(tag_id)
+    assert len(per_order) == 40 and all(1 <= len(tags) <= 2 for tags in per_order.values())
+
+    loader = render_seed_loader(contents)
+    assert loader.index('\\ir perf_client.sql') < loader.index('\\ir perf_order.sql')
+    assert 'BEGIN;' in loader and 'COMMIT;' in loader
+    assert "setval(pg_get_serial_sequence('\"perf_order\"', 'id'), COALESCE(MAX(id), 0) + 1, false)" in loader
+
+
+def test_seed_command_writes_loader(tmp_path):
+    config_path = tmp_path / 'perf.json'
+    config_path.write_text(json.dumps(CONFIG), encoding='utf-8')
+    result = CliRunner().invoke(cli, ['seed', '-c', str(config_path), '-o', str(tmp_path), '--rows', '7'])
+    assert result.exit_code == 0, result.output
+    seed_dir = tmp_path / 'perf' / 'seed'
+    assert (seed_dir / 'load.sql').is_file()
+    _, rows = _copy_rows((seed_dir / 'perf_tag.sql').read_text(encoding='utf-8'))
+    assert len(rows) == 7
+
+
+def test_unloadable_selection_rejected(tmp_path):
+    models, _ = OdooModelGenerator()._prepare_configuration(CONFIG, 'perf')
+    validate_seed_selection(models)
+    validate_seed_selection(models, ['perf.customer', 'perf.tag'])
+    with pytest.raises(ValueError, match=r'perf\.order\.customer_id: perf\.customer non sélectionné'):
+        validate_seed_selection(models, ['perf.order', 'perf.tag'])
+
+    required = json.loads(json.dumps(CONFIG))
+    required['models'][0]['fields'][3]['required'] = True
+    config_path = tmp_path / 'perf.json'
+    config_path.write_text(json.dumps(required), encoding='utf-8')
+    result = CliRunner().invoke(cli, ['seed', '-c', str(config_path), '-o', str(tmp_path)])
+    assert result.exit_code == 1
+    assert 'perf.order.partner_id: many2one requis vers res.partner' in result.output
+    assert not (tmp_path / 'perf' / 'seed').exists()
+
+    result = CliRunner().invoke(cli, ['seed', '-c', str(config_path), '-o', str(tmp_path),
+                                      '--model', 'perf.customer', '--model', 'perf.tag'])
+    assert result.exit_code == 0, result.output
+
+
+@pytest.mark.skipif(not all(shutil.which(tool) for tool in ('initdb', 'pg_ctl', 'psql')),
+                    reason='PostgreSQL non installé')
+def test_load_into_throwaway_postgres(tmp_path):
+    data_dir, socket_dir = tmp_path / 'pgdata', tmp_path / 'socket'
+    socket_dir.mkdir()
+    subprocess.run(['initdb', '-D', str(data_dir), '-A', 'trust', '-U', 'postgres'], check=True, capture_output=True)
+    subprocess.run(['pg_ctl', '-D', str(data_dir), '-w', '-l', str(tmp_path / 'pg.log'), 'start',
+                    '-o', f"-k {socket_dir} -c listen_addresses='' -p 55432"], check=True, capture_output=True)
+    psql = ['psql', '-h', str(socket_dir), '-p', '55432', '-U', 'postgres', '-d', 'postgres',
+            '-v', 'ON_ERROR_STOP=1', '-q', '-t', '-A']
+    try:
+        subprocess.run(psql + ['-c', SCHEMA], check=True, capture_output=True)
+        config_path = tmp_path / 'perf.json'
+        config_path.write_text(json.dumps(CONFIG), encoding='utf-8')
+        result = CliRunner().invoke(cli, ['seed', '-c', str(config_path), '-o', str(tmp_path / 'out')])
+        assert result.exit_code == 0, result.output
+        subprocess.run(psql + ['-f', str(tmp_path / 'out' / 'perf' / 'seed' / 'load.sql')],
+                       check=True, capture_output=True)
+        counts = subprocess.run(
+            psql + ['-c', "SELECT (SELECT count(*) FROM perf_order), nextval('perf_order_id_seq')"],
+            check=True, capture_output=True, text=True).stdout.strip()
+        assert counts == '40|41'
+    finally:
+        subprocess.run(['pg_ctl', '-D', str(data_dir), '-m', 'immediate', 'stop'], capture_output=True)
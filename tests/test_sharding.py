@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Génération par shards : partition stable des modèles et fusion identique à une génération directe
+"""
+
+import hashlib
+
+import pytest
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.core.sharding import ShardedModuleGenerator, parse_shard_spec, shard_of
+
+
+def _large_config(model_count=30):
+    return {
+        'module': {'name': 'Large Module', 'depends': ['base']},
+        'models': [
+            {
+                'name': f'large.model{i}',
+                'description': f'Modèle {i}',
+                'fields': [
+                    {'name': 'code', 'type': 'char'},
+                    {'name': 'partner_id', 'type': 'many2one', 'comodel_name': 'res.partner'},
+                ],
+            }
+            for i in range(model_count)
+        ],
+    }
+
+
+def _read_tree(root):
+    return {str(path.relative_to(root)): path.read_bytes()
+            for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def test_parse_shard_spec():
+    assert parse_shard_spec('2/4') == (2, 4)
+    for invalid in ('0/4', '5/4', '1', 'a/b'):
+        with pytest.raises(ValueError):
+            parse_shard_spec(invalid)
+
+
+def test_shard_assignment_partitions_models():
+    names = [f'large.model{i}' for i in range(30)]
+    shards = {index: [name for name in names if shard_of(name, 4) == index] for index in range(1, 5)}
+    assert sorted(name for members in shards.values() for name in members) == sorted(names)
+    assert all(shards.values())
+    # Hash stable (sha256), indépendant de PYTHONHASHSEED
+    expected = int.from_bytes(hashlib.sha256(b'large.model0').digest()[:8], 'big') % 4 + 1
+    assert shard_of('large.model0', 4) == expected
+
+
+def test_merged_shards_match_direct_generation(tmp_path):
+    config_data = _large_config()
+    direct = OdooModelGenerator().generate_module(config_data, str(tmp_path / 'direct'), 'large_module')
+
+    sharded = ShardedModuleGenerator()
+    shard_dirs = []
+    for index in range(1, 5):
+        shard_dir = tmp_path / f'runner{index}'
+        sharded.generate_shard(config_data, str(shard_dir), 'large_module', index, 4)
+        shard_dirs.append(str(shard_dir))
+
+    merged = sharded.merge_shards(config_data, str(tmp_path / 'merged'), 'large_module', shard_dirs)
+
+    assert _read_tree(tmp_path / 'merged' / 'large_module') == _read_tree(tmp_path / 'direct' / 'large_module')
+    assert merged.endswith('large_module') and direct.endswith('large_module')
+
+
+def test_merge_rejects_incomplete_or_stale_shards(tmp_path):
+    config_data = _large_config()
+    sharded = ShardedModuleGenerator()
+    sharded.generate_shard(config_data, str(tmp_path), 'large_module', 1, 2)
+    with pytest.raises(ValueError, match='manquant'):
+        sharded.merge_shards(config_data, str(tmp_path), 'large_module')
+
+    sharded.generate_shard(_large_config(31), str(tmp_path), 'large_module', 2, 2)
+    with pytest.raises(ValueError, match='autre configuration'):
+        sharded.merge_shards(config_data, str(tmp_path), 'large_module')
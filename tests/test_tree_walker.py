@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Parcours d'arborescence par os.scandir : tailles, listes de fichiers, affichage
+"""
+
+import os
+from pathlib import Path
+
+from odoo_model_generator.cli import _display_tree
+from odoo_model_generator.utils.file_manager import FileManager
+from odoo_model_generator.utils.tree_walker import scan_tree
+
+
+def _make_tree(root: Path):
+    for relative_path, content in {
+        '__manifest__.py': 'x' * 10,
+        'models/product.py': 'x' * 100,
+        'models/__init__.py': '',
+        'views/product_views.xml': 'x' * 50,
+        'static/src/css/module.css': 'x' * 7,
+        '.git/HEAD': 'x' * 3,
+    }.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_directory_size_matches_rglob(tmp_path):
+    _make_tree(tmp_path)
+    expected = sum(p.stat().st_size for p in tmp_path.rglob('*') if p.is_file())
+
+    assert FileManager.get_directory_size(str(tmp_path)) == expected == 170
+    assert FileManager.get_directory_size(str(tmp_path), workers=4) == expected
+
+
+def test_list_files_patterns_and_workers(tmp_path):
+    _make_tree(tmp_path)
+
+    assert FileManager.list_files(str(tmp_path), '*.py') == [str(tmp_path / '__manifest__.py')]
+    recursive = sorted(FileManager.list_files(str(tmp_path), '*.py', recursive=True))
+    assert recursive == sorted(str(p) for p in tmp_path.rglob('*.py'))
+    assert sorted(FileManager.list_files(str(tmp_path), '*.py', recursive=True, workers=3)) == recursive
+    assert FileManager.list_files(str(tmp_path), 'models/product.py') == [str(tmp_path / 'models' / 'product.py')]
+
+
+def test_scan_tree_depth_and_last_flags(tmp_path):
+    _make_tree(tmp_path)
+    entries = [(os.path.relpath(entry.path, tmp_path), depth, is_last)
+               for entry, depth, is_last in scan_tree(tmp_path, max_depth=2, skip_hidden=True,
+                                                      sort_key=lambda e: e.name)]
+
+    assert ('models/product.py', 2, True) in entries
+    assert ('views', 1, True) in entries
+    assert not any(name.startswith('.git') or name.startswith('static/src/') for name, _, _ in entries)
+
+
+def test_display_tree_layout(tmp_path, capsys):
+    _make_tree(tmp_path)
+    _display_tree(str(tmp_path), max_depth=2)
+
+    assert capsys.readouterr().out.splitlines() == [
+        '├── 📁 models',
+        '│   ├── 🐍 __init__.py',
+        '│   └── 🐍 product.py',
+        '├── 📁 static',
+        '│   └── 📁 src',
+        '├── 📁 views',
+        '│   └── 📄 product_views.xml',
+        '└── 🐍 __manifest__.py',
+    ]
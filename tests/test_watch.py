@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Mode surveillance : fragments inclus, régénération incrémentale, détection des modifications
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from odoo_model_generator import OdooModelGenerator
+from odoo_model_generator.core.watch import IncrementalModuleGenerator, InotifyBackend, PollingBackend
+
+
+def _model(index, label='Code'):
+    return {'name': f'watch.model{index}', 'description': f'Modèle {index}',
+            'fields': [{'name': 'code', 'type': 'char', 'label': label}]}
+
+
+def _write_yaml(path: Path, data):
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding='utf-8')
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    (tmp_path / 'fragments').mkdir()
+    _write_yaml(tmp_path / 'fragments' / 'a.yaml', {'models': [_model(0), _model(1)]})
+    _write_yaml(tmp_path / 'fragments' / 'b.yaml', {'models': [_model(2), _model(3)]})
+    config = tmp_path / 'config.yaml'
+    _write_yaml(config, {'module': {'name': 'Watch', 'depends': ['base']}, 'include': ['fragments/*.yaml']})
+    return config
+
+
+def _read_tree(root: Path):
+    return {str(path.relative_to(root)): path.read_bytes()
+            for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def test_include_merges_fragment_models(config_path):
+    config_data = OdooModelGenerator()._load_config_file(str(config_path))
+    assert [m['name'] for m in config_data['models']] == [f'watch.model{i}' for i in range(4)]
+    assert 'include' not in config_data
+
+
+def test_incremental_regeneration(tmp_path, config_path):
+    incremental = IncrementalModuleGenerator(str(config_path), str(tmp_path / 'out'), 'watch_module')
+    first = incremental.regenerate()
+    assert first.models_rendered == 4
+
+    generator = OdooModelGenerator()
+    generator.generate_module(generator._load_config_file(str(config_path)), str(tmp_path / 'full'), 'watch_module')
+    assert _read_tree(tmp_path / 'out' / 'watch_module') == _read_tree(tmp_path / 'full' / 'watch_module')
+
+    assert incremental.regenerate().files_written == []
+
+    _write_yaml(tmp_path / 'fragments' / 'b.yaml', {'models': [_model(2, label='Référence'), _model(3)]})
+    update = incremental.regenerate()
+    assert update.documents_parsed == 1
+    assert update.models_rendered == 1
+    assert 'models/watch_model2.py' in update.files_written
+    assert not any('watch_model3' in path for path in update.files_written)
+
+    _write_yaml(tmp_path / 'fragments' / 'b.yaml', {'models': [_model(2, label='Référence')]})
+    update = incremental.regenerate()
+    assert 'models/watch_model3.py' in update.files_removed
+    assert not (tmp_path / 'out' / 'watch_module' / 'models' / 'watch_model3.py').exists()
+
+
+@pytest.mark.parametrize('backend_factory', [
+    lambda: PollingBackend(interval=0.01),
+    pytest.param(InotifyBackend, marks=pytest.mark.skipif(
+        not Path('/proc/sys/fs/inotify').exists(), reason='inotify indisponible')),
+])
+def test_backend_detects_change(config_path, backend_factory):
+    backend = backend_factory()
+    try:
+        backend.set_paths([config_path])
+        assert backend.wait_for_change(timeout=0.05) is False
+
+        def _save():
+            time.sleep(0.05)
+            config_path.write_text(config_path.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+
+        threading.Thread(target=_save).start()
+        assert backend.wait_for_change(timeout=2) is True
+    finally:
+        backend.close()
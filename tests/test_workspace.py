@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Espace de travail : ordre des dépendances, références inter-modules et régénération incrémentale
+"""
+
+import json
+
+import pytest
+
+from odoo_model_generator.core.workspace import Workspace, WorkspaceGenerator
+
+
+def _module_config(name, depends, model, fields=None, summary='Résumé'):
+    return {
+        'module': {'name': name, 'depends': depends, 'summary': summary},
+        'models': [{'name': model, 'description': model.title(), 'fields': fields or []}],
+    }
+
+
+def _write_workspace(tmp_path, configs):
+    entries = []
+    for file_name, config in configs.items():
+        (tmp_path / file_name).write_text(json.dumps(config), encoding='utf-8')
+        entries.append(file_name)
+    workspace_file = tmp_path / 'workspace.json'
+    workspace_file.write_text(json.dumps({'modules': entries}), encoding='utf-8')
+    return str(workspace_file)
+
+
+@pytest.fixture
+def shop_configs():
+    return {
+        'sale.json': _module_config('shop_sale', ['base', 'shop_base'], 'shop.order', [
+            {'name': 'product_id', 'type': 'many2one', 'comodel_name': 'shop.product'},
+        ]),
+        'base.json': _module_config('shop_base', ['base'], 'shop.product'),
+        'report.json': _module_config('shop_report', ['shop_sale'], 'shop.report'),
+    }
+
+
+def test_topological_order(tmp_path, shop_configs):
+    workspace = Workspace.load(_write_workspace(tmp_path, shop_configs))
+    assert workspace.order == ['shop_base', 'shop_sale', 'shop_report']
+    assert workspace.dependency_closure('shop_report') == {'shop_sale', 'shop_base'}
+
+
+def test_cycle_is_rejected(tmp_path):
+    configs = {
+        'a.json': _module_config('mod_a', ['mod_b'], 'mod.a'),
+        'b.json': _module_config('mod_b', ['mod_a'], 'mod.b'),
+    }
+    with pytest.raises(ValueError, match='circulaires'):
+        Workspace.load(_write_workspace(tmp_path, configs))
+
+
+def test_reference_without_depends_fails_only_that_module(tmp_path, shop_configs):
+    shop_configs['rogue.json'] = _module_config('shop_rogue', ['base'], 'shop.rogue', [
+        {'name': 'order_id', 'type': 'many2one', 'comodel_name': 'shop.order'},
+    ])
+    workspace = Workspace.load(_write_workspace(tmp_path, shop_configs))
+
+    report = WorkspaceGenerator(jobs=2, use_processes=False).run_workspace(workspace, str(tmp_path / 'out'))
+
+    assert [result.job.module_name for result in report.failed] == ['shop_rogue']
+    assert "shop_sale" in report.failed[0].error
+    assert len(report.succeeded) == 3
+
+
+def test_unchanged_upstream_does_not_regenerate_downstream(tmp_path, shop_configs):
+    workspace_file = _write_workspace(tmp_path, shop_configs)
+    output = str(tmp_path / 'out')
+    generator = WorkspaceGenerator(jobs=2, use_processes=False)
+
+    first = generator.run_workspace(Workspace.load(workspace_file), output)
+    assert not first.failed and not first.skipped
+
+    # Changement amont sans effet sur les modèles exposés
+    shop_configs['base.json']['module']['summary'] = 'Nouveau résumé'
+    _write_workspace(tmp_path, shop_configs)
+    second = generator.run_workspace(Workspace.load(workspace_file), output)
+    assert sorted(r.job.module_name for r in second.skipped) == ['shop_report', 'shop_sale']
+
+    # Nouveau modèle amont : les modules aval sont revalidés et régénérés
+    shop_configs['base.json']['models'].append({'name': 'shop.category', 'fields': []})
+    _write_workspace(tmp_path, shop_configs)
+    third = generator.run_workspace(Workspace.load(workspace_file), output)
+    assert not third.skipped
+
+
+def test_changed_output_options_regenerate_modules(tmp_path, shop_configs):
+    workspace_file = _write_workspace(tmp_path, shop_configs)
+    output = str(tmp_path / 'out')
+    generator = WorkspaceGenerator(jobs=2, use_processes=False)
+    generator.run_workspace(Workspace.load(workspace_file), output)
+
+    report = generator.run_workspace(Workspace.load(workspace_file), output, options={'format_xml': True})
+    assert report.skipped == []
+    report = generator.run_workspace(Workspace.load(workspace_file), output, options={'format_xml': True})
+    assert len(report.skipped) == 3
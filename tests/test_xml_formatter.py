@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Formateur XML en flux : balises multi-lignes, texte, CDATA, découpage arbitraire
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from odoo_model_generator.core.generator import OdooModelGenerator
+from odoo_model_generator.utils.formatters import CodeFormatter
+from odoo_model_generator.utils.xml_formatter import XmlPrettyPrinter, format_xml_file, iter_xml_tokens
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_FILE = PROJECT_ROOT / 'examples' / 'config_examples' / 'product_config.yaml'
+
+SOURCE = '''<?xml version="1.0" encoding="utf-8"?>
+<odoo>
+<record id="view_form" model="ir.ui.view">
+  <field name="arch" type="xml">
+<form>
+            <field name="a"
+                   attrs="{'invisible': [('x', '>', 1)]}"/>
+  <!-- multi
+       line -->
+<group></group>
+  </form>
+  </field>
+</record>
+<record id="action" model="ir.actions.server"><field name="code"><![CDATA[
+if record.x < 1:
+    record.x = 1
+]]></field></record>
+</odoo>'''
+
+EXPECTED = '''<?xml version="1.0" encoding="utf-8"?>
+<odoo>
+    <record id="view_form" model="ir.ui.view">
+        <field name="arch" type="xml">
+            <form>
+                <field name="a"
+                       attrs="{'invisible': [('x', '>', 1)]}"/>
+                <!-- multi
+                     line -->
+                <group></group>
+            </form>
+        </field>
+    </record>
+    <record id="action" model="ir.actions.server">
+        <field name="code"><![CDATA[
+if record.x < 1:
+    record.x = 1
+]]></field>
+    </record>
+</odoo>
+'''
+
+
+def test_format_xml_code():
+    formatted = CodeFormatter.format_xml_code(SOURCE)
+
+    assert formatted == EXPECTED
+    assert CodeFormatter.format_xml_code(formatted) == formatted
+
+
+def test_result_independent_of_chunking():
+    for size in (1, 2, 5, 13, 64):
+        chunks = [SOURCE[i:i + size] for i in range(0, len(SOURCE), size)]
+        assert ''.join(text for _, text in iter_xml_tokens(chunks)) == SOURCE
+        assert ''.join(XmlPrettyPrinter().format_chunks(chunks)) == EXPECTED
+
+
+def test_format_large_file_in_small_chunks(tmp_path):
+    source = tmp_path / 'demo.xml'
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write('<odoo>\n')
+        for i in range(5000):
+            f.write(f'<record id="r{i}" model="x"><field name="name">Nom {i}</field></record>\n')
+        f.write('</odoo>\n')
+
+    format_xml_file(source, chunk_size=100)
+
+    lines = source.read_text(encoding='utf-8').splitlines()
+    assert lines[1:4] == ['    <record id="r0" model="x">', '        <field name="name">Nom 0</field>', '    </record>']
+    assert len(ET.parse(source).getroot()) == 5000
+
+
+def test_generated_xml_formatted(tmp_path):
+    generator = OdooModelGenerator()
+    config_data = generator._load_config_file(str(CONFIG_FILE))
+    module_path = Path(generator.generate_module(config_data, str(tmp_path), 'product_management',
+                                                 {'format_xml': True}))
+
+    for xml_file in module_path.rglob('*.xml'):
+        content = xml_file.read_text(encoding='utf-8')
+        ET.fromstring(content.encode('utf-8'))
+        assert CodeFormatter.format_xml_code(content) == content